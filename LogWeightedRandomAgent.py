@@ -1,24 +1,144 @@
+import json
 import random
+import sys
 from random_agent import RandomAgent
-from loguru import logger
+
+# loguru is only imported the first time something is logged
+_logger = None
+
+# Placeholder of an agent's logger before its first use
+_UNBOUND = object()
+
+# Handlers added with exclusive=True
+_exclusive_handlers = set()
+
+
+def get_logger():
+    """
+    Return the loguru logger, importing loguru on first use
+    """
+    global _logger
+    if _logger is None:
+        from loguru import logger
+        _logger = logger
+    return _logger
+
+
+def _jsonl_format(record):
+    """
+    Format a record as one compact JSON line
+
+    Only called by the sink for records that are actually emitted.
+    """
+    extra = record["extra"]
+    record["extra"]["_line"] = json.dumps({
+        "t": round(record["time"].timestamp(), 6),
+        "lvl": record["level"].name,
+        "game": extra["game"],
+        "player": extra.get("player"),
+        "msg": record["message"],
+    }, separators=(",", ":"))
+    return "{extra[_line]}\n"
+
+
+def configure_game_log(path="logs/games.jsonl", level="INFO", rotation="20 MB", exclusive=False):
+    """
+    Send the records of sampled games to a rotating JSONL file
+
+    The sink is enqueued: records are pushed to a queue and written by a
+    background thread, so the move path never waits on the file. All games
+    share the file, each record carries its game index.
+
+    Parameters:
+        path: JSONL file, rotated when it reaches the rotation size
+        level: minimum level written ("DEBUG" also keeps valid actions)
+        rotation: loguru rotation rule
+        exclusive: if True, remove the other sinks of the process (e.g. the
+                   default stderr one) so nothing is written synchronously;
+                   close_game_log then adds back a stderr sink
+
+    Returns:
+        int: handler id, to pass to close_game_log
+    """
+    logger = get_logger()
+    if exclusive:
+        logger.remove()
+    handler_id = logger.add(path, level=level, format=_jsonl_format, enqueue=True, rotation=rotation,
+                            filter=lambda record: "game" in record["extra"])
+    if exclusive:
+        _exclusive_handlers.add(handler_id)
+    return handler_id
+
+
+def _write_stderr(message):
+    # Looks sys.stderr up on every record, so a replaced stream (pytest's
+    # capture) is not kept after it is restored
+    sys.stderr.write(message)
+
+
+def close_game_log(handler_id):
+    """
+    Flush the pending records and close the JSONL sink
+    """
+    logger = get_logger()
+    logger.complete()
+    logger.remove(handler_id)
+    if handler_id in _exclusive_handlers:
+        _exclusive_handlers.discard(handler_id)
+        # Like loguru's default stderr sink
+        logger.add(_write_stderr)
+
 
 class LogWeightedRandomAgent(RandomAgent):
     """
     Random agent that prefers center columns
     """
-    def __init__(self, env, player_name=None):
+    def __init__(self, env=None, player_name=None, sample_every=1):
+        """
+        Parameters:
+            env: optional PettingZoo environment (Discrete(7) when omitted)
+            player_name: Optional name for the agent
+            sample_every: only log 1 game in sample_every (see start_game)
+        """
         self.player_name = player_name
+        self.sample_every = sample_every
         super().__init__(env, player_name)
-        logger.info(f"Initialized LoggedRandomAgent for {player_name}")
+        # Bound logger of the current game, None when the game is not logged;
+        # bound on first use, so that creating the agent does not import loguru
+        self._log = _UNBOUND
+
+    def _bind_default(self):
+        self._log = get_logger().bind(player=self.player_name)
+        self._log.info("Initialized LoggedRandomAgent for {}", self.player_name)
+        return self._log
+
+    def start_game(self, game_id):
+        """
+        Decide whether the coming game is logged and tag its records
+
+        Parameters:
+            game_id: int, index of the game in the tournament
+        """
+        if game_id % self.sample_every == 0:
+            self._log = get_logger().bind(game=game_id, player=self.player_name)
+        else:
+            self._log = None
 
     def choose_action_weight(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
         # TODO: Create weights that favor center (column 3)
+        log = self._log
+        if log is _UNBOUND:
+            log = self._bind_default()
         if terminated or truncated:
-            logger.info(f"{self.player_name} - Game ended, returning None")
+            if log is not None:
+                log.info("{} - Game ended, returning None", self.player_name)
             return None
-        valid_actions = [i for i, valid in enumerate(action_mask) if valid ==1]  
-        logger.debug(f"{self.player_name} - Valid actions: {valid_actions}")
-        action = random.choices(valid_actions)
-        logger.info(f"{self.player_name} plays column {action}")
+        valid_actions = [i for i, valid in enumerate(action_mask) if valid ==1]
+        # Messages are formatted by loguru only if a sink accepts the level
+        if log is not None:
+            log.debug("{} - Valid actions: {}", self.player_name, valid_actions)
+        action = random.choices(valid_actions)[0]
+        if log is not None:
+            log.info("{} plays column {}", self.player_name, action)
         return action
-        
+
@@ -5,16 +5,19 @@ class WeightedRandomAgent(RandomAgent):
     """
     Random agent that prefers center columns
     """
-    def __init__(self, env, player_name=None):
+    # Same preference as choose_action_weight, renormalized over the mask
+    batch_weights = (1, 2, 3, 5, 3, 2, 1)
+
+    def __init__(self, env=None, player_name=None, seed=None):
         """
         Initialize the random agent
 
         Parameters:
-            env: PettingZoo environment
+            env: optional PettingZoo environment (Discrete(7) when omitted)
             player_name: Optional name for the agent (for display)
+            seed: Optional seed of the generator used by choose_actions
         """
-        self.action_space = env.action_space(env.agents[0])
-        self.name = player_name if player_name is not None else "RandomAgent"
+        super().__init__(env, player_name, seed)
 
     def choose_action_weight(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
         # TODO: Create weights that favor center (column 3)
@@ -0,0 +1,54 @@
+"""
+Connect Four action space
+
+The action space of Connect Four is always Discrete(7), so agents do not
+need an environment to know it. Agents created without one get a
+LazyDiscrete, which only imports gymnasium the first time the space is
+sampled or seeded: creating an agent stays in the low milliseconds.
+"""
+
+COLUMNS = 7
+
+
+class LazyDiscrete:
+    """
+    gymnasium Discrete(7), created on first use
+    """
+
+    n = COLUMNS
+
+    def __init__(self):
+        self._space = None
+
+    @property
+    def space(self):
+        if self._space is None:
+            from gymnasium import spaces
+
+            self._space = spaces.Discrete(COLUMNS)
+        return self._space
+
+    def __getattr__(self, name):
+        # sample, seed, contains, np_random... come from the real space
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.space, name)
+
+    def __repr__(self):
+        return f"LazyDiscrete({COLUMNS})"
+
+
+def connect_four_action_space(env=None):
+    """
+    Action space of an agent
+
+    Parameters:
+        env: optional environment; its space is used when given, so that
+             agents sharing an environment keep sharing its random stream
+
+    Returns:
+        the environment's action space, or a LazyDiscrete
+    """
+    if env is None:
+        return LazyDiscrete()
+    return env.action_space(env.agents[0])
@@ -2,114 +2,74 @@
 Minimax agent with alpha-beta pruning for Connect Four
 """
 
-import numpy as np
 import random
 
+from action_space import connect_four_action_space
+from board import COLUMN_MASKS, COLUMNS, WINDOWS, as_position
+
 
 class MinimaxAgent:
     """
     Agent using minimax algorithm with alpha-beta pruning
     """
 
-    def __init__(self, env, depth=4, player_name=None):
+    def __init__(self, env=None, depth=4, player_name=None):
         """
         Initialize minimax agent
 
         Parameters:
-            env: PettingZoo environment
+            env: optional PettingZoo environment (only its action space is
+                 used, Discrete(7) when omitted)
             depth: How many moves to look ahead
             player_name: Optional name
         """
-        self.env = env
-        self.action_space = env.action_space(env.agents[0])
+        self.action_space = connect_four_action_space(env)
         self.depth = depth
         self.player_name = player_name or f"Minimax(d={depth})"
+        # True when the last chosen move came from the random fallback
+        self.last_action_random = False
 
     def _get_valid_moves(self, board):
         """
         Get list of valid column indices where a piece can be placed
 
         Parameters:
-            board: numpy array of shape (rows, cols, 2)
+            board: board.Position
 
         Returns:
             list of valid column indices
         """
-        valid = []
-        for col in range(board.shape[1]):
-            # Column is valid if top row is empty
-            if board[0, col, 0] == 0 and board[0, col, 1] == 0:
-                valid.append(col)
-        return valid
+        return board.valid_columns()
 
     def _check_win(self, board, channel):
         """
         Check if player at given channel has won (4 in a row)
 
         Parameters:
-            board: numpy array of shape (rows, cols, 2)
+            board: board.Position
             channel: 0 for player 1, 1 for player 2
 
         Returns:
             True if player has won, False otherwise
         """
-        rows, cols = board.shape[0], board.shape[1]
-
-        # Create a grid representation (0=empty, 1=player1, 2=player2)
-        grid = np.zeros((rows, cols), dtype=int)
-        grid[board[:, :, 0] == 1] = 1
-        grid[board[:, :, 1] == 1] = 2
-
-        player = 1 if channel == 0 else 2
-
-        # Check horizontal
-        for r in range(rows):
-            for c in range(cols - 3):
-                if all(grid[r, c + i] == player for i in range(4)):
-                    return True
-
-        # Check vertical
-        for c in range(cols):
-            for r in range(rows - 3):
-                if all(grid[r + i, c] == player for i in range(4)):
-                    return True
-
-        # Check diagonal (positive slope)
-        for r in range(rows - 3):
-            for c in range(cols - 3):
-                if all(grid[r + i, c + i] == player for i in range(4)):
-                    return True
-
-        # Check diagonal (negative slope)
-        for r in range(3, rows):
-            for c in range(cols - 3):
-                if all(grid[r - i, c + i] == player for i in range(4)):
-                    return True
-
-        return False
+        return board.wins(channel)
 
     def _simulate_move(self, board, col, channel):
         """
         Simulate placing a piece in the given column
 
         Parameters:
-            board: current board state
+            board: current board state (board.Position or observation)
             col: column index to place piece
             channel: 0 for player 1, 1 for player 2
 
         Returns:
-            new board state after move
+            new board.Position after move, unchanged if the column is full
+            (the search itself plays and undoes moves on a single position)
         """
-        # Copy board to avoid modifying original
-        new_board = board.copy()
-
-        # Find lowest available row in column (gravity)
-        for row in range(new_board.shape[0] - 1, -1, -1):
-            if new_board[row, col, 0] == 0 and new_board[row, col, 1] == 0:
-                new_board[row, col, channel] = 1
-                return new_board
-
-        # Column is full (shouldn't happen with valid moves)
+        new_board = as_position(board).copy()
+        if new_board.next_row(col) is not None:
+            new_board.play(col, channel)
         return new_board
 
     def _evaluate(self, board):
@@ -119,72 +79,35 @@ class MinimaxAgent:
         Lower score = better for player 2
 
         Parameters:
-            board: current board state
+            board: board.Position
 
         Returns:
             evaluation score
         """
-        rows = board.shape[0]
-        cols = board.shape[1]
+        own, other = board.masks
+        empty = ~(own | other)
 
-        # Create grid representation
-        grid = np.zeros(shape=(rows, cols), dtype=int)
-        grid[board[:, :, 0] == 1] = 1
-        grid[board[:, :, 1] == 1] = 2
-
-        def score_window(window, player):
-            """Score a window of 4 positions"""
-            opp = 1 if player == 2 else 2
-            score = 0
+        # Favor center column positions
+        score = (own & COLUMN_MASKS[COLUMNS // 2]).bit_count() * 3
 
+        # Score every window of 4 positions
+        for window in WINDOWS:
+            mine = (own & window).bit_count()
+            free = (empty & window).bit_count()
             # Four in a row - winning position
-            if window.count(player) == 4:
+            if mine == 4:
                 score += 10000
             # Three in a row with empty space - strong threat
-            elif window.count(player) == 3 and window.count(0) == 1:
+            elif mine == 3 and free == 1:
                 score += 50
             # Two in a row with two empty spaces - potential
-            elif window.count(player) == 2 and window.count(0) == 2:
+            elif mine == 2 and free == 2:
                 score += 5
 
             # Opponent threat - block it
-            if window.count(opp) == 3 and window.count(0) == 1:
+            if free == 1 and (other & window).bit_count() == 3:
                 score -= 80
 
-            return score
-
-        score = 0
-        player = 1  # Our agent (channel 0)
-
-        # Favor center column positions
-        center_col = cols // 2
-        center_array = list(grid[:, center_col])
-        score += center_array.count(player) * 3
-
-        # Score all horizontal windows
-        for r in range(rows):
-            for c in range(cols - 3):
-                window = list(grid[r, c:c + 4])
-                score += score_window(window, player)
-
-        # Score all vertical windows
-        for c in range(cols):
-            for r in range(rows - 3):
-                window = list(grid[r:r + 4, c])
-                score += score_window(window, player)
-
-        # Score positive slope diagonals
-        for r in range(rows - 3):
-            for c in range(cols - 3):
-                window = [grid[r + i, c + i] for i in range(4)]
-                score += score_window(window, player)
-
-        # Score negative slope diagonals
-        for r in range(3, rows):
-            for c in range(cols - 3):
-                window = [grid[r - i, c + i] for i in range(4)]
-                score += score_window(window, player)
-
         return score
 
     def _minimax(self, board, depth, alpha, beta, maximizing):
@@ -192,7 +115,7 @@ class MinimaxAgent:
         Minimax algorithm with alpha-beta pruning
 
         Parameters:
-            board: current board state
+            board: current board.Position, played on and restored
             depth: remaining depth to search
             alpha: best value for maximizer
             beta: best value for minimizer
@@ -221,9 +144,10 @@ class MinimaxAgent:
             best_score = float('-inf')
 
             for col in valid_cols:
-                # Simulate move for player 1
-                child = self._simulate_move(board, col, channel=0)
-                score = self._minimax(child, depth - 1, alpha, beta, False)
+                # Play move for player 1, then take it back
+                board.play(col, 0)
+                score = self._minimax(board, depth - 1, alpha, beta, False)
+                board.undo()
                 best_score = max(best_score, score)
                 alpha = max(alpha, best_score)
 
@@ -238,9 +162,10 @@ class MinimaxAgent:
             best_score = float('inf')
 
             for col in valid_cols:
-                # Simulate move for player 2
-                child = self._simulate_move(board, col, channel=1)
-                score = self._minimax(child, depth - 1, alpha, beta, True)
+                # Play move for player 2, then take it back
+                board.play(col, 1)
+                score = self._minimax(board, depth - 1, alpha, beta, True)
+                board.undo()
                 best_score = min(best_score, score)
                 beta = min(beta, best_score)
 
@@ -274,15 +199,17 @@ class MinimaxAgent:
 
         best_action = None
         best_value = float('-inf')
+        board = as_position(observation)
 
         # Evaluate each valid action
         for action in valid_actions:
-            # Simulate our move
-            new_board = self._simulate_move(observation, action, channel=0)
+            # Play our move
+            board.play(action, 0)
 
             # Evaluate position (opponent's turn next, so minimizing)
-            value = self._minimax(new_board, self.depth - 1,
+            value = self._minimax(board, self.depth - 1,
                                   float('-inf'), float('inf'), False)
+            board.undo()
 
             # Track best move
             if value > best_value:
@@ -290,4 +217,5 @@ class MinimaxAgent:
                 best_action = action
 
         # Return best action or random if none found
+        self.last_action_random = best_action is None
         return best_action if best_action is not None else random.choice(valid_actions)
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Rule-level profiler for rule-based Connect Four agents
+
+Attach a RuleProfiler to a SmartAgentAmeliore to record, for every
+choose_action call, which rule decided the move, how long each rule took
+and how many times the board helpers were called. Nothing is measured
+while no profiler is attached.
+"""
+
+import time
+from collections import deque
+
+
+class RuleProfiler:
+    """
+    Collects per-rule timings, fire counts and helper call counts
+    """
+
+    # Agent helpers wrapped with a call counter while the profiler is attached
+    HELPERS = ("_get_next_row", "_check_win_from_position", "_copy_board")
+
+    def __init__(self, trace_limit=1000):
+        """
+        Initialize an empty profile
+
+        Parameters:
+            trace_limit: number of most recent choose_action traces kept
+                         (0 disables the per-call trace)
+        """
+        self.calls = 0
+        self.fired = {}
+        self.evaluated = {}
+        self.time_ns = {}
+        self.helper_calls = dict.fromkeys(self.HELPERS, 0)
+        self.trace = deque(maxlen=trace_limit)
+
+    def attach(self, agent):
+        """
+        Start profiling an agent
+
+        The helpers are wrapped on the instance only, so detaching
+        restores the class methods with no leftover cost.
+        """
+        for name in self.HELPERS:
+            setattr(agent, name, self._counted(name, getattr(agent, name)))
+        agent.profiler = self
+        return agent
+
+    def detach(self, agent):
+        """Stop profiling an agent"""
+        for name in self.HELPERS:
+            agent.__dict__.pop(name, None)
+        agent.profiler = None
+
+    def _counted(self, name, method):
+        counts = self.helper_calls
+
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return method(*args, **kwargs)
+        return wrapper
+
+    def run_rules(self, agent, observation, valid_actions):
+        """
+        Run the agent's rules in priority order while timing each of them
+
+        Parameters:
+            agent: agent exposing a RULES tuple of (name, function)
+            observation: board.Position - current board state
+            valid_actions: list of valid column indices
+
+        Returns:
+            the move chosen by the first rule that returns a column
+        """
+        helpers_before = dict(self.helper_calls)
+        timings = {}
+        decided_by = None
+        move = None
+
+        for rule_name, rule in agent.RULES:
+            start = time.perf_counter_ns()
+            move = rule(agent, observation, valid_actions)
+            elapsed = time.perf_counter_ns() - start
+
+            timings[rule_name] = elapsed
+            self.time_ns[rule_name] = self.time_ns.get(rule_name, 0) + elapsed
+            self.evaluated[rule_name] = self.evaluated.get(rule_name, 0) + 1
+            if move is not None:
+                decided_by = rule_name
+                self.fired[rule_name] = self.fired.get(rule_name, 0) + 1
+                break
+
+        self.calls += 1
+        if self.trace.maxlen:
+            self.trace.append({
+                "rule": decided_by,
+                "action": move,
+                "times_ns": timings,
+                "helpers": {name: self.helper_calls[name] - helpers_before[name] for name in self.HELPERS},
+            })
+        return move
+
+    def merge(self, other):
+        """
+        Add the counters of another profiler to this one (e.g. per-game
+        profilers of a tournament)
+        """
+        self.calls += other.calls
+        for mine, theirs in ((self.fired, other.fired), (self.evaluated, other.evaluated),
+                             (self.time_ns, other.time_ns), (self.helper_calls, other.helper_calls)):
+            for key, value in theirs.items():
+                mine[key] = mine.get(key, 0) + value
+        self.trace.extend(other.trace)
+        return self
+
+    def summary(self):
+        """
+        Aggregate view of the profile
+
+        Returns:
+            dict: number of calls, per-rule statistics and helper call counts
+        """
+        rules = {}
+        for rule_name, total in self.time_ns.items():
+            evaluated = self.evaluated[rule_name]
+            rules[rule_name] = {
+                "fired": self.fired.get(rule_name, 0),
+                "fire_rate": self.fired.get(rule_name, 0) / self.calls if self.calls else 0.0,
+                "evaluated": evaluated,
+                "total_ms": total / 1e6,
+                "mean_us": total / evaluated / 1e3,
+            }
+        return {"calls": self.calls, "rules": rules, "helpers": dict(self.helper_calls)}
+
+    def report(self):
+        """
+        Format the summary as a table sorted by total time
+
+        Returns:
+            str: multi-line report
+        """
+        summary = self.summary()
+        lines = [f"{summary['calls']} choose_action calls",
+                 f"{'rule':20} {'fired':>7} {'rate':>7} {'evaluated':>10} {'total ms':>10} {'mean us':>10}"]
+        ordered = sorted(summary["rules"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        for rule_name, stats in ordered:
+            lines.append(f"{rule_name:20} {stats['fired']:7d} {stats['fire_rate']:7.1%} "
+                         f"{stats['evaluated']:10d} {stats['total_ms']:10.2f} {stats['mean_us']:10.1f}")
+        helpers = ", ".join(f"{name}={count}" for name, count in summary["helpers"].items())
+        lines.append(f"helper calls: {helpers}")
+        return "\n".join(lines)
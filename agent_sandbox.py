@@ -0,0 +1,159 @@
+"""
+Sandboxed agents
+
+Agents hosted in persistent worker processes with a low per-move cost.
+The observation and the action mask are written into a shared memory
+block, and a single byte on a pipe tells the worker to move; the worker
+writes its column back into the block and answers with one byte. No
+object is pickled during a game, so a move costs tens of microseconds
+of IPC instead of the pickling round trip of time_limit.ProcessAgent.
+
+A worker that is late or crashes is killed and restarted, without
+affecting the tournament process or the other agent.
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from time_limit import AgentCrashed, MoveTimeout, _reseed_agent
+
+ROWS = 6
+COLUMNS = 7
+
+# Shared block layout: observation (6x7x2 int8), action mask (7 int8), action
+OBSERVATION_OFFSET = 0
+MASK_OFFSET = ROWS * COLUMNS * 2
+ACTION_OFFSET = MASK_OFFSET + COLUMNS
+BLOCK_SIZE = ACTION_OFFSET + 1
+
+MOVE = b"m"
+DONE = b"d"
+RESEED = b"s"
+STOP = b"q"
+
+
+def _views(buffer):
+    observation = np.ndarray((ROWS, COLUMNS, 2), dtype=np.int8, buffer=buffer, offset=OBSERVATION_OFFSET)
+    mask = np.ndarray((COLUMNS,), dtype=np.int8, buffer=buffer, offset=MASK_OFFSET)
+    return observation, mask
+
+
+def _sandbox_worker(conn, name, factory, args):
+    # Child process: build the agent (without an environment) and serve moves
+    block = shared_memory.SharedMemory(name=name)
+    observation, mask = _views(block.buf)
+    agent = factory(None, *args)
+    try:
+        while True:
+            message = conn.recv_bytes()
+            if message == MOVE:
+                # Copies: the agent may keep what it is given
+                action = agent.choose_action(observation=observation.copy(), action_mask=mask.copy())
+                block.buf[ACTION_OFFSET] = int(action)
+                conn.send_bytes(DONE)
+            elif message[:1] == RESEED:
+                _reseed_agent(agent, int(message[1:]))
+            else:
+                break
+    except EOFError:
+        pass
+    finally:
+        del observation, mask
+        block.close()
+        conn.close()
+
+
+class SandboxedAgent:
+    """
+    Agent running in a worker process, exchanging boards through shared memory
+
+    Drop-in replacement for time_limit.ProcessAgent: same constructor,
+    reseed, choose_action, choose_action_timed, restart and close.
+    Only the observation and the action mask are passed to the agent's
+    choose_action.
+    """
+
+    def __init__(self, factory, *args, label=None):
+        """
+        Create the shared block and start the worker
+
+        Parameters:
+            factory: picklable callable factory(None, *args) returning the agent
+            args: extra arguments of the factory
+            label: str, name of the agent in reports (default: factory name)
+        """
+        self.factory = factory
+        self.args = args
+        self.label = label or getattr(factory, "__name__", "SandboxedAgent")
+        self.restarts = 0
+        self._block = shared_memory.SharedMemory(create=True, size=BLOCK_SIZE)
+        self._observation, self._mask = _views(self._block.buf)
+        self._start()
+
+    def _start(self):
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_sandbox_worker,
+                                                args=(child, self._block.name, self.factory, self.args), daemon=True)
+        self._process.start()
+        child.close()
+
+    def restart(self):
+        """
+        Kill the worker (late or crashed) and start a fresh one
+        """
+        self._process.kill()
+        self._process.join()
+        self._conn.close()
+        self.restarts += 1
+        self._start()
+
+    def reseed(self, seed, game_id=None):
+        self._conn.send_bytes(RESEED + str(int(seed)).encode())
+
+    def _move(self, observation, action_mask, limit_s=None):
+        self._observation[...] = observation
+        self._mask[...] = action_mask
+        try:
+            self._conn.send_bytes(MOVE)
+            if limit_s is not None and not self._conn.poll(limit_s):
+                self.restart()
+                raise MoveTimeout()
+            self._conn.recv_bytes()
+        except (EOFError, BrokenPipeError, ConnectionResetError):
+            self.restart()
+            raise AgentCrashed(self.label)
+        return self._block.buf[ACTION_OFFSET]
+
+    def choose_action(self, observation, action_mask, **kwargs):
+        """
+        Raises:
+            AgentCrashed: the worker died (it is restarted)
+        """
+        return self._move(observation, action_mask)
+
+    def choose_action_timed(self, limit_s, observation, action_mask, **kwargs):
+        """
+        Ask the worker for a move, killing it after limit_s seconds
+
+        Raises:
+            MoveTimeout: the worker did not answer in time (it is restarted)
+            AgentCrashed: the worker died (it is restarted)
+        """
+        return self._move(observation, action_mask, limit_s)
+
+    def close(self):
+        if self._process.is_alive():
+            try:
+                self._conn.send_bytes(STOP)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(1.0)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+        self._conn.close()
+        del self._observation, self._mask
+        self._block.close()
+        self._block.unlink()
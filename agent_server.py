@@ -0,0 +1,342 @@
+"""
+Agent server
+
+Local HTTP server keeping warm agent instances, for MLArena-style play.
+Each agent is built once, without an environment, and owned by a
+batching thread: concurrent requests for the same agent are coalesced
+into micro-batches, played in one call to choose_actions when the agent
+provides it (board by board otherwise). Connections are HTTP/1.1
+keep-alive.
+
+Endpoints:
+    GET  /agents                  names of the served agents
+    POST /agents/<name>/move      {"observation": 6x7x2, "action_mask": [7]} -> {"action": column}
+    POST /agents/<name>/moves     {"observations": [...], "action_masks": [...]} -> {"actions": [...]}
+                                  plus {"errors": {index: message}} for the boards the agent
+                                  failed on (their action is null)
+    GET  /stats                   per-agent moves, batches, throughput and latency
+
+Usage:
+    python agent_server.py --port 8000 --agents SmartAgentAmeliore MinimaxAgent
+"""
+
+import argparse
+import http.client
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from agent_minimax import MinimaxAgent
+from LogWeightedRandomAgent import LogWeightedRandomAgent
+from latency import LatencyHistogram
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from smart_agent_ameliore import SmartAgentAmeliore
+from WeightedRandomAgent import WeightedRandomAgent
+
+AGENTS = {cls.__name__: cls for cls in (RandomAgent, WeightedRandomAgent, LogWeightedRandomAgent, SmartAgent,
+                                        SmartAgentAmeliore, MinimaxAgent)}
+
+
+def build_agent(name, depth_minimax=3):
+    """
+    Create a served agent (agents do not need an environment)
+    """
+    cls = AGENTS[name]
+    if cls == MinimaxAgent:
+        return cls(depth=depth_minimax, player_name=name)
+    return cls(player_name=name)
+
+
+def _check_board(observation, action_mask):
+    observation = np.asarray(observation, dtype=np.int8)
+    action_mask = np.asarray(action_mask, dtype=np.int8)
+    if observation.shape != (6, 7, 2) or action_mask.shape != (7,):
+        raise ValueError(f"expected a 6x7x2 observation and 7 mask values, got shapes {observation.shape} "
+                         f"and {action_mask.shape}")
+    return observation, action_mask
+
+
+class AgentBatcher:
+    """
+    Queue of move requests for one agent, played in micro-batches
+    """
+
+    def __init__(self, agent, max_batch=64, max_wait_ms=2.0):
+        """
+        Start the batching thread
+
+        Parameters:
+            agent: the agent, only used from the batching thread
+            max_batch: int, largest number of boards played in one call
+            max_wait_ms: float, time a batch waits for more requests (only
+                         for agents with choose_actions)
+        """
+        self.agent = agent
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000 if hasattr(agent, "choose_actions") else 0.0
+        self.latency = LatencyHistogram()
+        self.moves = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, observation, action_mask):
+        """
+        Returns:
+            Future: resolved with the chosen column, or with the exception
+            the agent raised for this board
+
+        Raises:
+            ValueError: the observation is not 6x7x2 or the mask not 7 values
+        """
+        observation, action_mask = _check_board(observation, action_mask)
+        future = Future()
+        self._requests.put((observation, action_mask, future, time.perf_counter_ns()))
+        return future
+
+    def close(self):
+        self._requests.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                timeout = deadline - time.perf_counter()
+                item = self._requests.get(timeout=timeout) if timeout > 0 else self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._requests.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._requests.get()
+            if first is None:
+                break
+            batch = self._collect(first)
+            actions = None
+            if len(batch) > 1 and hasattr(self.agent, "choose_actions"):
+                try:
+                    actions = self.agent.choose_actions(np.stack([item[1] for item in batch]),
+                                                        observations=np.stack([item[0] for item in batch]))
+                except Exception:
+                    # Played board by board below, so that only the bad request fails
+                    actions = None
+            if actions is None:
+                actions = []
+                for observation, mask, _, _ in batch:
+                    try:
+                        actions.append(int(self.agent.choose_action(observation=observation, action_mask=mask)))
+                    except Exception as error:
+                        actions.append(error)
+            done = time.perf_counter_ns()
+            self.batches += 1
+            for (_, _, future, submitted), action in zip(batch, actions):
+                if isinstance(action, Exception):
+                    future.set_exception(action)
+                    continue
+                self.moves += 1
+                self.latency.add(done - submitted)
+                future.set_result(int(action))
+
+    def stats(self):
+        """
+        Returns:
+            dict: moves, batches, mean batch size, moves per second since
+                  the start and latency summary (queueing included, ns)
+        """
+        elapsed = time.perf_counter() - self.started
+        return {
+            "moves": self.moves,
+            "batches": self.batches,
+            "mean_batch": self.moves / self.batches if self.batches else 0.0,
+            "moves_per_s": self.moves / elapsed if elapsed > 0 else 0.0,
+            "latency": self.latency.summary(),
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately: without this, small
+    # responses wait for the client's delayed ACK (40 ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/agents":
+            self._send(200, {"agents": sorted(self.server.batchers)})
+        elif self.path == "/stats":
+            self._send(200, {name: batcher.stats() for name, batcher in self.server.batchers.items()})
+        else:
+            self._send(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        # The body is always read, so that the connection stays usable
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "agents" or parts[2] not in ("move", "moves"):
+            return self._send(404, {"error": f"unknown path {self.path}"})
+        batcher = self.server.batchers.get(parts[1])
+        if batcher is None:
+            return self._send(404, {"error": f"unknown agent {parts[1]!r}"})
+        try:
+            # JSONDecodeError is a ValueError
+            request = json.loads(body or b"{}")
+            if not isinstance(request, dict):
+                raise TypeError(f"expected a JSON object, got {type(request).__name__}")
+            if parts[2] == "move":
+                boards = [_check_board(request["observation"], request["action_mask"])]
+            else:
+                observations, masks = request["observations"], request["action_masks"]
+                if len(observations) != len(masks):
+                    raise ValueError(f"{len(observations)} observations for {len(masks)} action masks")
+                boards = [_check_board(observation, mask) for observation, mask in zip(observations, masks)]
+        except (KeyError, TypeError, ValueError) as error:
+            # Nothing is queued for a malformed request
+            return self._send(400, {"error": f"bad request: {error!r}"})
+        futures = [batcher.submit(observation, mask) for observation, mask in boards]
+        actions = []
+        errors = {}
+        for index, future in enumerate(futures):
+            try:
+                actions.append(future.result())
+            except Exception as error:
+                actions.append(None)
+                errors[str(index)] = f"agent error: {error!r}"
+        if parts[2] == "move":
+            if errors:
+                return self._send(500, {"error": errors["0"]})
+            return self._send(200, {"action": actions[0]})
+        # Boards of one request may come from unrelated games: each fails alone
+        self._send(200, {"actions": actions, "errors": errors} if errors else {"actions": actions})
+
+
+class AgentServer(ThreadingHTTPServer):
+    """
+    HTTP server for warm agents
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 8000), agents=None, depth_minimax=3, max_batch=64, max_wait_ms=2.0):
+        """
+        Build the agents and bind the server (call serve_forever or start)
+
+        Parameters:
+            address: (host, port), port 0 picks a free port
+            agents: list of agent names (default: every agent of AGENTS)
+            depth_minimax: int, depth of MinimaxAgent
+            max_batch, max_wait_ms: see AgentBatcher
+        """
+        super().__init__(address, _Handler)
+        self.batchers = {name: AgentBatcher(build_agent(name, depth_minimax), max_batch, max_wait_ms)
+                         for name in (agents or AGENTS)}
+
+    def start(self):
+        """
+        Serve in a background thread
+
+        Returns:
+            (host, port) the server listens on
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self.server_address[:2]
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+        for batcher in self.batchers.values():
+            batcher.close()
+
+
+class AgentClient:
+    """
+    Client stub of an AgentServer, on one keep-alive connection
+    """
+
+    def __init__(self, host="127.0.0.1", port=8000, timeout=10.0):
+        self._conn = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _request(self, method, path, payload=None):
+        # bytes, so that http.client sends headers and body in one segment
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        self._conn.request(method, path, body, headers)
+        response = self._conn.getresponse()
+        data = json.loads(response.read())
+        if response.status != 200:
+            raise RuntimeError(f"{response.status}: {data.get('error')}")
+        return data
+
+    def agents(self):
+        return self._request("GET", "/agents")["agents"]
+
+    def choose_action(self, agent, observation, action_mask):
+        payload = {"observation": np.asarray(observation).tolist(), "action_mask": np.asarray(action_mask).tolist()}
+        return self._request("POST", f"/agents/{agent}/move", payload)["action"]
+
+    def choose_actions(self, agent, observations, action_masks):
+        """
+        Raises:
+            RuntimeError: the request was rejected, or the agent failed on
+                          some of the boards
+        """
+        payload = {"observations": np.asarray(observations).tolist(),
+                   "action_masks": np.asarray(action_masks).tolist()}
+        data = self._request("POST", f"/agents/{agent}/moves", payload)
+        if data.get("errors"):
+            raise RuntimeError(f"boards {sorted(data['errors'], key=int)} failed: {data['errors']}")
+        return data["actions"]
+
+    def stats(self):
+        return self._request("GET", "/stats")
+
+    def close(self):
+        self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Connect Four agents over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--agents", nargs="+", choices=sorted(AGENTS), default=None)
+    parser.add_argument("--depth", type=int, default=3, help="depth of MinimaxAgent")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    server = AgentServer((args.host, args.port), args.agents, args.depth, args.max_batch, args.max_wait_ms)
+    print(f"Serving {', '.join(server.batchers)} on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark of board.Position against the array helpers
+
+The agents used to work on (6, 7, 2) observation arrays through scalar
+NumPy indexing, each with its own copy of the helpers. The array
+versions of the helpers and agents are frozen in reference_agents.py;
+the helpers are timed against the board.Position operations that
+replaced them, on positions of random games, followed by the time per
+move of each agent and of its array reference.
+
+Usage:
+    python benchmark_board.py --positions 2000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from agent_minimax import MinimaxAgent
+from board import COLUMNS, ROWS, Position
+from reference_agents import (ReferenceMinimaxAgent, ReferenceSmartAgent, ReferenceSmartAgentAmeliore,
+                              reference_completes_four, reference_evaluate, reference_next_row, reference_simulate,
+                              reference_valid_moves, reference_wins)
+from smart_agent import SmartAgent
+from smart_agent_ameliore import SmartAgentAmeliore
+
+
+def random_positions(count, seed=0):
+    """
+    Observations (int8, player to move in channel 0) and action masks of
+    random games, of every length
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        position = Position()
+        channel = 0
+        for _ in range(rng.randrange(ROWS * COLUMNS - 1)):
+            valid = position.valid_columns()
+            col = rng.choice(valid)
+            row = position.play(col, channel)
+            if position.completes_four(row, col, channel):
+                position.undo()
+                break
+            channel = 1 - channel
+        observation = position.to_observation()
+        if channel == 1:
+            observation = observation[:, :, ::-1].copy()
+        mask = np.array([int(position.next_row(col) is not None) for col in range(COLUMNS)], dtype=np.int8)
+        positions.append((observation, mask))
+    return positions
+
+
+def _time(function, items, repeat=3):
+    # Best of repeat, in microseconds per item
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            function(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e6
+
+
+def helper_cases(observations):
+    """
+    (name, reference function, Position function, reference inputs, Position
+    inputs) of every timed helper
+    """
+    positions = [Position.from_observation(observation) for observation in observations]
+    cells = [(observation, position, col, reference_next_row(observation, col))
+             for observation, position in zip(observations, positions) for col in range(COLUMNS)
+             if reference_next_row(observation, col) is not None]
+    return [
+        ("next_row", lambda o: [reference_next_row(o, col) for col in range(COLUMNS)],
+         lambda p: [p.next_row(col) for col in range(COLUMNS)], observations, positions),
+        ("valid_moves", reference_valid_moves, Position.valid_columns, observations, positions),
+        ("completes_four", lambda cell: reference_completes_four(cell[0], cell[3], cell[2], 0),
+         lambda cell: cell[1].completes_four(cell[3], cell[2], 0), cells, cells),
+        ("simulate_move", lambda cell: reference_simulate(cell[0], cell[2], 0),
+         lambda cell: cell[1].copy().play(cell[2], 0), cells, cells),
+        ("wins", lambda o: reference_wins(o, 0), lambda p: p.wins(0), observations, positions),
+        ("evaluate", reference_evaluate, MinimaxAgent()._evaluate, observations, positions),
+    ]
+
+
+def run(count=2000, depth=3, seed=0):
+    """
+    Print microseconds per call of each helper (array reference and
+    Position) and per move of each agent
+
+    Parameters:
+        count (int): number of random positions
+        depth (int): depth of MinimaxAgent
+        seed (int): seed of the positions and of the agents
+
+    Returns:
+        dict: {helper: (reference_us, position_us)}, from_observation
+              and {agent: (reference_us, position_us)}
+    """
+    positions = random_positions(count, seed)
+    observations = [observation for observation, _ in positions]
+    results = {}
+    print(f"{'helper':<18}{'arrays us':>12}{'Position us':>14}{'speedup':>10}")
+    for name, reference, optimized, reference_inputs, optimized_inputs in helper_cases(observations):
+        before = _time(reference, reference_inputs)
+        after = _time(optimized, optimized_inputs)
+        results[name] = (before, after)
+        print(f"{name:<18}{before:>12.2f}{after:>14.2f}{before / after:>9.1f}x")
+    # Paid once per move by the agents
+    results["from_observation"] = _time(Position.from_observation, observations)
+    print(f"{'from_observation':<18}{'':>12}{results['from_observation']:>14.2f}")
+
+    print(f"\n{'agent':<22}{'arrays us':>12}{'Position us':>14}{'speedup':>10}")
+    agents = [(ReferenceSmartAgent(), SmartAgent()), (ReferenceSmartAgentAmeliore(), SmartAgentAmeliore()),
+              (ReferenceMinimaxAgent(depth=depth), MinimaxAgent(depth=depth))]
+    for reference, agent in agents:
+        timings = []
+        for player in (reference, agent):
+            random.seed(seed)
+            timings.append(_time(lambda item: player.choose_action(item[0], action_mask=item[1]),
+                                 positions[:200], repeat=1))
+        before, after = timings
+        results[agent.player_name] = (before, after)
+        print(f"{agent.player_name:<22}{before:>12.1f}{after:>14.1f}{before / after:>9.1f}x")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark board.Position against the array helpers")
+    parser.add_argument("--positions", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=3, help="depth of MinimaxAgent")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.positions, args.depth, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Board
+
+Compact Connect Four position shared by the agents. Each player's pieces
+are a bit mask: bit col * 7 + h is the cell at height h (from the bottom)
+of column col, and the 7th bit of every column stays empty so that lines
+never wrap from one column to the next. Four in a row, legal moves and
+line counts become a few integer operations instead of scalar indexing
+into (6, 7, 2) arrays.
+
+Rows and channels follow the PettingZoo observation: row 0 is the top
+row, channel 0 the player to move in the observation, channel 1 the
+opponent.
+"""
+
+ROWS = 6
+COLUMNS = 7
+HEIGHT = ROWS + 1
+
+# BITS[row][col]: bit of an observation cell
+BITS = tuple(tuple(1 << (col * HEIGHT + ROWS - 1 - row) for col in range(COLUMNS)) for row in range(ROWS))
+
+# Cells of each column
+COLUMN_MASKS = tuple(((1 << ROWS) - 1) << (col * HEIGHT) for col in range(COLUMNS))
+
+# Bit distance between neighbours: vertical, horizontal and both diagonals
+SHIFTS = (1, HEIGHT, HEIGHT - 1, HEIGHT + 1)
+
+
+def _windows():
+    windows = []
+    for row in range(ROWS):
+        for col in range(COLUMNS):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                cells = [(row + i * dr, col + i * dc) for i in range(4)]
+                if all(0 <= r < ROWS and 0 <= c < COLUMNS for r, c in cells):
+                    windows.append(sum(BITS[r][c] for r, c in cells))
+    return tuple(windows)
+
+
+# The 69 lines of four cells, as bit masks
+WINDOWS = _windows()
+
+
+def has_four(mask):
+    """
+    True if a bit mask contains four in a row
+    """
+    for shift in SHIFTS:
+        pairs = mask & (mask >> shift)
+        if pairs & (pairs >> 2 * shift):
+            return True
+    return False
+
+
+class Position:
+    """
+    Bit masks of both channels, column heights and the stack of moves
+    """
+
+    __slots__ = ("masks", "heights", "moves")
+
+    def __init__(self, masks=(0, 0), heights=None, moves=()):
+        """
+        Create a position (empty by default)
+
+        Parameters:
+            masks: (channel 0 mask, channel 1 mask)
+            heights: number of pieces per column (computed from the masks
+                     when omitted)
+            moves: (column, channel) pairs played so far, for undo
+        """
+        self.masks = list(masks)
+        if heights is None:
+            occupied = self.masks[0] | self.masks[1]
+            heights = []
+            for col in range(COLUMNS):
+                column = (occupied >> (col * HEIGHT)) & ((1 << ROWS) - 1)
+                # Lowest empty cell, as the agents' former next-row scan
+                heights.append(((~column & (column + 1)).bit_length() - 1))
+        self.heights = list(heights)
+        self.moves = list(moves)
+
+    @classmethod
+    def from_observation(cls, observation):
+        """
+        Position of a PettingZoo observation (array or nested lists (6, 7, 2))
+        """
+        cells = observation.tolist() if hasattr(observation, "tolist") else observation
+        own = other = 0
+        for bits, line in zip(BITS, cells):
+            for bit, (first, second) in zip(bits, line):
+                if first:
+                    own |= bit
+                elif second:
+                    other |= bit
+        return cls((own, other))
+
+    def to_observation(self):
+        """
+        Returns:
+            numpy int8 array (6, 7, 2), as in the PettingZoo observation
+        """
+        import numpy as np
+
+        observation = np.zeros((ROWS, COLUMNS, 2), dtype=np.int8)
+        for row in range(ROWS):
+            for col in range(COLUMNS):
+                for channel in (0, 1):
+                    if self.masks[channel] & BITS[row][col]:
+                        observation[row, col, channel] = 1
+        return observation
+
+    def copy(self):
+        return Position(self.masks, self.heights, self.moves)
+
+    def next_row(self, col):
+        """
+        Row a piece dropped in col lands on, None if the column is full
+        """
+        height = self.heights[col]
+        return ROWS - 1 - height if height < ROWS else None
+
+    def valid_columns(self):
+        return [col for col in range(COLUMNS) if self.heights[col] < ROWS]
+
+    def has(self, row, col, channel):
+        return bool(self.masks[channel] & BITS[row][col])
+
+    def is_empty(self, row, col):
+        return not (self.masks[0] | self.masks[1]) & BITS[row][col]
+
+    def play(self, col, channel):
+        """
+        Drop a piece of channel in col
+
+        Returns:
+            int: row of the piece
+        """
+        height = self.heights[col]
+        self.masks[channel] |= 1 << (col * HEIGHT + height)
+        self.heights[col] = height + 1
+        self.moves.append((col, channel))
+        return ROWS - 1 - height
+
+    def undo(self):
+        """
+        Take back the last move
+        """
+        col, channel = self.moves.pop()
+        self.heights[col] -= 1
+        self.masks[channel] &= ~(1 << (col * HEIGHT + self.heights[col]))
+
+    def wins(self, channel):
+        """
+        True if channel has four in a row
+        """
+        return has_four(self.masks[channel])
+
+    def completes_four(self, row, col, channel):
+        """
+        True if a piece of channel at (row, col) would be part of four in a row
+        """
+        bit = BITS[row][col]
+        mask = self.masks[channel] | bit
+        for shift in SHIFTS:
+            pairs = mask & (mask >> shift)
+            fours = pairs & (pairs >> 2 * shift)
+            # fours holds the lowest bit of every line; keep those through bit
+            if fours & (bit | bit >> shift | bit >> 2 * shift | bit >> 3 * shift):
+                return True
+        return False
+
+    def __repr__(self):
+        rows = ["".join("X" if self.has(row, col, 0) else "O" if self.has(row, col, 1) else "."
+                        for col in range(COLUMNS)) for row in range(ROWS)]
+        return f"Position({'/'.join(rows)})"
+
+
+def as_position(board):
+    """
+    Position of a board given as a Position (returned as is) or an observation
+    """
+    return board if isinstance(board, Position) else Position.from_observation(board)
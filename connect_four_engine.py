@@ -0,0 +1,216 @@
+"""
+Headless Connect Four engine
+
+A lightweight replacement for pettingzoo.classic.connect_four_v3 in
+tournaments. It exposes the same AEC interface (reset / step / last /
+agent_iter / action_space), the same observation dict and the same
+rewards and termination semantics, including the wrappers used by
+connect_four_v3.env() (illegal move = loss, out-of-range action = error).
+
+Observations are views on buffers that are updated in place: an
+observation stays valid until the next call to step or reset. Copy it if
+it must be kept longer.
+"""
+
+import numpy as np
+
+ROWS = 6
+COLUMNS = 7
+
+# Directions checked for four in a row: horizontal, vertical, two diagonals
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+class ConnectFourEngine:
+    """
+    Connect Four with the PettingZoo AEC API and no rendering
+    """
+
+    metadata = {"render_modes": [], "name": "connect_four_native", "is_parallelizable": False}
+
+    def __init__(self, render_mode=None):
+        """
+        Initialize the engine
+
+        Parameters:
+            render_mode: accepted for compatibility with connect_four_v3,
+                         the engine never renders
+        """
+        from gymnasium import spaces
+
+        self.render_mode = render_mode
+        self.possible_agents = ["player_0", "player_1"]
+        self.agents = []
+        self.action_spaces = {name: spaces.Discrete(COLUMNS) for name in self.possible_agents}
+
+        # grid[row][col]: 0 empty, 1 player_0, 2 player_1
+        self._grid = [[0] * COLUMNS for _ in range(ROWS)]
+        self._heights = [0] * COLUMNS
+        # One observation buffer per player, from that player's point of view
+        self._boards = [np.zeros((ROWS, COLUMNS, 2), dtype=np.int8) for _ in self.possible_agents]
+        self._mask = np.ones(COLUMNS, dtype=np.int8)
+        self._no_moves = np.zeros(COLUMNS, dtype=np.int8)
+        self._views = {
+            name: ({"observation": board, "action_mask": self._no_moves},
+                   {"observation": board, "action_mask": self._mask})
+            for name, board in zip(self.possible_agents, self._boards)
+        }
+        self._has_reset = False
+
+    def reset(self, seed=None, options=None):
+        """
+        Start a new game (the engine itself has no randomness)
+        """
+        for row in self._grid:
+            row[:] = [0] * COLUMNS
+        self._heights[:] = [0] * COLUMNS
+        for board in self._boards:
+            board.fill(0)
+        self._mask.fill(1)
+        self.num_moves = 0
+
+        self.agents = self.possible_agents[:]
+        self.rewards = dict.fromkeys(self.agents, 0)
+        self._cumulative_rewards = dict.fromkeys(self.agents, 0)
+        self.terminations = dict.fromkeys(self.agents, False)
+        self.truncations = dict.fromkeys(self.agents, False)
+        self.infos = {name: {} for name in self.agents}
+        self.agent_selection = self.agents[0]
+        self._skip_agent_selection = None
+        self._has_reset = True
+
+    def action_space(self, agent):
+        return self.action_spaces[agent]
+
+    def observe(self, agent):
+        """
+        Observation of one player (channel 0 = own pieces)
+
+        The action mask is only filled for the player to move.
+        """
+        return self._views[agent][agent == self.agent_selection]
+
+    def last(self, observe=True):
+        """
+        Returns observation, cumulative reward, terminated, truncated, info
+        for the player to move
+        """
+        agent = self.agent_selection
+        return (
+            self.observe(agent) if observe else None,
+            self._cumulative_rewards[agent],
+            self.terminations[agent],
+            self.truncations[agent],
+            self.infos[agent],
+        )
+
+    def agent_iter(self, max_iter=2**63):
+        """
+        Yield the player to move until both players are done
+        """
+        while self.agents and max_iter > 0:
+            max_iter -= 1
+            yield self.agent_selection
+
+    def step(self, action):
+        """
+        Play a column for the player to move, or None for a finished player
+        """
+        if not self._has_reset:
+            raise RuntimeError("reset() needs to be called before step()")
+        if not self.agents:
+            return
+        agent = self.agent_selection
+        if self.terminations[agent] or self.truncations[agent]:
+            self._was_dead_step(action)
+            return
+        assert action is not None and 0 <= action < COLUMNS, "action is not in action space"
+
+        if self._heights[action] == ROWS:
+            self._illegal_move(agent)
+            return
+
+        player = self.possible_agents.index(agent)
+        row = ROWS - 1 - self._heights[action]
+        self._heights[action] += 1
+        self._grid[row][action] = player + 1
+        self._boards[player][row, action, 0] = 1
+        self._boards[1 - player][row, action, 1] = 1
+        if row == 0:
+            self._mask[action] = 0
+        self.num_moves += 1
+
+        next_agent = self.possible_agents[1 - player]
+        if self._is_win(row, action, player + 1):
+            self.rewards[agent] += 1
+            self.rewards[next_agent] -= 1
+            self.terminations = dict.fromkeys(self.agents, True)
+        elif self.num_moves == ROWS * COLUMNS:
+            self.terminations = dict.fromkeys(self.agents, True)
+
+        self.agent_selection = next_agent
+        for name, reward in self.rewards.items():
+            self._cumulative_rewards[name] += reward
+
+    def _is_win(self, row, col, piece):
+        """
+        Check if the piece just placed at (row, col) makes four in a row
+        """
+        grid = self._grid
+        for dr, dc in _DIRECTIONS:
+            count = 1
+            r, c = row + dr, col + dc
+            while 0 <= r < ROWS and 0 <= c < COLUMNS and grid[r][c] == piece:
+                count += 1
+                r += dr
+                c += dc
+            r, c = row - dr, col - dc
+            while 0 <= r < ROWS and 0 <= c < COLUMNS and grid[r][c] == piece:
+                count += 1
+                r -= dr
+                c -= dc
+            if count >= 4:
+                return True
+        return False
+
+    def _illegal_move(self, agent):
+        # Same outcome as PettingZoo's TerminateIllegalWrapper(illegal_reward=-1)
+        self._cumulative_rewards[agent] = 0
+        self.terminations = dict.fromkeys(self.agents, True)
+        self.truncations = dict.fromkeys(self.agents, True)
+        self.rewards = dict.fromkeys(self.agents, 0)
+        self.rewards[agent] = -1.0
+        for name, reward in self.rewards.items():
+            self._cumulative_rewards[name] += reward
+        self._skip_agent_selection = self.agent_selection
+        self.agent_selection = self.agents[0]
+
+    def _was_dead_step(self, action):
+        # Same bookkeeping as pettingzoo.AECEnv._was_dead_step
+        if action is not None:
+            raise ValueError("when an agent is dead, the only valid action is None")
+        agent = self.agent_selection
+        del self.terminations[agent]
+        del self.truncations[agent]
+        del self.rewards[agent]
+        del self._cumulative_rewards[agent]
+        del self.infos[agent]
+        self.agents.remove(agent)
+
+        dead = [name for name in self.agents if self.terminations[name] or self.truncations[name]]
+        if dead:
+            if self._skip_agent_selection is None:
+                self._skip_agent_selection = self.agent_selection
+            self.agent_selection = dead[0]
+        else:
+            if self._skip_agent_selection is not None:
+                self.agent_selection = self._skip_agent_selection
+            self._skip_agent_selection = None
+        for name in self.rewards:
+            self.rewards[name] = 0
+
+    def render(self):
+        return None
+
+    def close(self):
+        pass
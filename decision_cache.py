@@ -0,0 +1,165 @@
+"""
+Decision cache for Connect Four agents
+
+This module wraps any agent and remembers the action it chose for a given
+position, so that repeated positions (openings, seeded games) are answered
+without running the agent's rules again.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+def position_key(observation, action_mask=None):
+    """
+    Build a compact, hashable key for a position
+
+    Parameters:
+        observation: numpy array (6, 7, 2) - current board state
+        action_mask: numpy array (7,) with 1 for valid, 0 for invalid
+
+    Returns:
+        bytes: 11 bytes of packed board bits followed by 1 byte of packed mask
+    """
+    board_bits = np.packbits(np.asarray(observation) != 0)
+    if action_mask is None:
+        mask_bits = np.packbits(np.ones(7, dtype=bool))
+    else:
+        mask_bits = np.packbits(np.asarray(action_mask) != 0)
+    return board_bits.tobytes() + mask_bits.tobytes()
+
+
+class DecisionCache:
+    """
+    Bounded LRU store of (position key -> action) with hit/miss counters
+    """
+
+    def __init__(self, maxsize=65536):
+        """
+        Initialize the cache
+
+        Parameters:
+            maxsize: maximum number of positions kept before evicting
+                     the least recently used one
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Look up a key and count the hit or miss
+
+        Returns:
+            cached action (int) or None if the key is unknown
+        """
+        action = self._entries.get(key)
+        if action is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return action
+
+    def put(self, key, action):
+        """
+        Store an action, evicting the least recently used entry if full
+        """
+        self._entries[key] = action
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    def stats(self):
+        """
+        Summarize the cache counters
+
+        Returns:
+            dict: hits, misses, bypasses, hit rate and current size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+
+class CachedAgent:
+    """
+    Wrapper that answers repeated positions from a DecisionCache
+
+    The wrapped agent reports a random fallback through its
+    ``last_action_random`` attribute; such moves are never stored.
+    Agents that do not expose the attribute are treated as random,
+    so wrapping them is always safe (the cache simply stays empty).
+    """
+
+    def __init__(self, agent, cache=None, maxsize=65536):
+        """
+        Initialize the wrapper
+
+        Parameters:
+            agent: any agent with a choose_action method
+            cache: optional DecisionCache shared between several games
+            maxsize: size of the cache created when none is given
+        """
+        self.agent = agent
+        self.cache = cache if cache is not None else DecisionCache(maxsize)
+
+    def __getattr__(self, name):
+        # Forward everything else (player_name, action_space, ...) to the agent
+        return getattr(self.agent, name)
+
+    @property
+    def label(self):
+        """
+        Name of the wrapped agent in reports (latency, spectators)
+        """
+        return getattr(self.agent, "label", type(self.agent).__name__)
+
+    def choose_action(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
+        """
+        Return the cached action for this position or ask the wrapped agent
+
+        Parameters:
+            same as the wrapped agent's choose_action
+
+        Returns:
+            int: column index (0-6) where to play
+        """
+        key = position_key(observation, action_mask)
+        action = self.cache.get(key)
+        if action is not None:
+            return action
+
+        action = self.agent.choose_action(
+            observation=observation,
+            reward=reward,
+            terminated=terminated,
+            truncated=truncated,
+            info=info,
+            action_mask=action_mask,
+        )
+        if getattr(self.agent, "last_action_random", True):
+            self.cache.bypasses += 1
+        else:
+            self.cache.put(key, action)
+        return action
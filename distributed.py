@@ -0,0 +1,420 @@
+"""
+Distributed tournaments
+
+A coordinator splits a matchup into batches of game indices and serves
+them over TCP with a multiprocessing.managers server. Workers on any
+machine fetch batches, play them and send back a MatchStats per batch.
+A batch whose worker stops sending heartbeats is handed out again, and
+every game is seeded with game_seed(base_seed, i), so the results are
+the same as a serial run whatever the number of workers or failures.
+
+The manager protocol unpickles requests: anyone who knows the authkey
+can run code on the coordinator. The coordinator listens on localhost
+by default, and only listens on other addresses with a secret set in
+C4_AUTHKEY.
+
+Usage:
+    python distributed.py coordinator --agents RandomAgent SmartAgent --games 100000 --port 5000
+    C4_AUTHKEY=secret python distributed.py coordinator --agents RandomAgent SmartAgent --host 0.0.0.0
+    C4_AUTHKEY=secret python distributed.py worker --host coordinator-host --port 5000
+"""
+
+import argparse
+import importlib
+import ipaddress
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from multiprocessing.managers import BaseManager
+
+from online_stats import MatchStats
+from test_tournament import game_seed, make_agents, make_env, play_game
+
+# Default secret, only safe on a coordinator listening on localhost
+AUTHKEY = b"connect-four"
+
+
+def class_path(cls):
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def load_class(path):
+    """
+    Import a class from a "module:QualName" path
+    """
+    module, _, name = path.partition(":")
+    obj = importlib.import_module(module)
+    for part in name.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+class Broker:
+    """
+    Work queue of game batches with leases, living in the coordinator
+    """
+
+    def __init__(self, batches, lease_timeout=30.0):
+        """
+        Initialize the queue
+
+        Parameters:
+            batches: list of batch dicts (see play_distributed)
+            lease_timeout: float, seconds without heartbeat after which a
+                           leased batch is handed out again
+        """
+        self.lease_timeout = lease_timeout
+        self._batches = {batch["batch_id"]: batch for batch in batches}
+        self._pending = [batch["batch_id"] for batch in batches]
+        self._leases = {}
+        self._results = {}
+        self._lock = threading.Lock()
+        self.requeued = 0
+        self.workers = set()
+
+    def _expire(self):
+        now = time.monotonic()
+        for batch_id, (worker, deadline) in list(self._leases.items()):
+            if deadline < now:
+                del self._leases[batch_id]
+                self._pending.append(batch_id)
+                self.requeued += 1
+
+    def get_batch(self, worker):
+        """
+        Returns:
+            dict, "wait" or None: a batch to play, "wait" while other
+            workers hold the remaining batches, None once all are done
+        """
+        with self._lock:
+            self.workers.add(worker)
+            self._expire()
+            if self._pending:
+                batch_id = self._pending.pop(0)
+                self._leases[batch_id] = (worker, time.monotonic() + self.lease_timeout)
+                return self._batches[batch_id]
+            return "wait" if self._leases else None
+
+    def heartbeat(self, worker):
+        """
+        Extend the leases of a worker's batches
+        """
+        with self._lock:
+            deadline = time.monotonic() + self.lease_timeout
+            for batch_id, (owner, _) in list(self._leases.items()):
+                if owner == worker:
+                    self._leases[batch_id] = (owner, deadline)
+
+    def submit(self, worker, batch_id, stats):
+        """
+        Store the result of a batch (later duplicates are ignored)
+        """
+        with self._lock:
+            self._leases.pop(batch_id, None)
+            if batch_id in self._pending:
+                self._pending.remove(batch_id)
+            self._results.setdefault(batch_id, stats)
+
+    def progress(self):
+        with self._lock:
+            return {"done": len(self._results), "total": len(self._batches), "requeued": self.requeued,
+                    "workers": len(self.workers)}
+
+    def leased(self):
+        """
+        Returns:
+            int: batches held by live workers (expired leases are requeued)
+        """
+        with self._lock:
+            self._expire()
+            return len(self._leases)
+
+    def done(self):
+        with self._lock:
+            return len(self._results) == len(self._batches)
+
+    def results(self):
+        with self._lock:
+            return dict(self._results)
+
+
+class _CoordinatorManager(BaseManager):
+    pass
+
+
+class _WorkerManager(BaseManager):
+    pass
+
+
+_WorkerManager.register("broker")
+
+
+class Coordinator:
+    """
+    Manager server of a Broker, accepting workers in a background thread
+    """
+
+    def __init__(self, broker, address=("127.0.0.1", 0), authkey=AUTHKEY):
+        """
+        Bind the server and start accepting connections
+
+        Parameters:
+            broker: Broker to serve
+            address: (host, port) to listen on, port 0 picks a free port
+            authkey: bytes, shared secret of coordinator and workers
+        """
+        manager = _CoordinatorManager(address=address, authkey=authkey)
+        manager.register("broker", callable=lambda: broker)
+        self._server = manager.get_server()
+        # Checked by the threads serving each connection
+        self._server.stop_event = threading.Event()
+        self.address = self._server.address
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+
+    def _accept(self):
+        # Server.serve_forever cannot be stopped cleanly from a thread: it
+        # resets sys.stdout and leaves its listener open
+        while True:
+            try:
+                connection = self._server.listener.accept()
+            except OSError:
+                if self._server.stop_event.is_set():
+                    return
+                continue
+            if self._server.stop_event.is_set():
+                connection.close()
+                return
+            threading.Thread(target=self._server.handle_request, args=(connection,), daemon=True).start()
+
+    def close(self):
+        """
+        Stop accepting workers and close the listening socket
+        """
+        self._server.stop_event.set()
+        host, port = self.address
+        # Wakes the accepting thread up (the handshake of this connection fails)
+        try:
+            socket.create_connection(("127.0.0.1" if host in ("", "0.0.0.0") else host, port), timeout=1).close()
+        except OSError:
+            pass
+        self._thread.join()
+        self._server.listener.close()
+
+
+def start_coordinator(batches, address=("127.0.0.1", 0), authkey=AUTHKEY, lease_timeout=30.0):
+    """
+    Serve a batch queue in a background thread of the current process
+
+    Returns:
+        tuple: (Broker, Coordinator); workers connect to Coordinator.address,
+               Coordinator.close() stops the server
+    """
+    broker = Broker(batches, lease_timeout)
+    return broker, Coordinator(broker, address, authkey)
+
+
+def _heartbeats(address, authkey, worker, interval, stop):
+    # Separate connection: manager proxies are not shared between threads
+    manager = _WorkerManager(address=address, authkey=authkey)
+    manager.connect()
+    broker = manager.broker()
+    while not stop.wait(interval):
+        broker.heartbeat(worker)
+
+
+def run_worker(address, authkey=AUTHKEY, worker=None, heartbeat_interval=5.0, poll_interval=0.2):
+    """
+    Fetch and play batches until the coordinator has none left
+
+    Parameters:
+        address: (host, port) of the coordinator
+        authkey: bytes, shared secret of the coordinator
+        worker: str, name of this worker (default host:pid)
+        heartbeat_interval: float, seconds between heartbeats
+        poll_interval: float, wait when all batches are leased
+
+    Returns:
+        int: number of batches played
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    manager = _WorkerManager(address=tuple(address), authkey=authkey)
+    manager.connect()
+    broker = manager.broker()
+
+    stop = threading.Event()
+    threading.Thread(target=_heartbeats, args=(tuple(address), authkey, worker, heartbeat_interval, stop),
+                     daemon=True).start()
+
+    # Environment and agents are reused across the batches of a pairing
+    setups = {}
+    played = 0
+    try:
+        while True:
+            batch = broker.get_batch(worker)
+            if batch is None:
+                break
+            if batch == "wait":
+                time.sleep(poll_interval)
+                continue
+            setup_key = (batch["agent1"], batch["agent2"], batch["depth_minimax"], batch["engine"])
+            if setup_key not in setups:
+                env = make_env(batch["engine"])
+                env.reset()
+                setups[setup_key] = (env, make_agents(env, load_class(batch["agent1"]), load_class(batch["agent2"]),
+                                                      batch["depth_minimax"]))
+            env, agent_dict = setups[setup_key]
+
+            stats = MatchStats()
+            for game_id in range(batch["start"], batch["stop"]):
+                seed = game_seed(batch["base_seed"], game_id)
+                winner, moves = play_game(env, agent_dict, seed=seed, agent_seed=seed, game_id=game_id,
+                                          verbose=False)
+                stats.add(winner, moves)
+            broker.submit(worker, batch["batch_id"], stats)
+            played += 1
+    finally:
+        stop.set()
+    return played
+
+
+def make_batches(agent1_class, agent2_class, num_games, base_seed=42, engine="native", depth_minimax=3,
+                 batch_size=50):
+    """
+    Split a matchup into batches of consecutive game indices
+    """
+    return [{
+        "batch_id": i,
+        "agent1": class_path(agent1_class),
+        "agent2": class_path(agent2_class),
+        "base_seed": base_seed,
+        "start": start,
+        "stop": min(start + batch_size, num_games),
+        "engine": engine,
+        "depth_minimax": depth_minimax,
+    } for i, start in enumerate(range(0, num_games, batch_size))]
+
+
+def play_distributed(agent1_class, agent2_class, num_games=1000, base_seed=42, engine="native", depth_minimax=3,
+                     batch_size=50, local_workers=0, address=("127.0.0.1", 0), authkey=AUTHKEY, lease_timeout=30.0,
+                     progress_every=None):
+    """
+    Play a matchup on distributed workers and merge their results.
+
+    Parameters:
+        agent1_class: class of player 0
+        agent2_class: class of player 1
+        num_games: int, number of games
+        base_seed: int, base seed of the games
+        engine: str, "pettingzoo" or "native"
+        depth_minimax: int, depth for MinimaxAgent if used
+        batch_size: int, games per batch
+        local_workers: int, worker processes started on this machine
+            (remote workers can join at any time with run_worker)
+        address: (host, port) to listen on, port 0 picks a free port
+        authkey: bytes, shared secret of coordinator and workers
+        lease_timeout: float, seconds after which a silent worker's batch
+            is handed out again
+        progress_every: float or None, seconds between progress prints
+
+    Returns:
+        dict: same statistics as play_multiple_games(..., base_seed=base_seed),
+              plus a "distributed" entry (done, total, requeued, workers)
+
+    Raises:
+        RuntimeError: every local worker exited before the end and no
+            remote worker holds a batch (without local workers, the
+            coordinator waits for remote ones)
+    """
+    batches = make_batches(agent1_class, agent2_class, num_games, base_seed, engine, depth_minimax, batch_size)
+    broker, coordinator = start_coordinator(batches, address, authkey, lease_timeout)
+    heartbeat_interval = max(0.05, lease_timeout / 3)
+    processes = [multiprocessing.Process(target=run_worker,
+                                         args=(coordinator.address, authkey, None, heartbeat_interval), daemon=True)
+                 for _ in range(local_workers)]
+    try:
+        for process in processes:
+            process.start()
+
+        last_report = time.monotonic()
+        while not broker.done():
+            time.sleep(0.05)
+            if processes and not any(process.is_alive() for process in processes) and not broker.done() \
+                    and not broker.leased():
+                codes = [process.exitcode for process in processes]
+                raise RuntimeError(f"all local workers exited (exit codes {codes}) with "
+                                   f"{broker.progress()['total'] - broker.progress()['done']} batches left "
+                                   f"and no remote worker")
+            if progress_every and time.monotonic() - last_report >= progress_every:
+                last_report = time.monotonic()
+                print(f"[{agent1_class.__name__} vs {agent2_class.__name__}] {broker.progress()}")
+        for process in processes:
+            process.join()
+    finally:
+        coordinator.close()
+
+    stats = MatchStats()
+    for batch_stats in broker.results().values():
+        stats.merge(batch_stats)
+    results = stats.results()
+    results["distributed"] = broker.progress()
+    print(f"\n{agent1_class.__name__} vs {agent2_class.__name__} (distributed, "
+          f"{results['distributed']['workers']} workers)\n")
+    print(results)
+    return results
+
+
+def is_loopback(host):
+    """
+    Returns:
+        bool: host only accepts connections from this machine
+    """
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed Connect Four tournaments")
+    commands = parser.add_subparsers(dest="command", required=True)
+    coordinator = commands.add_parser("coordinator")
+    coordinator.add_argument("--agents", nargs=2, required=True,
+                             help="agent classes, as Name (test_tournament) or module:Name")
+    coordinator.add_argument("--games", type=int, default=1000)
+    coordinator.add_argument("--seed", type=int, default=42)
+    coordinator.add_argument("--engine", choices=["native", "pettingzoo"], default="native")
+    coordinator.add_argument("--depth", type=int, default=3)
+    coordinator.add_argument("--batch-size", type=int, default=50)
+    coordinator.add_argument("--local-workers", type=int, default=0)
+    coordinator.add_argument("--host", default="127.0.0.1",
+                             help="address to listen on; other than localhost, C4_AUTHKEY must be set")
+    coordinator.add_argument("--port", type=int, default=5000)
+    coordinator.add_argument("--lease-timeout", type=float, default=30.0)
+    worker = commands.add_parser("worker")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=5000)
+    worker.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+    authkey = os.environ.get("C4_AUTHKEY", AUTHKEY.decode()).encode()
+    if args.command == "coordinator" and "C4_AUTHKEY" not in os.environ and not is_loopback(args.host):
+        parser.error(f"listening on {args.host} requires a secret in C4_AUTHKEY: the default key is public "
+                     f"and workers' requests are unpickled")
+
+    if args.command == "coordinator":
+        classes = [load_class(name if ":" in name else f"test_tournament:{name}") for name in args.agents]
+        play_distributed(classes[0], classes[1], args.games, args.seed, args.engine, args.depth, args.batch_size,
+                         args.local_workers, (args.host, args.port), authkey, args.lease_timeout, progress_every=10)
+    else:
+        processes = [multiprocessing.Process(target=run_worker, args=((args.host, args.port), authkey))
+                     for _ in range(args.processes)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Differential fuzzing of Connect Four engines against PettingZoo
+
+Plays random and adversarial move sequences through
+pettingzoo.classic.connect_four_v3 and a candidate engine side by side,
+compares boards, masks, rewards and termination after every step, and
+shrinks any divergence to a minimal move sequence.
+
+Candidates: "native" (connect_four_engine.ConnectFourEngine) and
+"position" (PositionEngine, the same engine playing on a board.Position,
+the agents' bitboard).
+
+Usage:
+    python fuzz_engines.py --games 1000000 --workers 8
+    python fuzz_engines.py --candidate position
+"""
+
+import argparse
+import os
+import random
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from board import COLUMNS, ROWS, Position
+from connect_four_engine import ConnectFourEngine
+
+
+class PositionEngine(ConnectFourEngine):
+    """
+    ConnectFourEngine whose state is a board.Position
+
+    Legality, moves, wins, masks and observations all come from the
+    Position (next_row, play, completes_four / wins, valid_columns,
+    to_observation), so fuzzing this engine checks board.py against
+    PettingZoo.
+    """
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed, options)
+        self.position = Position()
+
+    def observe(self, agent):
+        player = self.possible_agents.index(agent)
+        observation = self.position.to_observation()
+        if player == 1:
+            observation = np.ascontiguousarray(observation[:, :, ::-1])
+        mask = np.zeros(COLUMNS, dtype=np.int8)
+        if agent == self.agent_selection:
+            mask[self.position.valid_columns()] = 1
+        return {"observation": observation, "action_mask": mask}
+
+    def step(self, action):
+        if not self._has_reset:
+            raise RuntimeError("reset() needs to be called before step()")
+        if not self.agents:
+            return
+        agent = self.agent_selection
+        if self.terminations[agent] or self.truncations[agent]:
+            self._was_dead_step(action)
+            return
+        assert action is not None and 0 <= action < COLUMNS, "action is not in action space"
+
+        position = self.position
+        row = position.next_row(action)
+        if row is None:
+            self._illegal_move(agent)
+            return
+
+        player = self.possible_agents.index(agent)
+        wins = position.completes_four(row, action, player)
+        assert position.play(action, player) == row, "play and next_row disagree"
+        # A disagreement is reported as a divergence (an error on one side)
+        assert position.wins(player) == wins, "wins and completes_four disagree"
+
+        next_agent = self.possible_agents[1 - player]
+        if wins:
+            self.rewards[agent] += 1
+            self.rewards[next_agent] -= 1
+            self.terminations = dict.fromkeys(self.agents, True)
+        elif len(position.moves) == ROWS * COLUMNS:
+            self.terminations = dict.fromkeys(self.agents, True)
+
+        self.agent_selection = next_agent
+        for name, reward in self.rewards.items():
+            self._cumulative_rewards[name] += reward
+
+
+# Engines that can be checked against PettingZoo, by name
+CANDIDATES = {"native": ConnectFourEngine, "position": PositionEngine}
+
+# Move generators, see choose_move
+STRATEGIES = ("uniform", "legal", "column_fill", "no_win", "misuse")
+
+
+def make_reference():
+    """
+    Create the PettingZoo reference environment (warnings silenced)
+    """
+    from pettingzoo.classic import connect_four_v3
+    from pettingzoo.utils.env_logger import EnvLogger
+
+    EnvLogger.suppress_output()
+    return connect_four_v3.env()
+
+
+def snapshot(env):
+    """
+    Everything observable about an environment after a step
+
+    Returns:
+        tuple that compares equal for two environments in the same state
+    """
+    # Read the state on the unwrapped env, PettingZoo wrappers forward
+    # every attribute access through __getattr__
+    env = getattr(env, "unwrapped", env)
+    if not env.agents:
+        return (tuple(env.agents),)
+    state = [
+        env.agent_selection,
+        tuple(env.agents),
+        env.last(observe=False)[1:4],
+        tuple(sorted(env.rewards.items())),
+        tuple(sorted(env.terminations.items())),
+        tuple(sorted(env.truncations.items())),
+    ]
+    for agent in env.agents:
+        observation = env.observe(agent)
+        state.append(observation["observation"].tobytes())
+        state.append(observation["action_mask"].tobytes())
+    return tuple(state)
+
+
+def step_both(reference, candidate, action):
+    """
+    Step both environments and report the exception types they raised
+
+    Returns:
+        tuple: (reference exception type or None, candidate exception type or None)
+    """
+    errors = []
+    for env in (reference, candidate):
+        try:
+            env.step(action)
+            errors.append(None)
+        except (AssertionError, ValueError, RuntimeError) as error:
+            errors.append(type(error))
+    return tuple(errors)
+
+
+def _wins(board, col):
+    # True if the player to move (channel 0) wins by playing col
+    row = next((r for r in range(5, -1, -1) if board[r, col, 0] == 0 and board[r, col, 1] == 0), None)
+    if row is None:
+        return False
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        count = 1
+        for sign in (1, -1):
+            r, c = row + sign * dr, col + sign * dc
+            while 0 <= r < 6 and 0 <= c < 7 and board[r, c, 0] == 1:
+                count += 1
+                r += sign * dr
+                c += sign * dc
+        if count >= 4:
+            return True
+    return False
+
+
+def choose_move(strategy, env, rng, favourites):
+    """
+    Pick the next action of a fuzzed game
+
+    Strategies:
+        uniform: any column, so full columns give illegal moves
+        legal: a legal column
+        column_fill: mostly the two favourite columns, filling them up
+        no_win: a legal column that does not win if possible (long games, draws)
+        misuse: like uniform, with invalid actions (None, -1, 7, or a column
+                for a finished player) mixed in
+    """
+    observation, _, terminated, truncated, _ = env.last()
+    done = terminated or truncated
+    if strategy == "misuse" and rng.random() < 0.05:
+        return rng.choice([None, -1, 7, 0]) if not done else rng.randrange(7)
+    if done:
+        return None
+    if strategy in ("uniform", "misuse"):
+        return rng.randrange(7)
+    if strategy == "column_fill":
+        return rng.choice(favourites) if rng.random() < 0.8 else rng.randrange(7)
+
+    legal = [col for col in range(7) if observation["action_mask"][col]]
+    if strategy == "no_win":
+        quiet = [col for col in legal if not _wins(observation["observation"], col)]
+        return rng.choice(quiet or legal)
+    return rng.choice(legal)
+
+
+def first_divergence(moves, reference, candidate):
+    """
+    Replay a move sequence on both environments
+
+    Returns:
+        int or None: index of the first move after which the environments
+        differ, -1 if they already differ after reset, None if they agree
+    """
+    reference.reset(seed=42)
+    candidate.reset(seed=42)
+    if snapshot(reference) != snapshot(candidate):
+        return -1
+    for index, action in enumerate(moves):
+        if not reference.agents and not candidate.agents:
+            return None
+        errors = step_both(reference, candidate, action)
+        if errors[0] != errors[1]:
+            return index
+        if errors[0] is not None:
+            return None
+        if snapshot(reference) != snapshot(candidate):
+            return index
+    return None
+
+
+def shrink(moves, reference, candidate):
+    """
+    Reduce a diverging move sequence to a minimal one
+
+    The sequence is cut right after its first divergence, then moves are
+    removed one at a time as long as the environments still diverge.
+
+    Returns:
+        list: minimal diverging move sequence
+    """
+    index = first_divergence(moves, reference, candidate)
+    moves = list(moves[:index + 1])
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(moves) - 1, -1, -1):
+            trial = moves[:i] + moves[i + 1:]
+            index = first_divergence(trial, reference, candidate)
+            if index is not None:
+                moves = trial[:index + 1]
+                changed = True
+                break
+    return moves
+
+
+def fuzz_games(candidate_factory, seed, num_games, strategies=STRATEGIES):
+    """
+    Play fuzzed games through the reference and a candidate engine
+
+    Parameters:
+        candidate_factory: callable returning a candidate environment
+        seed: int, seed of this batch of games
+        num_games: int, number of games
+        strategies: move generators used in turn
+
+    Returns:
+        dict: games, steps, per-strategy game counts and the shrunk
+              diverging sequences found
+    """
+    from pettingzoo.utils.env_logger import EnvLogger
+
+    rng = random.Random(seed)
+    reference = make_reference()
+    candidate = candidate_factory()
+    report = {"games": 0, "steps": 0, "strategies": dict.fromkeys(strategies, 0), "divergences": []}
+
+    for game in range(num_games):
+        strategy = strategies[game % len(strategies)]
+        favourites = [rng.randrange(7), rng.randrange(7)]
+        reference.reset(seed=42)
+        candidate.reset(seed=42)
+        moves = []
+        diverged = snapshot(reference) != snapshot(candidate)
+
+        while not diverged and (reference.agents or candidate.agents):
+            # Both engines agree so far: read the (cheaper) candidate state
+            action = choose_move(strategy, candidate, rng, favourites)
+            moves.append(action)
+            errors = step_both(reference, candidate, action)
+            report["steps"] += 1
+            if errors[0] != errors[1]:
+                diverged = True
+            elif errors[0] is not None:
+                break
+            else:
+                diverged = snapshot(reference) != snapshot(candidate)
+
+        report["games"] += 1
+        report["strategies"][strategy] += 1
+        if diverged:
+            report["divergences"].append({"strategy": strategy, "seed": seed, "game": game,
+                                          "moves": shrink(moves, reference, candidate)})
+        EnvLogger.flush()
+    return report
+
+
+def _fuzz_task(task):
+    candidate, seed, num_games = task
+    factory = CANDIDATES[candidate] if isinstance(candidate, str) else candidate
+    return fuzz_games(factory, seed, num_games)
+
+
+def run_fuzz(num_games=10000, workers=None, candidate="native", seed=0, chunk_size=500):
+    """
+    Fuzz a candidate engine on a pool of worker processes
+
+    Parameters:
+        num_games: int, total number of games
+        workers: int or None, number of processes (default: all CPUs,
+                 1 runs in the current process)
+        candidate: name in CANDIDATES, or a picklable factory
+        seed: int, base seed (chunk i uses seed + i)
+        chunk_size: int, games per task
+
+    Returns:
+        dict: merged report of all chunks
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = [(candidate, seed + i, min(chunk_size, num_games - start))
+             for i, start in enumerate(range(0, num_games, chunk_size))]
+    if workers == 1:
+        reports = map(_fuzz_task, tasks)
+        return _merge_reports(reports)
+    with Pool(workers) as pool:
+        return _merge_reports(pool.imap_unordered(_fuzz_task, tasks))
+
+
+def _merge_reports(reports):
+    merged = {"games": 0, "steps": 0, "strategies": dict.fromkeys(STRATEGIES, 0), "divergences": []}
+    for report in reports:
+        merged["games"] += report["games"]
+        merged["steps"] += report["steps"]
+        for strategy, count in report["strategies"].items():
+            merged["strategies"][strategy] = merged["strategies"].get(strategy, 0) + count
+        merged["divergences"].extend(report["divergences"])
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Differential fuzzing of a Connect Four engine against PettingZoo")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--candidate", choices=sorted(CANDIDATES), default="native")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = run_fuzz(args.games, args.workers, args.candidate, args.seed, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    print(f"{report['games']} games, {report['steps']} steps in {elapsed:.1f}s "
+          f"({report['games'] / elapsed:.0f} games/s)")
+    print("strategies:", report["strategies"])
+    if report["divergences"]:
+        print(f"{len(report['divergences'])} DIVERGENCES")
+        for divergence in report["divergences"][:20]:
+            print(f"  {divergence['strategy']} seed={divergence['seed']} game={divergence['game']}: "
+                  f"{divergence['moves']}")
+        raise SystemExit(1)
+    print("no divergence")
+
+
+if __name__ == "__main__":
+    main()
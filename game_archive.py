@@ -0,0 +1,344 @@
+"""
+Game archive
+
+Compact binary storage for large numbers of games. Every game is a
+fixed-size header (agents, seed, winner, length) followed by its moves
+packed on 3 bits each; an offset index and the agent name table are
+written at the end of the file. Readers memory-map the file and decode
+games or positions on demand.
+
+Each agent name is also written as a record before the first game that
+uses it, so an archive whose writer never closed (no index or footer)
+can be rebuilt by scanning its records: see recover_archive.
+
+Layout:
+    b"C4GA" version(u16)
+    records, each with a header "<BBQbB" (agent 0, agent 1, seed, winner, length):
+        game: ceil(3 * length / 8) bytes of moves
+        agent name (length 255): agent 0 is the id, seed the size of the
+                                 UTF-8 name that follows
+    index: u64 offset of every game record
+    agent names: JSON list
+    footer "<QQQI4s": index offset, number of games, names offset,
+                      names length, b"C4GA"
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+MAGIC = b"C4GA"
+VERSION = 1
+ROWS = 6
+COLUMNS = 7
+
+_FILE_HEADER = struct.Struct("<4sH")
+_GAME_HEADER = struct.Struct("<BBQbB")
+_FOOTER = struct.Struct("<QQQI4s")
+
+# Length field of an agent name record
+_NAME_RECORD = 255
+
+# Winner field of a game header
+_WINNERS = {"player_0": 0, "player_1": 1, None: -1}
+_WINNER_NAMES = {code: name for name, code in _WINNERS.items()}
+
+
+def pack_moves(moves):
+    """
+    Pack columns (0 to 6) on 3 bits each, little endian
+
+    Returns:
+        bytes: ceil(3 * len(moves) / 8) bytes
+    """
+    value = 0
+    for i, col in enumerate(moves):
+        value |= int(col) << (3 * i)
+    return value.to_bytes((3 * len(moves) + 7) // 8, "little")
+
+
+def unpack_moves(data, length):
+    """
+    Inverse of pack_moves
+
+    Returns:
+        list: the length first columns stored in data
+    """
+    value = int.from_bytes(data, "little")
+    return [(value >> (3 * i)) & 7 for i in range(length)]
+
+
+def _read_footer(data):
+    if len(data) < _FILE_HEADER.size + _FOOTER.size:
+        raise ValueError("not a game archive (file too short)")
+    magic, version = _FILE_HEADER.unpack_from(data, 0)
+    footer = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+    if magic != MAGIC or footer[4] != MAGIC:
+        raise ValueError("not a game archive (bad magic, or the writer was not closed: see recover_archive)")
+    if version != VERSION:
+        raise ValueError(f"unsupported game archive version {version}")
+    return footer[:4]
+
+
+def _offsets_from_bytes(data):
+    # Little endian u64 offsets, without one Python int per game
+    offsets = array("Q")
+    offsets.frombytes(data)
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    return offsets
+
+
+def _offsets_to_bytes(offsets):
+    if sys.byteorder == "big":
+        offsets = array("Q", offsets)
+        offsets.byteswap()
+    return offsets.tobytes()
+
+
+def _scan_records(data):
+    """
+    Rebuild the index of an archive by reading its records from the start
+
+    Stops at the first incomplete or invalid record (the end of a file
+    whose writer was interrupted).
+
+    Returns:
+        (offsets array, agent names, offset of the end of the last record)
+    """
+    magic, version = _FILE_HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a game archive (bad magic or version)")
+    offsets = array("Q")
+    names = []
+    offset = end = _FILE_HEADER.size
+    while offset + _GAME_HEADER.size <= len(data):
+        agent_0, agent_1, seed, winner, length = _GAME_HEADER.unpack_from(data, offset)
+        start = offset + _GAME_HEADER.size
+        if length == _NAME_RECORD and agent_0 == len(names) and start + seed <= len(data):
+            try:
+                names.append(bytes(data[start:start + seed]).decode())
+            except UnicodeDecodeError:
+                break
+            offset = start + seed
+        elif (length <= ROWS * COLUMNS and winner in _WINNER_NAMES and max(agent_0, agent_1) < len(names)
+              and start + (3 * length + 7) // 8 <= len(data)):
+            offsets.append(offset)
+            offset = start + (3 * length + 7) // 8
+        else:
+            break
+        end = offset
+    return offsets, names, end
+
+
+class ArchiveWriter:
+    """
+    Writer of a game archive (creates a new file or appends to one)
+    """
+
+    def __init__(self, path, append=False):
+        """
+        Open the archive
+
+        Parameters:
+            path: str, path of the archive
+            append: bool, add games to an existing archive instead of
+                    overwriting it
+        """
+        self.path = path
+        self._names = []
+        self._ids = {}
+        # Record offsets, 8 bytes per game
+        self._offsets = array("Q")
+        if append and os.path.exists(path):
+            self._file = open(path, "r+b")
+            with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                try:
+                    index_offset, count, names_offset, names_length = _read_footer(data)
+                    self._offsets = _offsets_from_bytes(data[index_offset:index_offset + 8 * count])
+                    self._names = json.loads(data[names_offset:names_offset + names_length])
+                except ValueError:
+                    # Writer interrupted before close: rebuild from the records
+                    self._offsets, self._names, index_offset = _scan_records(data)
+            self._ids = {name: i for i, name in enumerate(self._names)}
+            # Index and footer (or a partial record) are rewritten by close
+            self._file.truncate(index_offset)
+            self._file.seek(index_offset)
+        else:
+            self._file = open(path, "wb")
+            self._file.write(_FILE_HEADER.pack(MAGIC, VERSION))
+
+    def _agent_id(self, name):
+        if name not in self._ids:
+            if len(self._names) == 256:
+                raise ValueError("a game archive holds at most 256 agent names")
+            self._ids[name] = len(self._names)
+            self._names.append(name)
+            encoded = name.encode()
+            self._file.write(_GAME_HEADER.pack(self._ids[name], 0, len(encoded), 0, _NAME_RECORD))
+            self._file.write(encoded)
+        return self._ids[name]
+
+    def add_game(self, agent_0, agent_1, seed, winner, moves):
+        """
+        Append one game
+
+        Parameters:
+            agent_0, agent_1: str, names of player_0 and player_1
+            seed: int, seed of the game (0 to 2**64 - 1)
+            winner: "player_0", "player_1" or None for a draw
+            moves: sequence of columns played, from the empty board
+        """
+        if len(moves) > ROWS * COLUMNS:
+            raise ValueError("a game has at most 42 moves")
+        # Name records of new agents go before the game record
+        ids = self._agent_id(agent_0), self._agent_id(agent_1)
+        self._offsets.append(self._file.tell())
+        self._file.write(_GAME_HEADER.pack(*ids, seed, _WINNERS[winner], len(moves)))
+        self._file.write(pack_moves(moves))
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def close(self):
+        """
+        Write the index, the agent names and the footer
+        """
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._file.write(_offsets_to_bytes(self._offsets))
+        names = json.dumps(self._names).encode()
+        names_offset = self._file.tell()
+        self._file.write(names)
+        self._file.write(_FOOTER.pack(index_offset, len(self._offsets), names_offset, len(names), MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def recover_archive(path):
+    """
+    Make an archive whose writer was interrupted readable again
+
+    The index and the agent names are rebuilt from the records and a
+    partial last record is dropped. Closed archives are left unchanged.
+
+    Returns:
+        int: number of games in the archive
+    """
+    writer = ArchiveWriter(path, append=True)
+    count = len(writer)
+    writer.close()
+    return count
+
+
+class GameArchive:
+    """
+    Memory-mapped reader of a game archive
+
+    Nothing is loaded up front: games are decoded from the mapping when
+    they are accessed.
+    """
+
+    def __init__(self, path):
+        """
+        Map the archive
+
+        Parameters:
+            path: str, path of the archive
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        index_offset, count, names_offset, names_length = _read_footer(self._data)
+        self._index = np.frombuffer(self._data, dtype="<u8", count=count, offset=index_offset)
+        self.agent_names = json.loads(self._data[names_offset:names_offset + names_length])
+
+    def __len__(self):
+        return len(self._index)
+
+    def header(self, i):
+        """
+        Header of game i
+
+        Returns:
+            dict: agent_0, agent_1, seed, winner, length
+        """
+        agent_0, agent_1, seed, winner, length = _GAME_HEADER.unpack_from(self._data, int(self._index[i]))
+        return {
+            "agent_0": self.agent_names[agent_0],
+            "agent_1": self.agent_names[agent_1],
+            "seed": seed,
+            "winner": _WINNER_NAMES[winner],
+            "length": length,
+        }
+
+    def moves(self, i):
+        """
+        Moves of game i
+
+        Returns:
+            list: columns played, in order
+        """
+        offset = int(self._index[i])
+        length = self._data[offset + _GAME_HEADER.size - 1]
+        start = offset + _GAME_HEADER.size
+        return unpack_moves(self._data[start:start + (3 * length + 7) // 8], length)
+
+    def game(self, i):
+        """
+        Header of game i with its "moves"
+        """
+        game = self.header(i)
+        game["moves"] = self.moves(i)
+        return game
+
+    def board(self, i, ply=None):
+        """
+        Position of game i after a number of plies
+
+        Parameters:
+            i: int, index of the game
+            ply: int or None, number of moves played (default: final position)
+
+        Returns:
+            int8 array (6, 7): 0 empty, 1 player_0, 2 player_1 (row 0 at
+            the top, like the PettingZoo board)
+        """
+        moves = self.moves(i)
+        if ply is None:
+            ply = len(moves)
+        if not 0 <= ply <= len(moves):
+            raise IndexError(f"game {i} has {len(moves)} moves")
+        board = np.zeros((ROWS, COLUMNS), dtype=np.int8)
+        heights = [0] * COLUMNS
+        for n, col in enumerate(moves[:ply]):
+            board[ROWS - 1 - heights[col], col] = n % 2 + 1
+            heights[col] += 1
+        return board
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.game(i)
+
+    def close(self):
+        # Release the numpy view before closing the mapping
+        self._index = None
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
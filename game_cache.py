@@ -0,0 +1,180 @@
+"""
+Game result cache
+
+Persistent cache of reproducible games. A game is keyed by everything
+that determines it: the agent classes and their configuration, a hash
+of the source code of the agents and of the engine, the seeds and the
+opening. Editing an agent, or a project module it imports (board.py
+for instance), changes its code hash, so games played with the old code
+are never reused.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import sys
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path, mtime_ns, size):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# Modules whose files are in this directory are project code
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _inside(path, roots):
+    return any(os.path.commonpath([path, root]) == root for root in roots)
+
+
+def source_files(*objects):
+    """
+    Source files defining some classes or modules, with their project imports
+
+    For a class, the modules of every class in its MRO are included, so
+    editing a base class also invalidates its subclasses. The imports of
+    those modules (modules, classes or functions found in their globals)
+    are followed transitively when their file is in the project: the
+    repository, or the directory of one of the given objects. Imports
+    made inside functions are not seen.
+
+    Returns:
+        list: sorted absolute paths
+    """
+    modules = []
+    for obj in objects:
+        if inspect.ismodule(obj):
+            modules.append(obj)
+        else:
+            modules.extend(sys.modules.get(cls.__module__) for cls in inspect.getmro(obj))
+    files = {}
+    for module in modules:
+        path = getattr(module, "__file__", None)
+        if path:
+            files[os.path.abspath(path)] = module
+    roots = {PROJECT_ROOT} | {os.path.dirname(path) for path in files}
+
+    pending = list(files.values())
+    while pending:
+        module = pending.pop()
+        for value in list(vars(module).values()):
+            if inspect.ismodule(value):
+                dependency = value
+            else:
+                name = getattr(value, "__module__", None)
+                dependency = sys.modules.get(name) if isinstance(name, str) else None
+            path = getattr(dependency, "__file__", None)
+            if not path:
+                continue
+            path = os.path.abspath(path)
+            if path not in files and _inside(path, roots):
+                files[path] = dependency
+                pending.append(dependency)
+    return sorted(files)
+
+
+def code_hash(*objects):
+    """
+    Hash of the source files defining some classes or modules (see source_files)
+
+    Returns:
+        str: hex digest (16 characters)
+    """
+    digest = hashlib.sha256()
+    for path in source_files(*objects):
+        stat = os.stat(path)
+        digest.update(os.path.basename(path).encode())
+        digest.update(_file_digest(path, stat.st_mtime_ns, stat.st_size).encode())
+    return digest.hexdigest()[:16]
+
+
+def game_key(agents, engine, seed, agent_seed, opening=()):
+    """
+    Cache key of a game
+
+    Parameters:
+        agents: list of (class, config dict) for player_0 and player_1
+        engine: str, engine name
+        seed: int, seed of env.reset
+        agent_seed: int or None, seed of the agents
+        opening: sequence of columns played before the agents
+
+    Returns:
+        str: hex digest identifying the game
+    """
+    from connect_four_engine import ConnectFourEngine
+
+    if engine == "native":
+        engine_version = code_hash(ConnectFourEngine)
+    else:
+        from pettingzoo.classic import connect_four_v3
+        engine_version = code_hash(sys.modules[connect_four_v3.env.__module__])
+    parts = {
+        "agents": [[f"{cls.__module__}.{cls.__qualname__}", config, code_hash(cls)] for cls, config in agents],
+        "engine": [engine, engine_version],
+        "seed": seed,
+        "agent_seed": agent_seed,
+        "opening": list(opening),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class GameCache:
+    """
+    SQLite-backed store of game results by game key
+    """
+
+    def __init__(self, path=".game_cache.sqlite"):
+        """
+        Open (or create) the cache
+
+        Parameters:
+            path: str, database file (":memory:" for a temporary cache)
+        """
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS games (
+                key TEXT PRIMARY KEY,
+                winner TEXT,
+                num_moves INTEGER NOT NULL,
+                moves TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns:
+            tuple or None: (winner, number of moves, move list) if cached
+        """
+        row = self._db.execute("SELECT winner, num_moves, moves FROM games WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0], row[1], json.loads(row[2])
+
+    def put(self, key, winner, num_moves, moves):
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?)",
+                             (key, winner, num_moves, json.dumps(moves)))
+
+    def clear(self):
+        with self._db:
+            self._db.execute("DELETE FROM games")
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def close(self):
+        self._db.close()
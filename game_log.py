@@ -0,0 +1,119 @@
+"""
+Game log
+
+Append-only JSONL file with one record per finished game. Records are
+buffered and written in batches, and a log left half-written by a crash
+is repaired on reopen, so a tournament can resume where it stopped.
+"""
+
+import json
+import os
+import time
+
+
+def _repair(path):
+    """
+    Drop a trailing partial line (a write interrupted by a crash)
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        # Walk back to the last newline
+        position = size
+        while position > 0:
+            step = min(4096, position)
+            f.seek(position - step)
+            chunk = f.read(step)
+            newline = chunk.rfind(b"\n")
+            if newline >= 0:
+                position = position - step + newline + 1
+                break
+            position -= step
+        if position != size:
+            f.truncate(position)
+
+
+class GameLog:
+    """
+    Buffered JSONL writer for game records
+    """
+
+    def __init__(self, path, flush_every=64, flush_interval=1.0, fsync=False):
+        """
+        Open (or create) a log for appending
+
+        Parameters:
+            path: str, path of the JSONL file
+            flush_every: int, write the buffer after this many records
+            flush_interval: float, or after this many seconds
+            fsync: bool, also fsync on every flush (survives power loss,
+                   not only a crash of the process)
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _repair(path)
+        self._file = open(path, "a")
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def write(self, record):
+        """
+        Queue one record (a JSON-serializable dict)
+        """
+        self._buffer.append(json.dumps(record, separators=(",", ":")))
+        if len(self._buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered records to disk
+        """
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_game_log(path, **match):
+    """
+    Stream the records of a log
+
+    Parameters:
+        path: str, path of the JSONL file
+        match: optional field values a record must have to be yielded
+
+    Yields:
+        dict: one record per complete line (a partial last line is skipped)
+    """
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            record = json.loads(line)
+            if all(record.get(key) == value for key, value in match.items()):
+                yield record
@@ -0,0 +1,155 @@
+"""
+Latency histograms
+
+Streaming log-bucket histograms of move decision times: constant memory,
+mergeable across games or processes, with percentiles within a few
+percent of the exact values.
+"""
+
+import math
+
+from online_stats import RunningStats
+
+# 8 logarithmic buckets per doubling (about 9% wide)
+BUCKETS_PER_OCTAVE = 8
+
+# Game phases by ply (index of the move in the game, both players counted)
+PHASES = (("opening", 10), ("middlegame", 26), ("endgame", 42))
+
+
+def latency_bucket(time_ns):
+    """
+    Histogram bucket of a decision time
+    """
+    return int(math.log2(time_ns) * BUCKETS_PER_OCTAVE) if time_ns >= 1 else 0
+
+
+def bucket_value(bucket):
+    """
+    Representative time (geometric middle) of a histogram bucket, in ns
+    """
+    return 2.0 ** ((bucket + 0.5) / BUCKETS_PER_OCTAVE)
+
+
+def game_phase(ply):
+    """
+    Name of the game phase a ply belongs to
+    """
+    for name, end in PHASES:
+        if ply < end:
+            return name
+    return PHASES[-1][0]
+
+
+class LatencyHistogram:
+    """
+    Log-bucket histogram of times in nanoseconds
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.stats = RunningStats()
+
+    @property
+    def count(self):
+        return self.stats.count
+
+    @property
+    def max(self):
+        return self.stats.max or 0
+
+    def add(self, time_ns):
+        bucket = latency_bucket(time_ns)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.stats.add(time_ns)
+
+    def merge(self, other):
+        """
+        Add the counts of another histogram to this one
+        """
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.stats.merge(other.stats)
+
+    def percentile(self, percentile):
+        """
+        Nearest-rank percentile (bucket middle, capped by the exact max)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(percentile * self.count / 100))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(bucket_value(bucket), self.max)
+        return float(self.max)
+
+    def summary(self):
+        """
+        Returns:
+            dict: count, mean, std, p50, p95, p99 and max, times in ns
+        """
+        return {
+            "count": self.count,
+            "mean": self.stats.mean,
+            "std": self.stats.std,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class LatencyRecorder:
+    """
+    Latency histograms per agent, overall and per game phase
+    """
+
+    def __init__(self):
+        self.histograms = {}
+
+    def add(self, agent, ply, time_ns):
+        """
+        Record one decision time
+
+        Parameters:
+            agent: str, name of the agent
+            ply: int, index of the move in the game
+            time_ns: int, decision time
+        """
+        for key in ((agent, "all"), (agent, game_phase(ply))):
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.add(time_ns)
+
+    def merge(self, other):
+        for key, histogram in other.histograms.items():
+            self.histograms.setdefault(key, LatencyHistogram()).merge(histogram)
+
+    def summary(self):
+        """
+        Returns:
+            dict: {agent: {phase: histogram summary}}, phase "all" covers
+                  every move
+        """
+        summary = {}
+        for (agent, phase), histogram in sorted(self.histograms.items()):
+            summary.setdefault(agent, {})[phase] = histogram.summary()
+        return summary
+
+    def report(self):
+        """
+        Text table of the summaries, times in microseconds
+        """
+        order = ["all"] + [name for name, _ in PHASES]
+        lines = [f"{'agent':<20} {'phase':<11} {'moves':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"]
+        for agent, phases in self.summary().items():
+            for phase in order:
+                if phase in phases:
+                    stats = phases[phase]
+                    lines.append(f"{agent:<20} {phase:<11} {stats['count']:>7} {stats['p50'] / 1e3:>9.1f} "
+                                 f"{stats['p95'] / 1e3:>9.1f} {stats['p99'] / 1e3:>9.1f} "
+                                 f"{stats['max'] / 1e3:>9.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,186 @@
+"""
+Online statistics
+
+Constant-memory accumulators for tournament statistics. They are
+updated one game at a time, can be merged across worker processes or
+shards, and can be queried at any point of a run.
+"""
+
+import math
+
+
+class RunningStats:
+    """
+    Count, mean, variance (Welford), min and max of a stream of numbers
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """
+        Combine with the statistics of another stream (Chan et al.)
+        """
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """
+        Sample variance (0 with fewer than two values)
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+class CountHistogram:
+    """
+    Exact histogram of small integer values (e.g. game lengths, 7 to 42)
+
+    Memory is bounded by the number of distinct values, and every
+    statistic is exact and independent of the order of additions and
+    merges.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+
+    def add(self, value, count=1):
+        self.counts[value] = self.counts.get(value, 0) + count
+        self.count += count
+
+    def merge(self, other):
+        for value, count in other.counts.items():
+            self.add(value, count)
+
+    @property
+    def min(self):
+        return min(self.counts) if self.counts else None
+
+    @property
+    def max(self):
+        return max(self.counts) if self.counts else None
+
+    @property
+    def mean(self):
+        # Summed in value order, so rounding does not depend on the merge order
+        return sum(value * self.counts[value] for value in sorted(self.counts)) / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        if self.count < 2:
+            return 0.0
+        mean = self.mean
+        squares = sum(self.counts[value] * (value - mean) ** 2 for value in sorted(self.counts))
+        return math.sqrt(squares / (self.count - 1))
+
+    def quantile(self, q):
+        """
+        Nearest-rank quantile, q between 0 and 1
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen >= rank:
+                return value
+        return self.max
+
+
+class MatchStats:
+    """
+    Results of a matchup: wins, draws and game length distribution
+    """
+
+    def __init__(self):
+        self.player_0 = 0
+        self.player_1 = 0
+        self.draw = 0
+        self.lengths = CountHistogram()
+
+    @property
+    def games(self):
+        return self.lengths.count
+
+    def add(self, winner, moves):
+        """
+        Record one game
+
+        Parameters:
+            winner: "player_0", "player_1" or None for a draw
+            moves: int, number of moves of the game
+        """
+        if winner is None:
+            self.draw += 1
+        elif winner == "player_0":
+            self.player_0 += 1
+        else:
+            self.player_1 += 1
+        self.lengths.add(moves)
+
+    def merge(self, other):
+        self.player_0 += other.player_0
+        self.player_1 += other.player_1
+        self.draw += other.draw
+        self.lengths.merge(other.lengths)
+
+    def results(self):
+        """
+        Returns:
+            dict: wins, draws, rates, min/max/mean/std/median moves
+        """
+        games = self.games
+        return {
+            "player_0": self.player_0,
+            "player_1": self.player_1,
+            "draw": self.draw,
+            "rate_0": self.player_0 / games,
+            "rate_1": self.player_1 / games,
+            "rate_draw": self.draw / games,
+            "min_moves": int(self.lengths.min),
+            "max_moves": int(self.lengths.max),
+            "mean_moves": self.lengths.mean,
+            "std_moves": self.lengths.std,
+            "median_moves": self.lengths.quantile(0.5),
+        }
+
+    def progress(self):
+        """
+        One-line summary for live progress reports
+        """
+        if not self.games:
+            return "0 games"
+        return (f"{self.games} games: {self.player_0} / {self.player_1} / {self.draw} draws "
+                f"({self.player_0 / self.games:.1%} / {self.player_1 / self.games:.1%}), "
+                f"{self.lengths.mean:.1f} moves on average")
@@ -0,0 +1,125 @@
+"""
+Opening suites
+
+Generates, filters and stores short opening sequences (k plies from the
+empty board) used to play paired games: every opening is played twice
+with the colours swapped, which removes the first-player bias and most
+of the variance of a matchup.
+"""
+
+import itertools
+import random
+
+from connect_four_engine import ConnectFourEngine
+
+ROWS = 6
+COLUMNS = 7
+
+
+def legal_opening(moves):
+    """
+    Check that an opening can be played and does not finish the game
+    """
+    heights = [0] * COLUMNS
+    for col in moves:
+        if not 0 <= col < COLUMNS or heights[col] >= ROWS:
+            return False
+        heights[col] += 1
+    # Nobody can connect four in fewer than 7 plies
+    return len(moves) < 7
+
+
+def mirror(moves):
+    """
+    Left-right mirror of an opening
+    """
+    return tuple(COLUMNS - 1 - col for col in moves)
+
+
+def rollout_score(moves, rollouts=200, rng=None):
+    """
+    Score of the first player after an opening, estimated by random playouts
+
+    Parameters:
+        moves: sequence of columns
+        rollouts: int, number of random games played from the opening
+        rng: optional random.Random
+
+    Returns:
+        float: mean score of player_0 (win 1, draw 0.5, loss 0)
+    """
+    rng = rng or random.Random(0)
+    env = ConnectFourEngine()
+    total = 0.0
+    for _ in range(rollouts):
+        env.reset()
+        for col in moves:
+            env.step(col)
+        while True:
+            agent = env.agent_selection
+            if env.terminations[agent]:
+                reward = env.rewards["player_0"]
+                total += 0.5 if reward == 0 else (reward == 1)
+                break
+            mask = env.observe(agent)["action_mask"]
+            env.step(rng.choice([col for col in range(COLUMNS) if mask[col]]))
+    return total / rollouts
+
+
+def generate_openings(plies=2, balance=0.15, rollouts=200, seed=0):
+    """
+    Build a suite of balanced openings
+
+    All openings of the given length are enumerated, mirror images are
+    merged, and openings whose random-playout score is further than
+    balance from 0.5 are dropped.
+
+    Parameters:
+        plies: int, length of the openings (0 to 6)
+        balance: float or None, maximum |score - 0.5|, None keeps all openings
+        rollouts: int, playouts per opening for the balance estimate
+        seed: int, seed of the playouts
+
+    Returns:
+        list: openings as tuples of columns, in lexicographic order
+    """
+    if not 0 <= plies < 7:
+        raise ValueError("openings must have between 0 and 6 plies")
+    rng = random.Random(seed)
+    suite = []
+    for moves in itertools.product(range(COLUMNS), repeat=plies):
+        if mirror(moves) < moves or not legal_opening(moves):
+            continue
+        if balance is not None and abs(rollout_score(moves, rollouts, rng) - 0.5) > balance:
+            continue
+        suite.append(moves)
+    return suite
+
+
+def save_openings(path, openings):
+    """
+    Write a suite, one opening per line as space separated columns
+    """
+    with open(path, "w") as f:
+        for moves in openings:
+            f.write(" ".join(str(col) for col in moves) + "\n")
+
+
+def load_openings(path):
+    """
+    Read a suite written by save_openings ("#" starts a comment)
+
+    Returns:
+        list: openings as tuples of columns
+    """
+    openings = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            moves = tuple(int(col) for col in line.split())
+            if not legal_opening(moves):
+                raise ValueError(f"invalid opening: {line}")
+            openings.append(moves)
+    return openings
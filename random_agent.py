@@ -8,20 +8,116 @@ This agent chooses moves randomly from the available (valid) columns.
 import random
 from typing import Any
 from typing import Optional
+from typing import Sequence
+
+import numpy as np
+
+from action_space import connect_four_action_space
+
+
+def game_rng(seed: int, game_id: int) -> np.random.Generator:
+    """
+    Build the random generator of one game in a seeded run.
+
+    The stream only depends on (seed, game_id), so a game can be replayed
+    on its own, in any order or in any process.
+
+    Args:
+        seed: base seed of the run.
+        game_id: index of the game in the run.
+
+    Returns:
+        np.random.Generator: independent generator for this game.
+    """
+    return np.random.default_rng([seed, game_id])
+
+
+def sample_columns(
+    action_masks: Any,
+    rng: np.random.Generator,
+    weights: Optional[Sequence[float]] = None,
+) -> np.ndarray:
+    """
+    Draw one valid column per row of a batch of action masks.
+
+    All rows are sampled with a single vectorized draw: the weights are
+    restricted to the valid columns, accumulated, and each row picks the
+    first column whose cumulative weight exceeds a uniform draw.
+
+    Args:
+        action_masks: array (N, 7) - valid columns (1) vs full columns (0).
+        rng: NumPy generator used for the draw.
+        weights: optional column weights (7,), uniform if None.
+
+    Returns:
+        np.ndarray: (N,) int64 column indices.
+    """
+    masks = np.asarray(action_masks) != 0
+    if masks.ndim == 1:
+        masks = masks[np.newaxis, :]
+    if weights is None:
+        cumulative = np.cumsum(masks, axis=1, dtype=np.float64)
+    else:
+        cumulative = np.cumsum(masks * np.asarray(weights, dtype=np.float64), axis=1)
+    totals = cumulative[:, -1]
+    if np.any(totals <= 0):
+        raise ValueError("every action mask must allow at least one column")
+    draws = rng.random(len(masks)) * totals
+    return np.count_nonzero(cumulative <= draws[:, np.newaxis], axis=1)
+
 
 class RandomAgent:
     """A simple agent that plays Connect Four randomly."""
 
-    def __init__(self, env: Any, player_name: Optional[str] = None) -> None:
+    # Column weights used by choose_actions (None = uniform)
+    batch_weights: Optional[Sequence[float]] = None
+
+    def __init__(
+        self, env: Any = None, player_name: Optional[str] = None, seed: Optional[int] = None
+    ) -> None:
         """
         Initialize the random agent.
 
         Args:
-            env: PettingZoo environment instance.
+            env: Optional PettingZoo environment instance (only its action
+                space is used, Discrete(7) when omitted).
             player_name: Optional name for the agent (for display purposes).
+            seed: Optional seed of the generator used by choose_actions.
         """
-        self.action_space = env.action_space(env.agents[0])
+        self.action_space = connect_four_action_space(env)
         self.name = player_name if player_name is not None else "RandomAgent"
+        self.rng = np.random.default_rng(seed)
+
+    def reseed(self, seed: int, game_id: Optional[int] = None) -> None:
+        """
+        Reset the generator used by choose_actions.
+
+        Args:
+            seed: base seed.
+            game_id: if given, switch to the stream of this game
+                (see game_rng), which is reproducible per game id.
+        """
+        if game_id is None:
+            self.rng = np.random.default_rng(seed)
+        else:
+            self.rng = game_rng(seed, game_id)
+
+    def choose_actions(
+        self,
+        action_masks: Any,
+        observations: Any = None,  # pylint: disable=unused-argument
+    ) -> np.ndarray:
+        """
+        Choose one random valid action for each board of a batch.
+
+        Args:
+            action_masks: numpy array (N, 7) - valid columns per board.
+            observations: numpy array (N, 6, 7, 2) - boards (unused).
+
+        Returns:
+            np.ndarray: (N,) column indices (0-6).
+        """
+        return sample_columns(action_masks, self.rng, self.batch_weights)
 
     def choose_action(
         self,
@@ -0,0 +1,211 @@
+"""
+Ratings
+
+Elo ratings, Elo difference confidence intervals and a sequential
+probability ratio test (SPRT) to stop a matchup as soon as its result
+is statistically settled.
+"""
+
+import math
+
+
+def expected_score(elo_diff):
+    """
+    Expected score of a player rated elo_diff points above its opponent
+    """
+    return 1.0 / (1.0 + 10.0 ** (-elo_diff / 400.0))
+
+
+def elo_from_score(score):
+    """
+    Elo difference matching an expected score (inverse of expected_score)
+
+    Returns:
+        float: Elo difference, -inf / inf for a score of 0 / 1
+    """
+    if score <= 0.0:
+        return -math.inf
+    if score >= 1.0:
+        return math.inf
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+def score_stats(wins, draws, losses):
+    """
+    Mean and per-game variance of the score (win 1, draw 0.5, loss 0)
+
+    Half a win and half a loss are added to the counts, so a matchup with
+    only wins (or only losses) still has a non-zero variance.
+
+    Returns:
+        tuple: (mean score, per-game variance)
+    """
+    wins, losses = wins + 0.5, losses + 0.5
+    games = wins + draws + losses
+    mean = (wins + 0.5 * draws) / games
+    variance = (wins * (1.0 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / games
+    return mean, variance
+
+
+def elo_interval(wins, draws, losses, z=1.96):
+    """
+    Elo difference measured by a matchup with its confidence interval
+
+    Parameters:
+        wins, draws, losses: int, results of the first player
+        z: float, normal quantile of the interval (1.96 = 95%)
+
+    Returns:
+        tuple: (elo, low, high), computed on the raw score for the estimate
+               and on the normal approximation of the score for the bounds
+    """
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0, -math.inf, math.inf
+    score = (wins + 0.5 * draws) / games
+    _, variance = score_stats(wins, draws, losses)
+    margin = z * math.sqrt(variance / games)
+    return elo_from_score(score), elo_from_score(score - margin), elo_from_score(score + margin)
+
+
+def paired_elo_interval(pair_scores, z=1.96):
+    """
+    Elo difference measured by paired games with its confidence interval
+
+    The interval uses the variance of the pair scores, which is much
+    smaller than the per-game variance when both games of a pair share
+    the same opening.
+
+    Parameters:
+        pair_scores: list of float, score of the first player over each
+                     pair of games (0 to 2)
+        z: float, normal quantile of the interval (1.96 = 95%)
+
+    Returns:
+        tuple: (elo, low, high)
+    """
+    pairs = len(pair_scores)
+    if pairs == 0:
+        return 0.0, -math.inf, math.inf
+    score = sum(pair_scores) / (2.0 * pairs)
+    variance = sum((pair / 2.0 - score) ** 2 for pair in pair_scores) / pairs
+    # Same regularization as score_stats: a pair scored 1.5 and one scored 0.5
+    variance = (variance * pairs + (0.75 - score) ** 2 + (0.25 - score) ** 2) / (pairs + 2)
+    margin = z * math.sqrt(variance / pairs)
+    return elo_from_score(score), elo_from_score(score - margin), elo_from_score(score + margin)
+
+
+class SPRT:
+    """
+    Sequential probability ratio test between two Elo hypotheses
+
+    H0: the first player is elo0 points stronger, H1: it is elo1 points
+    stronger (elo1 > elo0). The log-likelihood ratio uses the normal
+    approximation of the score (generalized SPRT), so draws are handled.
+    """
+
+    def __init__(self, elo0=0.0, elo1=50.0, alpha=0.05, beta=0.05):
+        """
+        Initialize the test
+
+        Parameters:
+            elo0: float, Elo difference of H0
+            elo1: float, Elo difference of H1
+            alpha: float, probability of accepting H1 when H0 is true
+            beta: float, probability of accepting H0 when H1 is true
+        """
+        if elo1 <= elo0:
+            raise ValueError("elo1 must be greater than elo0")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.lower = math.log(beta / (1.0 - alpha))
+        self.upper = math.log((1.0 - beta) / alpha)
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    @property
+    def games(self):
+        return self.wins + self.draws + self.losses
+
+    def add(self, score):
+        """
+        Record the result of one game for the first player (1, 0.5 or 0)
+        """
+        if score == 1:
+            self.wins += 1
+        elif score == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+    def llr(self):
+        """
+        Log-likelihood ratio of H1 against H0 for the games recorded so far
+        """
+        if self.games == 0:
+            return 0.0
+        mean, variance = score_stats(self.wins, self.draws, self.losses)
+        s0 = expected_score(self.elo0)
+        s1 = expected_score(self.elo1)
+        return self.games * (s1 - s0) * (2.0 * mean - s0 - s1) / (2.0 * variance)
+
+    def status(self):
+        """
+        Returns:
+            str or None: "H1" or "H0" once a hypothesis is accepted,
+                         None while the test continues
+        """
+        llr = self.llr()
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
+
+
+class EloRatings:
+    """
+    Online Elo ratings of a pool of players
+    """
+
+    def __init__(self, k=16.0, initial=1500.0):
+        """
+        Initialize the ratings
+
+        Parameters:
+            k: float, update factor
+            initial: float, rating of a new player
+        """
+        self.k = k
+        self.initial = initial
+        self.ratings = {}
+        self.games = {}
+
+    def rating(self, name):
+        return self.ratings.get(name, self.initial)
+
+    def update(self, name_a, name_b, score_a):
+        """
+        Update both ratings after one game
+
+        Parameters:
+            name_a, name_b: names of the players
+            score_a: float, result of name_a (1 win, 0.5 draw, 0 loss)
+        """
+        rating_a, rating_b = self.rating(name_a), self.rating(name_b)
+        delta = self.k * (score_a - expected_score(rating_a - rating_b))
+        self.ratings[name_a] = rating_a + delta
+        self.ratings[name_b] = rating_b - delta
+        for name in (name_a, name_b):
+            self.games[name] = self.games.get(name, 0) + 1
+
+    def ranking(self):
+        """
+        Returns:
+            list: (name, rating, games) tuples, best rating first
+        """
+        return sorted(((name, rating, self.games[name]) for name, rating in self.ratings.items()),
+                      key=lambda item: item[1], reverse=True)
@@ -0,0 +1,287 @@
+"""
+Reference agents and helpers on (6, 7, 2) observation arrays
+
+The agents used to work on observation arrays through scalar NumPy
+indexing, before board.Position replaced those helpers. The array code
+is frozen here: benchmark_board times it against board.Position, and
+the tests check that the agents still choose the same moves.
+
+Each reference agent subclasses the current agent and overrides only the
+methods that touched the board.
+"""
+
+import random
+
+import numpy as np
+
+from agent_minimax import MinimaxAgent
+from board import COLUMNS, ROWS
+from smart_agent import SmartAgent
+from smart_agent_ameliore import SmartAgentAmeliore
+
+
+def reference_next_row(board, col):
+    # Lowest empty row of a column, scanning from the bottom
+    for row in range(ROWS - 1, -1, -1):
+        if board[row, col, 0] == 0 and board[row, col, 1] == 0:
+            return row
+    return None
+
+
+def reference_valid_moves(board):
+    return [col for col in range(COLUMNS) if board[0, col, 0] == 0 and board[0, col, 1] == 0]
+
+
+def reference_completes_four(board, row, col, channel):
+    # Pieces of channel in line with (row, col), in both directions
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        count = 1
+        for sign in (1, -1):
+            r, c = row + sign * dr, col + sign * dc
+            while 0 <= r < ROWS and 0 <= c < COLUMNS and board[r, c, channel] == 1:
+                count += 1
+                r += sign * dr
+                c += sign * dc
+        if count >= 4:
+            return True
+    return False
+
+
+def reference_simulate(board, col, channel):
+    # The board is returned unchanged when the column is full
+    new_board = board.copy()
+    row = reference_next_row(board, col)
+    if row is not None:
+        new_board[row, col, channel] = 1
+    return new_board
+
+
+def _windows_of(grid):
+    for r in range(ROWS):
+        for c in range(COLUMNS - 3):
+            yield list(grid[r, c:c + 4])
+    for c in range(COLUMNS):
+        for r in range(ROWS - 3):
+            yield list(grid[r:r + 4, c])
+    for r in range(ROWS - 3):
+        for c in range(COLUMNS - 3):
+            yield [grid[r + i, c + i] for i in range(4)]
+    for r in range(3, ROWS):
+        for c in range(COLUMNS - 3):
+            yield [grid[r - i, c + i] for i in range(4)]
+
+
+def reference_wins(board, channel):
+    grid = np.zeros((ROWS, COLUMNS), dtype=int)
+    grid[board[:, :, channel] == 1] = 1
+    return any(window.count(1) == 4 for window in _windows_of(grid))
+
+
+def reference_evaluate(board):
+    # MinimaxAgent's evaluation on the array board
+    grid = np.zeros((ROWS, COLUMNS), dtype=int)
+    grid[board[:, :, 0] == 1] = 1
+    grid[board[:, :, 1] == 1] = 2
+    score = list(grid[:, COLUMNS // 2]).count(1) * 3
+    for window in _windows_of(grid):
+        if window.count(1) == 4:
+            score += 10000
+        elif window.count(1) == 3 and window.count(0) == 1:
+            score += 50
+        elif window.count(1) == 2 and window.count(0) == 2:
+            score += 5
+        if window.count(2) == 3 and window.count(0) == 1:
+            score -= 80
+    return score
+
+
+def _line_count(board, row, col, channel, dr, dc, max_empty=None):
+    """
+    Pieces of channel in line with (row, col), both directions
+
+    With max_empty, empty cells are skipped until max_empty of them were
+    seen on a side; otherwise the count stops at the first empty cell.
+    """
+    count = 0
+    for sign in (1, -1):
+        r, c = row + sign * dr, col + sign * dc
+        empty = 0
+        while 0 <= r < ROWS and 0 <= c < COLUMNS and (max_empty is None or empty < max_empty):
+            if board[r, c, channel] == 1:
+                count += 1
+            elif max_empty is not None and board[r, c, 0] == 0 and board[r, c, 1] == 0:
+                empty += 1
+            else:
+                break
+            r += sign * dr
+            c += sign * dc
+    return count
+
+
+class ReferenceSmartAgent(SmartAgent):
+    """SmartAgent on observation arrays"""
+
+    def choose_action(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
+        valid_actions = self._get_valid_actions(action_mask)
+        self.last_action_random = False
+        for channel in (0, 1):
+            move = self._find_winning_move(observation, valid_actions, channel)
+            if move is not None:
+                return move
+        if 3 in valid_actions:
+            return 3
+        self.last_action_random = True
+        return random.choice(valid_actions)
+
+    def _get_next_row(self, board, col):
+        return reference_next_row(board, col)
+
+    def _check_win_from_position(self, board, row, col, channel):
+        # The historical line count, negative indexes wrap around
+        for a, b in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            count = 1
+            if row + a < self.rows and col + b < self.column:
+                r1, c1 = row + a, col + b
+                A = board[r1, c1, channel]
+                if A == 1:
+                    count += 1
+                while 0 <= r1 < self.rows - 1 and 0 <= c1 < self.column - 1 and A == 1:
+                    r1 += a
+                    c1 += b
+                    if A == board[r1, c1, channel]:
+                        count += 1
+                    A = board[r1, c1, channel]
+            if self.rows > row - a >= 0 and self.column > col - b >= 0:
+                r2, c2 = row - a, col - b
+                B = board[r2, c2, channel]
+                if B == 1:
+                    count += 1
+                while 0 <= r2 < self.rows - 1 and 0 <= c2 < self.column - 1 and B == 1:
+                    r2 -= a
+                    c2 -= b
+                    if B == board[r2, c2, channel]:
+                        count += 1
+                    B = board[r2, c2, channel]
+            if count >= 4:
+                return True
+        return False
+
+    def _find_winning_move(self, observation, valid_actions, channel):
+        for col in valid_actions:
+            row = self._get_next_row(observation, col)
+            if row is not None and self._check_win_from_position(observation, row, col, channel):
+                return col
+        return None
+
+
+class ReferenceSmartAgentAmeliore(SmartAgentAmeliore):
+    """SmartAgentAmeliore on observation arrays"""
+
+    def choose_action(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
+        valid_actions = self._get_valid_actions(action_mask)
+        self.last_action_random = False
+        if self.profiler is not None:
+            return self.profiler.run_rules(self, observation, valid_actions)
+        for _, rule in self.RULES:
+            move = rule(self, observation, valid_actions)
+            if move is not None:
+                return move
+        return None
+
+    def _get_next_row(self, board, col):
+        return reference_next_row(board, col)
+
+    def _copy_board(self, board):
+        return board.copy()
+
+    def _check_win_from_position(self, board, row, col, channel):
+        return reference_completes_four(board, row, col, channel)
+
+    def _creates_double_threat(self, board, col, channel):
+        board_copy = self._copy_board(board)
+        row = self._get_next_row(board_copy, col)
+        if row is None:
+            return False
+        board_copy[row, col, channel] = 1
+        winning_threats = 0
+        for next_col in range(self.column):
+            next_row = self._get_next_row(board_copy, next_col)
+            if next_row is not None:
+                temp_board = self._copy_board(board_copy)
+                if self._check_win_from_position(temp_board, next_row, next_col, channel):
+                    winning_threats += 1
+                    if winning_threats >= 2:
+                        return True
+        return winning_threats >= 2
+
+    def _evaluate_fork_potential(self, board, col, channel):
+        board_copy = self._copy_board(board)
+        row = self._get_next_row(board_copy, col)
+        if row is None:
+            return 0
+        board_copy[row, col, channel] = 1
+        return sum(self._check_line_potential(board_copy, row, col, channel, dr, dc)
+                   for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)))
+
+    def _check_line_potential(self, board, row, col, channel, dr, dc):
+        return 1 + _line_count(board, row, col, channel, dr, dc, max_empty=2) >= 3
+
+    def _count_connections(self, board, row, col, channel, dr, dc):
+        return _line_count(board, row, col, channel, dr, dc)
+
+    def _has_strong_potential(self, board, row, col, channel, dr, dc):
+        return 1 + _line_count(board, row, col, channel, dr, dc, max_empty=2) >= 3
+
+
+class ReferenceMinimaxAgent(MinimaxAgent):
+    """MinimaxAgent on observation arrays, copying the board at every node"""
+
+    def _get_valid_moves(self, board):
+        return reference_valid_moves(board)
+
+    def _check_win(self, board, channel):
+        return reference_wins(board, channel)
+
+    def _simulate_move(self, board, col, channel):
+        return reference_simulate(board, col, channel)
+
+    def _evaluate(self, board):
+        return reference_evaluate(board)
+
+    def _minimax(self, board, depth, alpha, beta, maximizing):
+        valid_cols = self._get_valid_moves(board)
+        if self._check_win(board, 0):
+            return float('inf')
+        if self._check_win(board, 1):
+            return float('-inf')
+        if depth == 0 or not valid_cols:
+            return self._evaluate(board)
+        best_score = float('-inf') if maximizing else float('inf')
+        for col in valid_cols:
+            child = self._simulate_move(board, col, channel=0 if maximizing else 1)
+            score = self._minimax(child, depth - 1, alpha, beta, not maximizing)
+            if maximizing:
+                best_score = max(best_score, score)
+                alpha = max(alpha, best_score)
+            else:
+                best_score = min(best_score, score)
+                beta = min(beta, best_score)
+            if beta <= alpha:
+                break
+        return best_score
+
+    def choose_action(self, observation, reward=0.0, terminated=False,
+                      truncated=False, info=None, action_mask=None):
+        valid_actions = [i for i, valid in enumerate(action_mask) if valid == 1]
+        if not valid_actions:
+            return 0
+        best_action = None
+        best_value = float('-inf')
+        for action in valid_actions:
+            new_board = self._simulate_move(observation, action, channel=0)
+            value = self._minimax(new_board, self.depth - 1, float('-inf'), float('inf'), False)
+            if value > best_value:
+                best_value = value
+                best_action = action
+        self.last_action_random = best_action is None
+        return best_action if best_action is not None else random.choice(valid_actions)
@@ -0,0 +1,227 @@
+"""
+Remote agents
+
+Proxy agents whose moves are chosen by an agent server (agent_server.py
+or any server with the same API). The proxies of a process share one
+RemoteEndpoint per server: a small pool of keep-alive connections, each
+owned by a sender thread. Requests made at the same time by concurrent
+games (threads, asyncio tasks) are pipelined: every round trip carries
+all the boards waiting for an agent in one /moves request, and the
+connections of the pool are in flight together.
+
+Moves are idempotent (the server keeps no per-game state), so a request
+lost with its connection is sent again on a fresh one.
+"""
+
+import asyncio
+import concurrent.futures
+import http.client
+import json
+import os
+import queue
+import threading
+
+import numpy as np
+
+from time_limit import MoveTimeout
+
+
+class RemoteAgentError(Exception):
+    """
+    Raised when the agent server rejects a request or cannot be reached
+    """
+
+
+class RemoteEndpoint:
+    """
+    Pooled, pipelined connections to one agent server
+    """
+
+    def __init__(self, host="127.0.0.1", port=8000, connections=4, max_batch=64, timeout=5.0, retries=2):
+        """
+        Start the sender threads
+
+        Parameters:
+            host, port: address of the agent server
+            connections: int, keep-alive connections (and requests in flight)
+            max_batch: int, largest number of boards sent in one request
+            timeout: float, socket timeout of a request in seconds
+            retries: int, times a request is sent again after a connection error
+        """
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.retries = retries
+        self.requests = 0
+        self.retried = 0
+        self._pending = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._sender, daemon=True) for _ in range(connections)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, agent, observation, action_mask):
+        """
+        Queue a move request
+
+        Returns:
+            concurrent.futures.Future: resolved with the column, cancel it
+            to drop a request the caller no longer waits for
+        """
+        future = concurrent.futures.Future()
+        self._pending.put((agent, np.asarray(observation).tolist(), np.asarray(action_mask).tolist(), future))
+        return future
+
+    def close(self):
+        for _ in self._threads:
+            self._pending.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _take(self):
+        # Blocks for one request, then takes whatever else is waiting
+        first = self._pending.get()
+        if first is None:
+            return None
+        batch = [first]
+        while len(batch) < self.max_batch:
+            try:
+                item = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._pending.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _sender(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        while True:
+            batch = self._take()
+            if batch is None:
+                break
+            groups = {}
+            for item in batch:
+                if item[3].set_running_or_notify_cancel():
+                    groups.setdefault(item[0], []).append(item)
+            for agent, items in groups.items():
+                conn = self._post(conn, agent, items)
+        conn.close()
+
+    def _post(self, conn, agent, items):
+        body = json.dumps({"observations": [item[1] for item in items],
+                           "action_masks": [item[2] for item in items]}).encode()
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                with self._lock:
+                    self.retried += 1
+                conn.close()
+                conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                conn.request("POST", f"/agents/{agent}/moves", body, {"Content-Type": "application/json"})
+                response = conn.getresponse()
+                data = json.loads(response.read())
+            except (OSError, http.client.HTTPException, ValueError) as exc:
+                error = RemoteAgentError(f"{self.host}:{self.port}: {exc!r}")
+                continue
+            with self._lock:
+                self.requests += 1
+            if response.status != 200:
+                error = RemoteAgentError(f"{response.status}: {data.get('error')}")
+                break
+            # A board the agent failed on fails only its own game
+            errors = data.get("errors", {})
+            for index, (item, action) in enumerate(zip(items, data["actions"])):
+                if str(index) in errors:
+                    item[3].set_exception(RemoteAgentError(errors[str(index)]))
+                else:
+                    item[3].set_result(int(action))
+            return conn
+        for item in items:
+            item[3].set_exception(error)
+        return conn
+
+
+_endpoints = {}
+_endpoints_lock = threading.Lock()
+
+
+def get_endpoint(host="127.0.0.1", port=8000, **options):
+    """
+    Shared endpoint of the current process (a forked worker gets its own)
+    """
+    key = (host, port, os.getpid())
+    with _endpoints_lock:
+        if key not in _endpoints:
+            _endpoints[key] = RemoteEndpoint(host, port, **options)
+        return _endpoints[key]
+
+
+class RemoteAgent:
+    """
+    Agent proxy forwarding choose_action to an agent server
+    """
+
+    agent = "SmartAgentAmeliore"
+    host = "127.0.0.1"
+    port = 8000
+    timeout = 5.0
+
+    def __init__(self, env=None, player_name=None, agent=None, host=None, port=None, timeout=None):
+        """
+        Initialize the proxy
+
+        Parameters:
+            env: unused, for the agent constructor convention
+            player_name: optional name of the agent
+            agent: str, name of the agent on the server
+            host, port: address of the server
+            timeout: float, seconds to wait for a move
+        """
+        self.agent = agent or self.agent
+        self.host = host or self.host
+        self.port = port or self.port
+        self.timeout = timeout or self.timeout
+        self.player_name = player_name or f"Remote{self.agent}"
+
+    @property
+    def endpoint(self):
+        return get_endpoint(self.host, self.port)
+
+    def choose_action(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
+        """
+        Raises:
+            MoveTimeout: no answer within the timeout
+            RemoteAgentError: the server rejected the request or is unreachable
+        """
+        return self.choose_action_timed(self.timeout, observation, action_mask)
+
+    def choose_action_timed(self, limit_s, observation, action_mask, **kwargs):
+        future = self.endpoint.submit(self.agent, observation, action_mask)
+        try:
+            return future.result(limit_s)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise MoveTimeout()
+
+    async def choose_action_async(self, observation, action_mask, **kwargs):
+        """
+        choose_action for asyncio runners: waits without blocking the loop
+        """
+        future = self.endpoint.submit(self.agent, observation, action_mask)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise MoveTimeout()
+
+
+def remote_agent_class(agent, host="127.0.0.1", port=8000, timeout=5.0):
+    """
+    RemoteAgent subclass bound to a served agent, usable as an agent class
+    of the tournament runners (including play_multiple_games_parallel,
+    whose forked workers open their own connections)
+    """
+    return type(f"Remote{agent}", (RemoteAgent,), {"agent": agent, "host": host, "port": port, "timeout": timeout})
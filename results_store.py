@@ -0,0 +1,273 @@
+"""
+Results store
+
+Local SQLite database of played games, their moves and the time every
+move took, with indexed queries for tournament analytics (win rates per
+pairing and colour, move-count distributions, latency percentiles).
+Win rates and latency percentiles are read from summary tables updated
+by every write, so their cost does not grow with the number of games.
+"""
+
+import math
+import sqlite3
+from collections import Counter
+
+from latency import bucket_value, latency_bucket
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    agent_0 INTEGER NOT NULL REFERENCES agents(id),
+    agent_1 INTEGER NOT NULL REFERENCES agents(id),
+    seed INTEGER,
+    winner INTEGER NOT NULL,  -- 0 or 1 for player_0 / player_1, -1 for a draw
+    num_moves INTEGER NOT NULL,
+    tag TEXT
+);
+CREATE TABLE IF NOT EXISTS moves (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    ply INTEGER NOT NULL,
+    agent INTEGER NOT NULL REFERENCES agents(id),
+    col INTEGER NOT NULL,
+    time_ns INTEGER,
+    PRIMARY KEY (game_id, ply)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS latency (
+    agent INTEGER NOT NULL REFERENCES agents(id),
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (agent, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pairings (
+    agent_0 INTEGER NOT NULL REFERENCES agents(id),
+    agent_1 INTEGER NOT NULL REFERENCES agents(id),
+    games INTEGER NOT NULL,
+    player_0 INTEGER NOT NULL,
+    player_1 INTEGER NOT NULL,
+    draw INTEGER NOT NULL,
+    PRIMARY KEY (agent_0, agent_1)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS games_pairing ON games (agent_0, agent_1, winner, num_moves);
+CREATE INDEX IF NOT EXISTS games_length ON games (num_moves);
+"""
+
+_WINNERS = {"player_0": 0, "player_1": 1, None: -1}
+
+
+class ResultsStore:
+    """
+    SQLite results store with batched writes
+    """
+
+    def __init__(self, path="results.sqlite", batch_size=1000):
+        """
+        Open (or create) the store
+
+        Parameters:
+            path: str, database file (":memory:" for a temporary store)
+            batch_size: int, games buffered before a write transaction
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        if self._db.execute("SELECT NOT EXISTS (SELECT 1 FROM pairings) AND EXISTS (SELECT 1 FROM games)").fetchone()[0]:
+            # Store written before the pairings table existed
+            with self._db:
+                self._db.execute("""
+                    INSERT INTO pairings
+                    SELECT agent_0, agent_1, COUNT(*), SUM(winner = 0), SUM(winner = 1), SUM(winner = -1)
+                    FROM games GROUP BY agent_0, agent_1
+                """)
+        self._agents = dict(self._db.execute("SELECT name, id FROM agents"))
+        self._next_id = self._db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM games").fetchone()[0]
+        self._games = []
+        self._moves = []
+        self._latency = Counter()
+        # (agent_0, agent_1, winner) -> games, pending for the pairings table
+        self._pairings = Counter()
+
+    def _agent_id(self, name):
+        if name not in self._agents:
+            cursor = self._db.execute("INSERT INTO agents (name) VALUES (?)", (name,))
+            self._agents[name] = cursor.lastrowid
+        return self._agents[name]
+
+    def add_game(self, agent_0, agent_1, seed, winner, moves, times_ns=None, tag=None):
+        """
+        Queue one game
+
+        Parameters:
+            agent_0, agent_1: str, names of player_0 and player_1
+            seed: int or None, seed of the game
+            winner: "player_0", "player_1" or None for a draw
+            moves: sequence of columns played, from the empty board
+            times_ns: optional sequence, decision time of every move
+            tag: optional str, free label (experiment, commit, ...)
+
+        Returns:
+            int: id of the game
+        """
+        game_id = self._next_id
+        self._next_id += 1
+        ids = (self._agent_id(agent_0), self._agent_id(agent_1))
+        self._games.append((game_id, ids[0], ids[1], seed, _WINNERS[winner], len(moves), tag))
+        self._pairings[ids[0], ids[1], _WINNERS[winner]] += 1
+        if times_ns is None:
+            times_ns = [None] * len(moves)
+        else:
+            for ply, elapsed in enumerate(times_ns):
+                self._latency[ids[ply % 2], latency_bucket(elapsed)] += 1
+        self._moves.extend((game_id, ply, ids[ply % 2], int(col), elapsed)
+                           for ply, (col, elapsed) in enumerate(zip(moves, times_ns)))
+        if len(self._games) >= self.batch_size:
+            self.flush()
+        return game_id
+
+    def flush(self):
+        """
+        Write the queued games in one transaction
+        """
+        with self._db:
+            self._db.executemany("INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?)", self._games)
+            self._db.executemany("INSERT INTO moves VALUES (?, ?, ?, ?, ?)", self._moves)
+            self._db.executemany("""
+                INSERT INTO latency VALUES (?, ?, ?)
+                ON CONFLICT (agent, bucket) DO UPDATE SET count = count + excluded.count
+            """, [(agent, bucket, count) for (agent, bucket), count in self._latency.items()])
+            self._db.executemany("""
+                INSERT INTO pairings VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (agent_0, agent_1) DO UPDATE SET games = games + excluded.games,
+                    player_0 = player_0 + excluded.player_0, player_1 = player_1 + excluded.player_1,
+                    draw = draw + excluded.draw
+            """, [(agent_0, agent_1, count, count * (winner == 0), count * (winner == 1), count * (winner == -1))
+                  for (agent_0, agent_1, winner), count in self._pairings.items()])
+        self._games.clear()
+        self._moves.clear()
+        self._latency.clear()
+        self._pairings.clear()
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM games").fetchone()[0] + len(self._games)
+
+    def win_rates(self):
+        """
+        Results per pairing, the first agent playing first
+
+        Read from the pairings table kept up to date by every write.
+
+        Returns:
+            list: dicts with agent_0, agent_1, games, player_0, player_1,
+                  draw and their rates
+        """
+        self.flush()
+        rows = self._db.execute("""
+            SELECT a0.name, a1.name, p.games, p.player_0, p.player_1, p.draw
+            FROM pairings p
+            JOIN agents a0 ON a0.id = p.agent_0
+            JOIN agents a1 ON a1.id = p.agent_1
+            ORDER BY a0.name, a1.name
+        """)
+        results = []
+        for agent_0, agent_1, games, wins_0, wins_1, draws in rows:
+            results.append({
+                "agent_0": agent_0,
+                "agent_1": agent_1,
+                "games": games,
+                "player_0": wins_0,
+                "player_1": wins_1,
+                "draw": draws,
+                "rate_0": wins_0 / games,
+                "rate_1": wins_1 / games,
+                "rate_draw": draws / games,
+            })
+        return results
+
+    def color_win_rates(self):
+        """
+        Win rate of every agent as first and as second player
+
+        Returns:
+            dict: {agent name: {"first": rate or None, "second": rate or None}}
+        """
+        rates = {}
+        for row in self.win_rates():
+            for seat, agent, wins in (("first", row["agent_0"], row["player_0"]),
+                                      ("second", row["agent_1"], row["player_1"])):
+                totals = rates.setdefault(agent, {"first": [0, 0], "second": [0, 0]})
+                totals[seat][0] += wins
+                totals[seat][1] += row["games"]
+        return {agent: {seat: (wins / games if games else None) for seat, (wins, games) in totals.items()}
+                for agent, totals in rates.items()}
+
+    def move_count_distribution(self, agent_0=None, agent_1=None):
+        """
+        Number of games of every length, optionally for one pairing
+
+        Returns:
+            dict: {number of moves: number of games}
+        """
+        self.flush()
+        if agent_0 is None and agent_1 is None:
+            rows = self._db.execute("SELECT num_moves, COUNT(*) FROM games GROUP BY num_moves")
+        else:
+            rows = self._db.execute("""
+                SELECT num_moves, COUNT(*) FROM games
+                WHERE agent_0 = (SELECT id FROM agents WHERE name = ?)
+                  AND agent_1 = (SELECT id FROM agents WHERE name = ?)
+                GROUP BY num_moves
+            """, (agent_0, agent_1))
+        return dict(rows)
+
+    def latency_percentiles(self, percentiles=(50, 90, 99)):
+        """
+        Decision time percentiles of every agent
+
+        Read from the latency histogram kept up to date by every write, so
+        the cost does not depend on the number of moves stored; values are
+        bucket middles (within about 5% of the exact percentile). Exact
+        times remain in moves.time_ns.
+
+        Returns:
+            dict: {agent name: {"count": moves, percentile: time in ns}}
+        """
+        self.flush()
+        histograms = {}
+        rows = self._db.execute("""
+            SELECT a.name, l.bucket, l.count FROM latency l JOIN agents a ON a.id = l.agent
+            ORDER BY a.name, l.bucket
+        """)
+        for name, bucket, count in rows:
+            histograms.setdefault(name, []).append((bucket, count))
+
+        results = {}
+        for name, histogram in histograms.items():
+            total = sum(count for _, count in histogram)
+            stats = {"count": total}
+            for percentile in percentiles:
+                # Nearest rank
+                rank = max(1, math.ceil(percentile * total / 100))
+                seen = 0
+                for bucket, count in histogram:
+                    seen += count
+                    if seen >= rank:
+                        stats[percentile] = bucket_value(bucket)
+                        break
+            results[name] = stats
+        return results
@@ -5,26 +5,30 @@ This agent uses rule-based heuristics to play strategically.
 """
 
 import random
-import numpy as np
+
+from action_space import connect_four_action_space
+from board import BITS, as_position
 
 class SmartAgent:
     """
     A rule-based agent that plays strategically
     """
 
-    def __init__(self, env, player_name=None):
+    def __init__(self, env=None, player_name=None):
         """
         Initialize the smart agent
 
         Parameters:
-            env: PettingZoo environment
+            env: optional PettingZoo environment (only its action space is
+                 used, Discrete(7) when omitted)
             player_name: Optional name for the agent
         """
-        self.env = env
-        self.action_space = env.action_space(env.agents[0])
+        self.action_space = connect_four_action_space(env)
         self.player_name = player_name or "SmartAgent"
         self.rows = 6
         self.column = 7
+        # True when the last chosen move came from the random fallback
+        self.last_action_random = False
 
     def choose_action(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
         """
@@ -38,14 +42,16 @@ class SmartAgent:
         """
         # Get valid actions
         valid_actions = self._get_valid_actions(action_mask)
+        self.last_action_random = False
+        position = as_position(observation)
 
         # Rule 1: Try to win
-        winning_move = self._find_winning_move(observation, valid_actions, channel=0)
+        winning_move = self._find_winning_move(position, valid_actions, channel=0)
         if winning_move is not None:
             return winning_move
 
         # Rule 2: Block opponent
-        blocking_move = self._find_winning_move(observation, valid_actions, channel=1)
+        blocking_move = self._find_winning_move(position, valid_actions, channel=1)
         if blocking_move is not None:
             return blocking_move
 
@@ -54,6 +60,7 @@ class SmartAgent:
             return 3
 
         # Rule 4: Random fallback
+        self.last_action_random = True
         return random.choice(valid_actions)
 
     def _get_valid_actions(self, action_mask):
@@ -78,90 +85,83 @@ class SmartAgent:
         Find which row a piece would land in if dropped in column col
 
         Parameters:
-            board: numpy array (6, 7, 2)
+            board: board.Position or numpy array (6, 7, 2)
             col: column index (0-6)
 
         Returns:
             row index (0-5) if space available, None if column full
         """
-        for row in range(self.rows -1, -1, -1):  # Start from bottom (row 5)
-            if board[row, col, 0] == 0 and board[row, col, 1] == 0:
-                return row  # This position is empty
-        return None  # Column is full
-    
-    
-    
-    
-
+        return as_position(board).next_row(col)
 
     def _check_win_from_position(self, board, row, col, channel):
         """
         Check if placing a piece at (row, col) would create 4 in a row
 
         Parameters:
-            board: numpy array (6, 7, 2)
+            board: board.Position or numpy array (6, 7, 2)
             row: row index (0-5)
             col: column index (0-6)
             channel: 0 or 1 (which player's pieces to check)
 
         Returns:
             True if this position creates 4 in a row/col/diag, False otherwise
+
+        This is the agent's historical line count, kept move for move so
+        that results against SmartAgent stay comparable: it misses some
+        lines and sees others that wrap around the board edges (negative
+        indexes). board.Position.completes_four is the exact check.
         """
+        own = as_position(board).masks[channel]
         directions = [(0,1), (1,0), (1,1), (1,-1)]
         for a, b in directions:
             count = 1
             if row + a < self.rows and col + b < self.column:
-                r1 = row + a 
-                c1 = col + b 
-                
-                A = board[r1, c1, channel]
-                if A == 1:
+                r1 = row + a
+                c1 = col + b
+                # Negative indexes wrap around, as they did on the arrays
+                A = own & BITS[r1][c1]
+                if A:
                     count += 1
-                while 0 <= r1 < self.rows -1 and 0 <= c1 < self.column - 1 and A == 1:
+                while 0 <= r1 < self.rows - 1 and 0 <= c1 < self.column - 1 and A:
                     r1 += a
-                    c1 += b 
-                    if A == board[r1, c1, channel]:
+                    c1 += b
+                    A = own & BITS[r1][c1]
+                    if A:
                         count += 1
-                    A = board[r1, c1, channel]
-            if   self.rows > row - a >= 0 and  self.column > col - b >= 0 :
-                r2 = row - a 
-                c2 = col - b 
-                B = board[r2, c2, channel]
-                if B == 1:
+            if self.rows > row - a >= 0 and self.column > col - b >= 0:
+                r2 = row - a
+                c2 = col - b
+                B = own & BITS[r2][c2]
+                if B:
                     count += 1
-                while 0 <= r2 < self.rows -1 and 0 <= c2 < self.column - 1  and B == 1:
+                while 0 <= r2 < self.rows - 1 and 0 <= c2 < self.column - 1 and B:
                     r2 -= a
-                    c2 -= b 
-                    if B == board[r2, c2, channel]:
+                    c2 -= b
+                    B = own & BITS[r2][c2]
+                    if B:
                         count += 1
-                    B = board[r2, c2, channel]
-                
-            if count >= 4 :
-                return True  
-        return False    
-
-   
-              
+            if count >= 4:
+                return True
+        return False
 
     def _find_winning_move(self, observation, valid_actions, channel):
         """
         Find a move that creates 4 in a row for the specified player
 
         Parameters:
-            observation: numpy array (6, 7, 2) - current board state
+            observation: board.Position or numpy array (6, 7, 2) - current board state
             valid_actions: list of valid column indices
             channel: 0 for current player, 1 for opponent
 
         Returns:
             column index (int) if winning move found, None otherwise
         """
+        position = as_position(observation)
         for col in valid_actions:
             # Find where the piece would land in this column
-            row = self._get_next_row(observation, col)
+            row = self._get_next_row(position, col)
             if row is not None:
                 # Check if this move would create a winning position
-                if self._check_win_from_position(observation, row, col, channel) == True:
+                if self._check_win_from_position(position, row, col, channel):
                     return col
         return None
-
-
@@ -5,26 +5,32 @@ This agent uses advanced rule-based heuristics to play strategically.
 """
 
 import random
-import numpy as np
+
+from action_space import connect_four_action_space
+from board import BITS, as_position
 
 class SmartAgentAmeliore:
     """
     An enhanced rule-based agent that plays strategically
     """
 
-    def __init__(self, env, player_name=None):
+    def __init__(self, env=None, player_name=None):
         """
         Initialize the smart agent
 
         Parameters:
-            env: PettingZoo environment
+            env: optional PettingZoo environment (only its action space is
+                 used, Discrete(7) when omitted)
             player_name: Optional name for the agent
         """
-        self.env = env
-        self.action_space = env.action_space(env.agents[0])
+        self.action_space = connect_four_action_space(env)
         self.player_name = player_name or "SmartAgentAmeliore"
         self.rows = 6
         self.column = 7
+        # True when the last chosen move came from the random fallback
+        self.last_action_random = False
+        # Optional RuleProfiler (see agent_profiler.py), None in production
+        self.profiler = None
 
     def choose_action(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
         """
@@ -44,37 +50,45 @@ class SmartAgentAmeliore:
         """
         # Get valid actions
         valid_actions = self._get_valid_actions(action_mask)
+        self.last_action_random = False
+        # The rules work on a bitboard (see board.py)
+        position = as_position(observation)
+
+        # Instrumented path, only taken when a RuleProfiler is attached
+        if self.profiler is not None:
+            return self.profiler.run_rules(self, position, valid_actions)
+
+        for _, rule in self.RULES:
+            move = rule(self, position, valid_actions)
+            if move is not None:
+                return move
+        return None
 
+    def _rule_win(self, observation, valid_actions):
         # Rule 1: Try to win immediately
-        winning_move = self._find_winning_move(observation, valid_actions, channel=0)
-        if winning_move is not None:
-            return winning_move
+        return self._find_winning_move(observation, valid_actions, channel=0)
 
+    def _rule_block(self, observation, valid_actions):
         # Rule 2: Block opponent from winning
-        blocking_move = self._find_winning_move(observation, valid_actions, channel=1)
-        if blocking_move is not None:
-            return blocking_move
+        return self._find_winning_move(observation, valid_actions, channel=1)
 
+    def _rule_double_threat(self, observation, valid_actions):
         # Rule 3: Create double threat (unbeatable if opponent can't win next)
-        double_threat_move = self._find_double_threat_move(observation, valid_actions, channel=0)
-        if double_threat_move is not None:
-            return double_threat_move
+        return self._find_double_threat_move(observation, valid_actions, channel=0)
 
+    def _rule_block_double_threat(self, observation, valid_actions):
         # Rule 4: Block opponent double threat
-        block_double_threat = self._find_double_threat_move(observation, valid_actions, channel=1)
-        if block_double_threat is not None:
-            return block_double_threat
+        return self._find_double_threat_move(observation, valid_actions, channel=1)
 
+    def _rule_fork(self, observation, valid_actions):
         # Rule 5: Create strategic forks
-        fork_move = self._find_fork_move(observation, valid_actions, channel=0)
-        if fork_move is not None:
-            return fork_move
+        return self._find_fork_move(observation, valid_actions, channel=0)
 
+    def _rule_block_fork(self, observation, valid_actions):
         # Rule 6: Block opponent forks
-        block_fork = self._find_fork_move(observation, valid_actions, channel=1)
-        if block_fork is not None:
-            return block_fork
+        return self._find_fork_move(observation, valid_actions, channel=1)
 
+    def _rule_center_score(self, observation, valid_actions):
         # Rule 7: Strategic center preference with scoring
         scored_moves = []
         for col in valid_actions:
@@ -85,10 +99,26 @@ class SmartAgentAmeliore:
         if scored_moves:
             scored_moves.sort(key=lambda x: x[1], reverse=True)
             return scored_moves[0][0]
+        return None
 
+    def _rule_random(self, observation, valid_actions):
         # Rule 8: Random fallback
+        self.last_action_random = True
         return random.choice(valid_actions)
 
+    # Rules in priority order, as (name, function); the first one that
+    # returns a column decides the move
+    RULES = (
+        ("win", _rule_win),
+        ("block", _rule_block),
+        ("double_threat", _rule_double_threat),
+        ("block_double_threat", _rule_block_double_threat),
+        ("fork", _rule_fork),
+        ("block_fork", _rule_block_fork),
+        ("center_score", _rule_center_score),
+        ("random", _rule_random),
+    )
+
     def _get_valid_actions(self, action_mask):
         """
         Get list of valid column indices
@@ -111,23 +141,28 @@ class SmartAgentAmeliore:
         Find which row a piece would land in if dropped in column col
 
         Parameters:
-            board: numpy array (6, 7, 2)
+            board: board.Position or numpy array (6, 7, 2)
             col: column index (0-6)
 
         Returns:
             row index (0-5) if space available, None if column full
         """
-        for row in range(self.rows - 1, -1, -1):  # Start from bottom (row 5)
-            if board[row, col, 0] == 0 and board[row, col, 1] == 0:
-                return row  # This position is empty
-        return None  # Column is full
+        return as_position(board).next_row(col)
+
+    def _copy_board(self, board):
+        """
+        Copy a board before simulating a move on it
+
+        Kept as a method so that a RuleProfiler can count board copies.
+        """
+        return as_position(board).copy()
 
     def _check_win_from_position(self, board, row, col, channel):
         """
         Check if placing a piece at (row, col) would create 4 in a row
 
         Parameters:
-            board: numpy array (6, 7, 2)
+            board: board.Position or numpy array (6, 7, 2)
             row: row index (0-5)
             col: column index (0-6)
             channel: 0 or 1 (which player's pieces to check)
@@ -135,34 +170,14 @@ class SmartAgentAmeliore:
         Returns:
             True if this position creates 4 in a row/col/diag, False otherwise
         """
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]  # horizontal, vertical, diagonal
-        for dr, dc in directions:
-            count = 1  # Count the current position
-            
-            # Check positive direction
-            r, c = row + dr, col + dc
-            while 0 <= r < self.rows and 0 <= c < self.column and board[r, c, channel] == 1:
-                count += 1
-                r += dr
-                c += dc
-            
-            # Check negative direction  
-            r, c = row - dr, col - dc
-            while 0 <= r < self.rows and 0 <= c < self.column and board[r, c, channel] == 1:
-                count += 1
-                r -= dr
-                c -= dc
-            
-            if count >= 4:
-                return True
-        return False
+        return as_position(board).completes_four(row, col, channel)
 
     def _find_winning_move(self, observation, valid_actions, channel):
         """
         Find a move that creates 4 in a row for the specified player
 
         Parameters:
-            observation: numpy array (6, 7, 2) - current board state
+            observation: board.Position - current board state
             valid_actions: list of valid column indices
             channel: 0 for current player, 1 for opponent
 
@@ -183,7 +198,7 @@ class SmartAgentAmeliore:
         Find a move that creates two separate winning threats
 
         Parameters:
-            observation: numpy array (6, 7, 2) - current board state
+            observation: board.Position - current board state
             valid_actions: list of valid column indices
             channel: 0 for current player, 1 for opponent
 
@@ -205,13 +220,13 @@ class SmartAgentAmeliore:
             True if move creates double threat, False otherwise
         """
         # Create a copy of the board to simulate the move
-        board_copy = board.copy()
+        board_copy = self._copy_board(board)
         row = self._get_next_row(board_copy, col)
         if row is None:
             return False
             
         # Place the piece on the copied board
-        board_copy[row, col, channel] = 1
+        board_copy.play(col, channel)
         
         # Count how many winning moves are available after this move
         winning_threats = 0
@@ -220,9 +235,7 @@ class SmartAgentAmeliore:
         for next_col in range(self.column):
             next_row = self._get_next_row(board_copy, next_col)
             if next_row is not None:
-                # Create a temporary copy to check win without modifying the main copy
-                temp_board = board_copy.copy()
-                if self._check_win_from_position(temp_board, next_row, next_col, channel):
+                if self._check_win_from_position(board_copy, next_row, next_col, channel):
                     winning_threats += 1
                     # If we found 2 threats, we can return early
                     if winning_threats >= 2:
@@ -254,13 +267,13 @@ class SmartAgentAmeliore:
         """
         Evaluate how many potential winning lines this move creates
         """
-        board_copy = board.copy()
+        board_copy = self._copy_board(board)
         row = self._get_next_row(board_copy, col)
         if row is None:
             return 0
             
         # Place the piece
-        board_copy[row, col, channel] = 1
+        board_copy.play(col, channel)
         
         # Count potential winning lines in different directions
         directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
@@ -279,14 +292,16 @@ class SmartAgentAmeliore:
         Check if a line in given direction has potential to become a winning line
         """
         count = 1  # Current position
-        
+        own = board.masks[channel]
+        occupied = board.masks[0] | board.masks[1]
+
         # Check positive direction
         r, c = row + dr, col + dc
         consecutive_empty = 0
         while 0 <= r < self.rows and 0 <= c < self.column and consecutive_empty < 2:
-            if board[r, c, channel] == 1:
+            if own & BITS[r][c]:
                 count += 1
-            elif board[r, c, 0] == 0 and board[r, c, 1] == 0:
+            elif not occupied & BITS[r][c]:
                 consecutive_empty += 1
             else:
                 break  # Opponent piece blocking
@@ -297,9 +312,9 @@ class SmartAgentAmeliore:
         r, c = row - dr, col - dc
         consecutive_empty = 0
         while 0 <= r < self.rows and 0 <= c < self.column and consecutive_empty < 2:
-            if board[r, c, channel] == 1:
+            if own & BITS[r][c]:
                 count += 1
-            elif board[r, c, 0] == 0 and board[r, c, 1] == 0:
+            elif not occupied & BITS[r][c]:
                 consecutive_empty += 1
             else:
                 break  # Opponent piece blocking
@@ -351,17 +366,18 @@ class SmartAgentAmeliore:
         Count how many friendly pieces are connected in a line
         """
         count = 0
-        
+        own = board.masks[channel]
+
         # Check positive direction
         r, c = row + dr, col + dc
-        while 0 <= r < self.rows and 0 <= c < self.column and board[r, c, channel] == 1:
+        while 0 <= r < self.rows and 0 <= c < self.column and own & BITS[r][c]:
             count += 1
             r += dr
             c += dc
         
         # Check negative direction
         r, c = row - dr, col - dc
-        while 0 <= r < self.rows and 0 <= c < self.column and board[r, c, channel] == 1:
+        while 0 <= r < self.rows and 0 <= c < self.column and own & BITS[r][c]:
             count += 1
             r -= dr
             c -= dc
@@ -389,13 +405,15 @@ class SmartAgentAmeliore:
         # Count consecutive pieces and empty spaces in this direction
         consecutive = 1  # Current piece
         empty_spaces = 0
+        own = board.masks[channel]
+        occupied = board.masks[0] | board.masks[1]
         
         # Positive direction
         r, c = row + dr, col + dc
         while 0 <= r < self.rows and 0 <= c < self.column and empty_spaces < 2:
-            if board[r, c, channel] == 1:
+            if own & BITS[r][c]:
                 consecutive += 1
-            elif board[r, c, 0] == 0 and board[r, c, 1] == 0:
+            elif not occupied & BITS[r][c]:
                 empty_spaces += 1
             else:
                 break
@@ -406,9 +424,9 @@ class SmartAgentAmeliore:
         r, c = row - dr, col - dc
         empty_spaces = 0
         while 0 <= r < self.rows and 0 <= c < self.column and empty_spaces < 2:
-            if board[r, c, channel] == 1:
+            if own & BITS[r][c]:
                 consecutive += 1
-            elif board[r, c, 0] == 0 and board[r, c, 1] == 0:
+            elif not occupied & BITS[r][c]:
                 empty_spaces += 1
             else:
                 break
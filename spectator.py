@@ -0,0 +1,271 @@
+"""
+Spectator
+
+Watch tournament games without slowing them down. Games run headless
+and publish their moves to a queue; a renderer process draws the
+selected games at its own pace, in the terminal or with the PettingZoo
+renderer. Recorded games (archive, JSONL log) can be replayed the same
+way.
+
+Usage:
+    python spectator.py --archive games.c4a --game 3
+    python spectator.py --log logs/games.jsonl --game 0 --mode pettingzoo
+"""
+
+import argparse
+import multiprocessing
+import queue
+import sys
+import time
+
+ROWS = 6
+COLUMNS = 7
+SYMBOLS = {0: ".", 1: "X", 2: "O"}
+
+
+def format_board(board):
+    """
+    Text drawing of a board, in the print_board style
+
+    Parameters:
+        board: 6x7 nested lists or array, 0 empty, 1 player_0 (X), 2 player_1 (O)
+
+    Returns:
+        str: six lines of "X", "O" and "." plus the column numbers
+    """
+    lines = [" ".join(SYMBOLS[int(cell)] for cell in row) for row in board]
+    lines.append(" ".join(str(col) for col in range(COLUMNS)))
+    return "\n".join(lines)
+
+
+class SpectatorPublisher:
+    """
+    Publishes the move events of selected games to a queue, never blocking
+
+    Events:
+        ("start", game_id, {"agents": [...]})
+        ("move", game_id, ply, player, column)
+        ("end", game_id, winner, number of moves)
+
+    When the queue is full the rest of the game is dropped (and an "end"
+    event is not sent for it), so a slow renderer never slows the games.
+    """
+
+    def __init__(self, events, games=None, every=None):
+        """
+        Initialize the publisher
+
+        Parameters:
+            events: queue.Queue or multiprocessing.Queue
+            games: optional collection of game ids to publish
+            every: optional int, publish one game out of every (by game id)
+            If neither is given, every game is published.
+        """
+        self.events = events
+        self.games = set(games) if games is not None else None
+        self.every = every
+        self.dropped = 0
+        self._live = set()
+
+    def selected(self, game_id):
+        if self.games is not None and game_id not in self.games:
+            return False
+        return not self.every or game_id is None or game_id % self.every == 0
+
+    def _put(self, game_id, event):
+        if game_id not in self._live:
+            return
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self._live.discard(game_id)
+            self.dropped += 1
+
+    def start(self, game_id, agents):
+        if self.selected(game_id):
+            self._live.add(game_id)
+            self._put(game_id, ("start", game_id, {"agents": list(agents)}))
+
+    def move(self, game_id, ply, player, column):
+        self._put(game_id, ("move", game_id, ply, player, int(column)))
+
+    def end(self, game_id, winner, moves):
+        self._put(game_id, ("end", game_id, winner, moves))
+        self._live.discard(game_id)
+
+    def close(self):
+        """
+        Tell the renderer there are no more games
+        """
+        try:
+            self.events.put(None, timeout=1.0)
+        except queue.Full:
+            pass
+
+
+class TerminalView:
+    """
+    Draws games as text
+    """
+
+    def __init__(self, output=None):
+        self.output = output or sys.stdout
+        self.boards = {}
+        self.heights = {}
+
+    def watching(self, game_id):
+        return game_id in self.boards
+
+    def start(self, game_id, info):
+        self.boards[game_id] = [[0] * COLUMNS for _ in range(ROWS)]
+        self.heights[game_id] = [0] * COLUMNS
+        agents = " vs ".join(info.get("agents", []))
+        print(f"\n=== game {game_id}: {agents} ===", file=self.output)
+
+    def move(self, game_id, ply, player, column):
+        board, heights = self.boards[game_id], self.heights[game_id]
+        board[ROWS - 1 - heights[column]][column] = 1 if player == "player_0" else 2
+        heights[column] += 1
+        print(f"\ngame {game_id}, move {ply + 1}: {player} plays column {column}", file=self.output)
+        print(format_board(board), file=self.output)
+
+    def end(self, game_id, winner, moves):
+        result = f"{winner} wins" if winner else "draw"
+        print(f"\ngame {game_id}: {result} after {moves} moves", file=self.output)
+        self.boards.pop(game_id, None)
+        self.heights.pop(game_id, None)
+        self.output.flush()
+
+
+class PettingZooView:
+    """
+    Replays games in a connect_four_v3 environment with render_mode="human"
+    """
+
+    def __init__(self):
+        self.envs = {}
+
+    def watching(self, game_id):
+        return game_id in self.envs
+
+    def start(self, game_id, info):
+        from pettingzoo.classic import connect_four_v3
+
+        env = connect_four_v3.env(render_mode="human")
+        env.reset()
+        self.envs[game_id] = env
+
+    def move(self, game_id, ply, player, column):
+        self.envs[game_id].step(column)
+
+    def end(self, game_id, winner, moves):
+        env = self.envs.pop(game_id, None)
+        if env is not None:
+            env.close()
+
+
+def make_view(mode, output=None):
+    if mode == "terminal":
+        return TerminalView(output)
+    if mode == "pettingzoo":
+        return PettingZooView()
+    raise ValueError(f"unknown spectator mode {mode!r}")
+
+
+def render_events(events, mode="terminal", delay=0.3, output=None):
+    """
+    Consume move events until the None sentinel and draw them
+
+    Parameters:
+        events: queue of events published by a SpectatorPublisher
+        mode: "terminal" or "pettingzoo"
+        delay: float, seconds to wait after each drawn move
+        output: optional path of a file the terminal view writes to
+    """
+    stream = open(output, "w") if output else None
+    view = make_view(mode, stream)
+    try:
+        while True:
+            event = events.get()
+            if event is None:
+                break
+            kind, game_id = event[0], event[1]
+            if kind == "start":
+                view.start(game_id, event[2])
+            elif kind == "move":
+                if view.watching(game_id):
+                    view.move(game_id, *event[2:])
+                    if delay:
+                        time.sleep(delay)
+            elif kind == "end":
+                view.end(game_id, *event[2:])
+    finally:
+        if stream is not None:
+            stream.close()
+
+
+def start_spectator(mode="terminal", delay=0.3, games=None, every=None, maxsize=10000, output=None):
+    """
+    Start a renderer process
+
+    Returns:
+        tuple: (SpectatorPublisher to pass to the tournament, renderer
+               process); call publisher.close() then process.join() at the end
+    """
+    events = multiprocessing.Queue(maxsize)
+    process = multiprocessing.Process(target=render_events, args=(events, mode, delay, output), daemon=True)
+    process.start()
+    return SpectatorPublisher(events, games, every), process
+
+
+def replay_game(moves, agents=("player_0", "player_1"), game_id=0, winner=None, mode="terminal", delay=0.3,
+                output=None):
+    """
+    Draw a recorded game in the current process
+
+    Parameters:
+        moves: list of columns, from the empty board
+        agents: names shown in the header
+        game_id: id shown in the header
+        winner: "player_0", "player_1" or None
+        mode, delay: see render_events
+        output: optional file object (terminal mode)
+    """
+    view = make_view(mode, output)
+    view.start(game_id, {"agents": list(agents)})
+    for ply, column in enumerate(moves):
+        view.move(game_id, ply, f"player_{ply % 2}", column)
+        if delay:
+            time.sleep(delay)
+    view.end(game_id, winner, len(moves))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded Connect Four game")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--archive", help="binary game archive (game_archive.py)")
+    source.add_argument("--log", help="JSONL game log (game_log.py)")
+    parser.add_argument("--game", type=int, default=0, help="index in the archive, game_id in the log")
+    parser.add_argument("--mode", choices=["terminal", "pettingzoo"], default="terminal")
+    parser.add_argument("--delay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    if args.archive:
+        from game_archive import GameArchive
+
+        with GameArchive(args.archive) as archive:
+            game = archive.game(args.game)
+        replay_game(game["moves"], (game["agent_0"], game["agent_1"]), args.game, game["winner"], args.mode,
+                    args.delay)
+    else:
+        from game_log import read_game_log
+
+        record = next(read_game_log(args.log, game_id=args.game), None)
+        if record is None:
+            raise SystemExit(f"game {args.game} not found in {args.log}")
+        replay_game(record["moves"], record["pairing"].split("-"), args.game, record["winner"], args.mode,
+                    args.delay)
+
+
+if __name__ == "__main__":
+    main()
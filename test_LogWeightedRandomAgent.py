@@ -36,3 +36,56 @@ for agent in env.agent_iter():
 #input("Press Enter to close...")
 env.close()
 
+
+class DummyEnv:
+    def __init__(self):
+        self.agents = ["player_0"]
+    def action_space(self, agent):
+        return None
+
+
+def test_sampled_games_go_to_jsonl(tmp_path):
+    import json
+    from LogWeightedRandomAgent import configure_game_log, close_game_log
+
+    path = tmp_path / "games.jsonl"
+    handler_id = configure_game_log(str(path), level="DEBUG")
+    agent = LogWeightedRandomAgent(DummyEnv(), player_name="Un", sample_every=2)
+    mask = np.ones(7, dtype=np.int8)
+    for game_id in range(4):
+        agent.start_game(game_id)
+        action = agent.choose_action_weight(observation=None, action_mask=mask)
+        assert 0 <= action < 7
+    close_game_log(handler_id)
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    print("\nTEST sampled log records", records)
+    assert {record["game"] for record in records} == {0, 2}
+    assert len(records) == 4
+    assert records[0]["player"] == "Un"
+
+
+def test_unsampled_game_does_not_log():
+    agent = LogWeightedRandomAgent(DummyEnv(), player_name="Deux", sample_every=3)
+    agent.start_game(1)
+    assert agent._log is None
+    assert agent.choose_action_weight(observation=None, action_mask=np.array([0,0,0,1,0,0,0])) == 3
+
+
+def test_game_log_keeps_other_sinks(tmp_path, capsys):
+    from LogWeightedRandomAgent import configure_game_log, close_game_log, get_logger
+
+    logger = get_logger()
+    received = []
+    sink_id = logger.add(received.append, format="{message}")
+    handler_id = configure_game_log(str(tmp_path / "games.jsonl"))
+    logger.info("still here")
+    close_game_log(handler_id)
+    logger.remove(sink_id)
+    assert received == ["still here\n"]
+
+    # exclusive mode removes every sink, and adds stderr back on close
+    handler_id = configure_game_log(str(tmp_path / "games.jsonl"), exclusive=True)
+    close_game_log(handler_id)
+    logger.info("back on stderr")
+    assert "back on stderr" in capsys.readouterr().err
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+import numpy as np
+
+from action_space import LazyDiscrete, connect_four_action_space
+from agent_minimax import MinimaxAgent
+from connect_four_engine import ConnectFourEngine
+from LogWeightedRandomAgent import LogWeightedRandomAgent
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from smart_agent_ameliore import SmartAgentAmeliore
+from test_tournament import play_game
+from WeightedRandomAgent import WeightedRandomAgent
+
+
+def imported_modules(code):
+    """Modules loaded by a fresh interpreter running code"""
+    result = subprocess.run([sys.executable, "-c", code + "\nimport sys; print(' '.join(sys.modules))"],
+                            capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+def test_lazy_space_behaves_like_discrete():
+    space = connect_four_action_space()
+    assert isinstance(space, LazyDiscrete) and space.n == 7
+    space.seed(3)
+    first = [space.sample(mask=np.array([0, 1, 0, 1, 0, 1, 0], dtype=np.int8)) for _ in range(20)]
+    space.seed(3)
+    assert [space.sample(mask=np.array([0, 1, 0, 1, 0, 1, 0], dtype=np.int8)) for _ in range(20)] == first
+    assert set(first) <= {1, 3, 5}
+
+
+def test_env_space_is_used_when_given():
+    env = ConnectFourEngine()
+    env.reset()
+    assert RandomAgent(env).action_space is env.action_space("player_0")
+
+
+def test_agents_play_without_env():
+    env = ConnectFourEngine()
+    for cls in (RandomAgent, WeightedRandomAgent, LogWeightedRandomAgent, SmartAgent, SmartAgentAmeliore):
+        agents = {"player_0": cls(player_name="player_0"), "player_1": SmartAgent()}
+        winner, moves = play_game(env, agents, seed=1, agent_seed=1, verbose=False)
+        assert 7 <= moves <= 42
+    agents = {"player_0": MinimaxAgent(depth=2), "player_1": RandomAgent()}
+    assert play_game(env, agents, seed=1, agent_seed=1, verbose=False)[0] == "player_0"
+
+
+def test_creating_agents_imports_no_heavy_module():
+    modules = imported_modules("from smart_agent_ameliore import SmartAgentAmeliore; SmartAgentAmeliore()\n"
+                               "from smart_agent import SmartAgent; SmartAgent()")
+    assert not modules & {"numpy", "gymnasium", "pettingzoo", "loguru"}
+    modules = imported_modules("from LogWeightedRandomAgent import LogWeightedRandomAgent; LogWeightedRandomAgent()")
+    assert not modules & {"gymnasium", "pettingzoo", "loguru"}
@@ -0,0 +1,88 @@
+import numpy as np
+from agent_profiler import RuleProfiler
+from smart_agent_ameliore import SmartAgentAmeliore
+
+
+class DummyEnv:
+    def __init__(self):
+        self.agents = ["player_0"]
+    def action_space(self, agent):
+        return None
+
+
+def blocking_board():
+    board = np.zeros((6,7,2), dtype=np.float32)
+    board[5,0,1] = 1
+    board[5,1,1] = 1
+    board[5,2,1] = 1
+    return board
+
+
+def test_profiler_records_deciding_rule():
+    agent = SmartAgentAmeliore(DummyEnv())
+    profiler = RuleProfiler()
+    profiler.attach(agent)
+
+    action = agent.choose_action(blocking_board(), action_mask=np.ones(7, dtype=np.int8))
+    trace = profiler.trace[-1]
+
+    print("\nTEST profiler trace ", trace)
+    assert action == 3
+    assert trace["rule"] == "block"
+    assert list(trace["times_ns"]) == ["win", "block"]
+    assert trace["helpers"]["_get_next_row"] == 11  # 7 columns for "win" + 4 until "block" finds column 3
+    assert profiler.summary()["rules"]["block"]["fired"] == 1
+
+
+def test_profiler_counts_board_copies():
+    agent = SmartAgentAmeliore(DummyEnv())
+    profiler = RuleProfiler(trace_limit=0)
+    profiler.attach(agent)
+
+    agent.choose_action(np.zeros((6,7,2)), action_mask=np.ones(7, dtype=np.int8))
+
+    print("\nTEST profiler report\n" + profiler.report())
+    assert profiler.helper_calls["_copy_board"] > 0
+    assert profiler.helper_calls["_check_win_from_position"] > 0
+    assert len(profiler.trace) == 0
+
+
+def test_profiler_does_not_change_decisions():
+    plain = SmartAgentAmeliore(DummyEnv())
+    profiled = RuleProfiler().attach(SmartAgentAmeliore(DummyEnv()))
+    rng = np.random.default_rng(0)
+
+    for _ in range(20):
+        board = np.zeros((6,7,2), dtype=np.float32)
+        heights = [0] * 7
+        for ply in range(int(rng.integers(0, 20))):
+            col = int(rng.integers(0, 7))
+            if heights[col] < 6:
+                board[5 - heights[col], col, ply % 2] = 1
+                heights[col] += 1
+        mask = np.array([1 if h < 6 else 0 for h in heights], dtype=np.int8)
+        assert plain.choose_action(board, action_mask=mask) == profiled.choose_action(board, action_mask=mask)
+
+
+def test_detach_restores_agent():
+    agent = SmartAgentAmeliore(DummyEnv())
+    profiler = RuleProfiler()
+    profiler.attach(agent)
+    profiler.detach(agent)
+
+    agent.choose_action(blocking_board(), action_mask=np.ones(7, dtype=np.int8))
+
+    assert agent.profiler is None
+    assert "_get_next_row" not in agent.__dict__
+    assert profiler.calls == 0
+
+
+def test_merge_profiles():
+    first, second = RuleProfiler(), RuleProfiler()
+    for profiler in (first, second):
+        agent = profiler.attach(SmartAgentAmeliore(DummyEnv()))
+        agent.choose_action(blocking_board(), action_mask=np.ones(7, dtype=np.int8))
+
+    first.merge(second)
+    assert first.calls == 2
+    assert first.fired["block"] == 2
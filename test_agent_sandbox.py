@@ -0,0 +1,83 @@
+import os
+import time
+from multiprocessing import shared_memory
+
+import pytest
+
+from agent_sandbox import SandboxedAgent
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from test_tournament import make_env, play_game, play_one_game
+from time_limit import AgentCrashed, TimeLimit
+
+
+class SlowAgent(RandomAgent):
+    """Random agent that thinks for one second on every move"""
+
+    def choose_action(self, **kwargs):
+        time.sleep(1.0)
+        return super().choose_action(**kwargs)
+
+
+class CrashingAgent(RandomAgent):
+    """Random agent whose process dies on its third move"""
+
+    moves = 0
+
+    def choose_action(self, **kwargs):
+        self.moves += 1
+        if self.moves == 3:
+            os._exit(1)
+        return super().choose_action(**kwargs)
+
+
+def test_sandboxed_agents_play_the_same_game():
+    for seed in (1, 2, 3):
+        in_process = play_one_game(RandomAgent, SmartAgent, render_mode=None, seed=seed, agent_seed=seed,
+                                   engine="native")
+        sandboxed = play_one_game(RandomAgent, SmartAgent, render_mode=None, seed=seed, agent_seed=seed,
+                                  engine="native", isolate="sandbox")
+        assert sandboxed == in_process
+
+
+def test_late_agent_is_restarted():
+    limit = TimeLimit(50, policy="forfeit")
+    agent = SandboxedAgent(SlowAgent, "player_0")
+    env = make_env("native")
+    env.reset()
+    try:
+        winner, _ = play_game(env, {"player_0": agent, "player_1": RandomAgent(env, "player_1")}, verbose=False,
+                              time_limit=limit)
+        assert winner == "player_1"
+        assert agent.restarts == 1
+        assert limit.violations[0]["reason"] == "timeout"
+    finally:
+        agent.close()
+
+
+def test_crash_is_isolated():
+    env = make_env("native")
+    env.reset()
+    agent = SandboxedAgent(CrashingAgent, "player_0")
+    try:
+        with pytest.raises(AgentCrashed):
+            play_game(env, {"player_0": agent, "player_1": RandomAgent(env, "player_1")}, verbose=False)
+        assert agent.restarts == 1
+
+        # Each fresh worker plays until its third move, crashes are time limit violations
+        limit = TimeLimit(1000, policy="fallback")
+        winner, moves = play_game(env, {"player_0": agent, "player_1": RandomAgent(env, "player_1")},
+                                  verbose=False, time_limit=limit)
+        assert moves >= 7
+        assert limit.violations and all(violation["reason"] == "crash" for violation in limit.violations)
+        assert agent.restarts == 1 + len(limit.violations)
+    finally:
+        agent.close()
+
+
+def test_close_releases_shared_memory():
+    agent = SandboxedAgent(RandomAgent, "player_0")
+    name = agent._block.name
+    agent.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
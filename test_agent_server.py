@@ -0,0 +1,131 @@
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from agent_server import AgentBatcher, AgentClient, AgentServer
+from random_agent import RandomAgent
+
+
+class FussyAgent(RandomAgent):
+    """Random agent failing on boards without a legal column"""
+
+    def choose_action(self, observation, action_mask=None, **kwargs):
+        if not np.any(action_mask):
+            raise RuntimeError("no legal column")
+        return super().choose_action(observation, action_mask=action_mask)
+
+
+def winning_board():
+    # player to move has three pieces in column 3
+    observation = np.zeros((6, 7, 2), dtype=np.int8)
+    observation[3:, 3, 0] = 1
+    observation[3:, 4, 1] = 1
+    return observation
+
+
+@pytest.fixture
+def server():
+    server = AgentServer(("127.0.0.1", 0), agents=["RandomAgent", "SmartAgentAmeliore", "MinimaxAgent"],
+                         depth_minimax=2, max_wait_ms=20)
+    server.start()
+    yield server
+    server.close()
+
+
+def test_agents_play_legal_and_winning_moves(server):
+    client = AgentClient(*server.server_address[:2])
+    assert client.agents() == ["MinimaxAgent", "RandomAgent", "SmartAgentAmeliore"]
+    mask = np.ones(7, dtype=np.int8)
+    assert client.choose_action("SmartAgentAmeliore", winning_board(), mask) == 3
+    assert client.choose_action("MinimaxAgent", winning_board(), mask) == 3
+    mask[:6] = 0
+    assert client.choose_actions("RandomAgent", np.zeros((5, 6, 7, 2)), np.tile(mask, (5, 1))) == [6] * 5
+    client.close()
+
+
+def test_connection_is_kept_alive(server):
+    client = AgentClient(*server.server_address[:2])
+    client.agents()
+    sock = client._conn.sock
+    for _ in range(5):
+        client.choose_action("RandomAgent", np.zeros((6, 7, 2)), np.ones(7))
+    assert client._conn.sock is sock
+    client.close()
+
+
+def test_concurrent_requests_are_batched(server):
+    actions = []
+
+    def play():
+        client = AgentClient(*server.server_address[:2])
+        for _ in range(10):
+            actions.append(client.choose_action("RandomAgent", np.zeros((6, 7, 2)), np.ones(7)))
+        client.close()
+
+    threads = [threading.Thread(target=play) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(actions) == 80 and all(0 <= action < 7 for action in actions)
+    stats = AgentClient(*server.server_address[:2]).stats()["RandomAgent"]
+    assert stats["moves"] == 80
+    assert stats["mean_batch"] > 1
+    assert stats["latency"]["count"] == 80
+
+
+def test_unknown_agent_is_rejected(server):
+    client = AgentClient(*server.server_address[:2])
+    with pytest.raises(RuntimeError, match="404"):
+        client.choose_action("NoSuchAgent", np.zeros((6, 7, 2)), np.ones(7))
+    client.close()
+
+
+def test_bad_board_only_fails_its_own_request():
+    batcher = AgentBatcher(FussyAgent(), max_wait_ms=50)
+    masks = [np.ones(7)] * 3 + [np.zeros(7)] + [np.ones(7)] * 3
+    futures = [batcher.submit(np.zeros((6, 7, 2)), mask) for mask in masks]
+    with pytest.raises(RuntimeError, match="no legal column"):
+        futures[3].result()
+    assert all(0 <= futures[i].result() < 7 for i in (0, 1, 2, 4, 5, 6))
+    assert batcher.stats()["moves"] == 6
+    with pytest.raises(ValueError):
+        batcher.submit(np.zeros((6, 7)), np.ones(7))
+    batcher.close()
+
+
+def test_errors_keep_the_connection(server):
+    server.batchers["FussyAgent"] = AgentBatcher(FussyAgent())
+    client = AgentClient(*server.server_address[:2])
+    with pytest.raises(RuntimeError, match="400"):
+        client.choose_action("RandomAgent", np.zeros((6, 7)), np.ones(7))
+    sock = client._conn.sock
+    for body in (b"not json", b"[1, 2]"):
+        client._conn.request("POST", "/agents/RandomAgent/move", body)
+        response = client._conn.getresponse()
+        assert response.status == 400 and "bad request" in json.loads(response.read())["error"]
+    with pytest.raises(RuntimeError, match="400"):
+        client.choose_actions("RandomAgent", np.zeros((3, 6, 7, 2)), np.ones((1, 7)))
+    with pytest.raises(RuntimeError, match="500"):
+        client.choose_action("FussyAgent", np.zeros((6, 7, 2)), np.zeros(7))
+    assert client.choose_action("FussyAgent", np.zeros((6, 7, 2)), np.ones(7)) in range(7)
+    assert client._conn.sock is sock
+    client.close()
+
+
+def test_failed_boards_do_not_fail_the_request(server):
+    server.batchers["FussyAgent"] = AgentBatcher(FussyAgent())
+    client = AgentClient(*server.server_address[:2])
+    masks = np.ones((4, 7))
+    masks[2] = 0
+    data = client._request("POST", "/agents/FussyAgent/moves",
+                           {"observations": np.zeros((4, 6, 7, 2)).tolist(), "action_masks": masks.tolist()})
+    assert all(action in range(7) for index, action in enumerate(data["actions"]) if index != 2)
+    assert data["actions"][2] is None
+    assert list(data["errors"]) == ["2"] and "no legal column" in data["errors"]["2"]
+    with pytest.raises(RuntimeError, match="failed"):
+        client.choose_actions("FussyAgent", np.zeros((4, 6, 7, 2)), masks)
+    client.close()
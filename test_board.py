@@ -0,0 +1,82 @@
+import random
+
+import numpy as np
+
+from agent_minimax import MinimaxAgent
+from benchmark_board import random_positions
+from board import WINDOWS, Position, as_position, has_four
+from reference_agents import (ReferenceMinimaxAgent, ReferenceSmartAgent, ReferenceSmartAgentAmeliore,
+                              reference_completes_four, reference_evaluate, reference_next_row, reference_wins)
+from smart_agent import SmartAgent
+from smart_agent_ameliore import SmartAgentAmeliore
+
+
+def test_observation_round_trip():
+    for observation, _ in random_positions(200, seed=1):
+        position = Position.from_observation(observation)
+        assert np.array_equal(position.to_observation(), observation)
+        assert as_position(position) is position
+        # Nested lists are accepted too
+        assert Position.from_observation(observation.tolist()).masks == position.masks
+
+
+def test_play_and_undo():
+    position = Position()
+    rng = random.Random(0)
+    history = []
+    for ply in range(30):
+        history.append((list(position.masks), list(position.heights)))
+        col = rng.choice(position.valid_columns())
+        row = position.play(col, ply % 2)
+        assert position.has(row, col, ply % 2)
+    for masks, heights in reversed(history):
+        position.undo()
+        assert position.masks == masks and position.heights == heights
+    assert position.moves == []
+
+
+def test_full_columns():
+    position = Position()
+    for _ in range(6):
+        position.play(3, 0)
+    assert position.next_row(3) is None
+    assert 3 not in position.valid_columns()
+    assert Position(position.masks).heights == position.heights
+    # Simulating a move in a full column leaves the board unchanged
+    simulated = MinimaxAgent()._simulate_move(position, 3, 0)
+    assert simulated.masks == position.masks and simulated.heights == position.heights
+
+
+def test_matches_array_helpers():
+    agent = MinimaxAgent()
+    for observation, _ in random_positions(300, seed=2):
+        position = Position.from_observation(observation)
+        for channel in (0, 1):
+            assert position.wins(channel) == reference_wins(observation, channel)
+        assert agent._evaluate(position) == reference_evaluate(observation)
+        for col in range(7):
+            row = reference_next_row(observation, col)
+            assert position.next_row(col) == row
+            if row is not None:
+                for channel in (0, 1):
+                    assert position.completes_four(row, col, channel) == \
+                        reference_completes_four(observation, row, col, channel)
+
+
+def test_agents_match_reference():
+    # The array agents of reference_agents.py choose the same moves
+    agents = [(SmartAgent(), ReferenceSmartAgent()), (SmartAgentAmeliore(), ReferenceSmartAgentAmeliore()),
+              (MinimaxAgent(depth=2), ReferenceMinimaxAgent(depth=2))]
+    for agent, reference in agents:
+        for index, (observation, mask) in enumerate(random_positions(40, seed=3)):
+            random.seed(index)
+            expected = reference.choose_action(observation, action_mask=mask)
+            random.seed(index)
+            assert agent.choose_action(observation, action_mask=mask) == expected
+
+
+def test_windows():
+    assert len(WINDOWS) == 69
+    assert all(bin(window).count("1") == 4 and has_four(window) for window in WINDOWS)
+    # Three on top of column 0 and the bottom of column 1 do not wrap into a line
+    assert not has_four(0b111 << 3 | 1 << 7)
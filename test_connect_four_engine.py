@@ -0,0 +1,82 @@
+import random
+
+import pytest
+from pettingzoo.classic import connect_four_v3
+
+from connect_four_engine import ConnectFourEngine
+from random_agent import RandomAgent
+from smart_agent_ameliore import SmartAgentAmeliore
+from test_tournament import play_multiple_games
+
+
+def snapshot(env):
+    """Everything an agent or a tournament can observe after a step"""
+    observation, reward, terminated, truncated, info = env.last()
+    return (
+        env.agent_selection,
+        list(env.agents),
+        observation["observation"].tolist(),
+        observation["action_mask"].tolist(),
+        reward,
+        terminated,
+        truncated,
+        dict(env.rewards),
+    )
+
+
+def play_both(moves):
+    reference = connect_four_v3.env()
+    engine = ConnectFourEngine()
+    reference.reset(seed=42)
+    engine.reset(seed=42)
+    assert snapshot(reference) == snapshot(engine)
+    for move in moves:
+        if not reference.agents:
+            break
+        action = None if reference.terminations[reference.agent_selection] or \
+            reference.truncations[reference.agent_selection] else move
+        reference.step(action)
+        engine.step(action)
+        assert reference.agents == engine.agents
+        if reference.agents:
+            assert snapshot(reference) == snapshot(engine)
+
+
+def test_vertical_win_and_dead_steps():
+    play_both([0, 1, 0, 1, 0, 1, 0, 0, 0, 0])
+
+
+def test_illegal_move_terminates_game():
+    # column 0 is full after six moves, the seventh piece is illegal
+    play_both([0, 0, 0, 0, 0, 0, 0, 0, 0])
+
+
+def test_random_games_match_pettingzoo():
+    rnd = random.Random(1)
+    for _ in range(50):
+        play_both([rnd.randrange(7) for _ in range(60)])
+
+
+def test_out_of_range_action_is_rejected():
+    engine = ConnectFourEngine()
+    engine.reset()
+    with pytest.raises(AssertionError):
+        engine.step(7)
+
+
+def test_observation_buffers_are_reused():
+    engine = ConnectFourEngine()
+    engine.reset()
+    first = engine.last()[0]["observation"]
+    engine.step(3)
+    engine.step(3)
+    assert engine.last()[0]["observation"] is first
+    assert first[5, 3, 0] == 1 and first[4, 3, 1] == 1
+
+
+def test_tournament_results_match_pettingzoo():
+    reference = play_multiple_games(RandomAgent, SmartAgentAmeliore, num_games=20, render_mode=None,
+                                    base_seed=9)
+    native = play_multiple_games(RandomAgent, SmartAgentAmeliore, num_games=20, render_mode=None,
+                                 base_seed=9, engine="native")
+    assert native == reference
@@ -0,0 +1,98 @@
+import numpy as np
+from decision_cache import CachedAgent, DecisionCache, position_key
+from random_agent import RandomAgent
+from smart_agent_ameliore import SmartAgentAmeliore
+from test_tournament import play_multiple_games
+
+
+class DummyEnv:
+    def __init__(self):
+        self.agents = ["player_0"]
+    def action_space(self, agent):
+        return None
+
+
+class CountingAgent:
+    """Deterministic agent that counts how often it is asked to play"""
+    def __init__(self, random_fallback=False):
+        self.calls = 0
+        self.last_action_random = random_fallback
+    def choose_action(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
+        self.calls += 1
+        return 3
+
+
+def test_position_key_is_compact():
+    board = np.zeros((6,7,2), dtype=np.float32)
+    key = position_key(board, np.ones(7, dtype=np.int8))
+
+    print("\nTEST position_key ", key)
+    assert len(key) == 12
+
+    board[5,3,0] = 1
+    assert position_key(board, np.ones(7, dtype=np.int8)) != key
+    assert position_key(np.zeros((6,7,2)), np.array([1,1,1,0,1,1,1])) != key
+
+
+def test_cache_hits_and_lru_eviction():
+    cache = DecisionCache(maxsize=2)
+    cache.put(b"a", 1)
+    cache.put(b"b", 2)
+    assert cache.get(b"a") == 1  # "a" becomes most recent
+    cache.put(b"c", 0)           # evicts "b"
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"c") == 0
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+    assert len(cache) == 2
+
+
+def test_cached_agent_reuses_decisions():
+    agent = CountingAgent()
+    cached = CachedAgent(agent)
+    board = np.zeros((6,7,2))
+    mask = np.ones(7, dtype=np.int8)
+
+    for _ in range(5):
+        assert cached.choose_action(board, action_mask=mask) == 3
+
+    print("\nTEST cached agent ", cached.cache.stats())
+    assert agent.calls == 1
+    assert cached.cache.hits == 4
+
+
+def test_cached_agent_bypasses_random_fallback():
+    agent = CountingAgent(random_fallback=True)
+    cached = CachedAgent(agent)
+    board = np.zeros((6,7,2))
+
+    for _ in range(3):
+        cached.choose_action(board, action_mask=np.ones(7, dtype=np.int8))
+
+    assert agent.calls == 3
+    assert cached.cache.bypasses == 3
+    assert len(cached.cache) == 0
+
+
+def test_cached_smart_agent_ameliore_matches_agent():
+    agent = SmartAgentAmeliore(DummyEnv())
+    cached = CachedAgent(SmartAgentAmeliore(DummyEnv()))
+    board = np.zeros((6,7,2), dtype=np.float32)
+    board[5,0,1] = 1
+    board[5,1,1] = 1
+    board[5,2,1] = 1
+    mask = np.ones(7, dtype=np.int8)
+
+    expected = agent.choose_action(board, action_mask=mask)
+    assert cached.choose_action(board, action_mask=mask) == expected
+    assert cached.choose_action(board, action_mask=mask) == expected
+    assert cached.cache.hits == 1
+    assert cached.player_name == "SmartAgentAmeliore"
+    assert cached.label == "SmartAgentAmeliore"
+
+
+def test_cached_agents_keep_their_latency_apart():
+    results = play_multiple_games(SmartAgentAmeliore, RandomAgent, num_games=4, render_mode=None, cache_size=1000,
+                                  base_seed=0, engine="native", latency=True)
+    assert set(results["latency"]) == {"SmartAgentAmeliore", "RandomAgent"}
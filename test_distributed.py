@@ -0,0 +1,85 @@
+import multiprocessing
+import os
+import socket
+
+import pytest
+
+from distributed import (AUTHKEY, _WorkerManager, is_loopback, make_batches, play_distributed, start_coordinator,
+                         run_worker)
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from test_tournament import play_multiple_games
+
+
+def crashing_worker(address):
+    """Takes one batch and dies without returning it"""
+    manager = _WorkerManager(address=address, authkey=AUTHKEY)
+    manager.connect()
+    manager.broker().get_batch("crashing")
+    os._exit(1)
+
+
+class BrokenAgent(RandomAgent):
+    """Agent that cannot be built, like a worker with a missing dependency"""
+
+    def __init__(self, env=None, player_name=None):
+        raise ImportError("missing dependency")
+
+
+def test_distributed_matches_serial():
+    expected = play_multiple_games(RandomAgent, SmartAgent, num_games=40, render_mode=None, base_seed=3,
+                                   engine="native")
+    results = play_distributed(RandomAgent, SmartAgent, num_games=40, base_seed=3, batch_size=7, local_workers=3)
+    distributed = results.pop("distributed")
+    assert results == expected
+    assert distributed["done"] == distributed["total"] == 6
+    assert distributed["workers"] == 3
+
+
+def test_lost_batches_are_requeued():
+    batches = make_batches(RandomAgent, SmartAgent, 30, base_seed=5, batch_size=10)
+    broker, coordinator = start_coordinator(batches, lease_timeout=0.5)
+    address = coordinator.address
+
+    crashed = multiprocessing.Process(target=crashing_worker, args=(address,))
+    crashed.start()
+    crashed.join()
+    assert broker.progress()["done"] == 0
+
+    assert run_worker(address, heartbeat_interval=0.1) == 3
+    assert broker.done()
+    assert broker.requeued == 1
+
+    stats = [broker.results()[batch_id] for batch_id in range(3)]
+    expected = play_multiple_games(RandomAgent, SmartAgent, num_games=30, render_mode=None, base_seed=5,
+                                   engine="native")
+    assert sum(batch.games for batch in stats) == 30
+    assert sum(batch.player_1 for batch in stats) == expected["player_1"]
+    coordinator.close()
+
+
+def test_duplicate_results_are_ignored():
+    batches = make_batches(RandomAgent, SmartAgent, 5, batch_size=5)
+    broker, coordinator = start_coordinator(batches)
+    batch = broker.get_batch("a")
+    broker.submit("a", batch["batch_id"], "first")
+    broker.submit("b", batch["batch_id"], "second")
+    assert broker.results() == {0: "first"}
+    assert broker.get_batch("a") is None
+    coordinator.close()
+
+
+def test_coordinator_closes_its_socket():
+    broker, coordinator = start_coordinator(make_batches(RandomAgent, SmartAgent, 5, batch_size=5))
+    manager = _WorkerManager(address=coordinator.address, authkey=AUTHKEY)
+    manager.connect()
+    assert manager.broker().progress()["total"] == 1
+    coordinator.close()
+    with pytest.raises(ConnectionRefusedError):
+        socket.create_connection(coordinator.address, timeout=1)
+    assert is_loopback("127.0.0.1") and is_loopback("localhost") and not is_loopback("0.0.0.0")
+
+
+def test_dead_local_workers_fail_the_run():
+    with pytest.raises(RuntimeError, match="all local workers exited"):
+        play_distributed(BrokenAgent, SmartAgent, num_games=10, batch_size=5, local_workers=2, lease_timeout=0.5)
@@ -0,0 +1,66 @@
+from board import Position
+from connect_four_engine import ConnectFourEngine
+from fuzz_engines import PositionEngine, first_divergence, fuzz_games, make_reference, run_fuzz
+
+
+class NoVerticalWinEngine(ConnectFourEngine):
+    """Engine with a planted bug: vertical lines do not win"""
+
+    def _is_win(self, row, col, piece):
+        grid = self._grid
+        if row <= 2 and all(grid[row + k][col] == piece for k in range(4)):
+            return False
+        return super()._is_win(row, col, piece)
+
+
+def test_native_engine_has_no_divergence():
+    report = run_fuzz(num_games=250, workers=1, seed=3, chunk_size=100)
+    print("\nTEST fuzz native", report["strategies"])
+    assert report["games"] == 250
+    assert sum(report["strategies"].values()) == 250
+    assert report["divergences"] == []
+
+
+class TopRowFullPosition(Position):
+    """Position with a planted bug: a column with five pieces is full"""
+
+    def valid_columns(self):
+        return [col for col in super().valid_columns() if self.heights[col] < 5]
+
+
+class TopRowFullEngine(PositionEngine):
+    def reset(self, seed=None, options=None):
+        super().reset(seed, options)
+        self.position = TopRowFullPosition()
+
+
+def test_position_board_has_no_divergence():
+    report = run_fuzz(num_games=250, workers=1, candidate="position", seed=3, chunk_size=100)
+    print("\nTEST fuzz position", report["strategies"])
+    assert report["games"] == 250
+    assert report["divergences"] == []
+
+
+def test_position_bug_is_found():
+    report = fuzz_games(TopRowFullEngine, seed=0, num_games=100)
+    assert report["divergences"]
+    shortest = min((d["moves"] for d in report["divergences"]), key=len)
+    # Five alternating pieces in one column, then the masks differ
+    assert len(shortest) == 5
+    assert len(set(shortest)) == 1
+
+
+def test_planted_bug_is_found_and_shrunk():
+    report = fuzz_games(NoVerticalWinEngine, seed=0, num_games=100)
+    assert report["divergences"]
+    shortest = min((d["moves"] for d in report["divergences"]), key=len)
+    print("\nTEST shrunk sequence", shortest)
+    # A vertical win needs 7 moves, the shrunk sequence can be no shorter
+    assert len(shortest) == 7
+    assert first_divergence(shortest, make_reference(), NoVerticalWinEngine()) == 6
+
+
+def test_parallel_fuzz_merges_reports():
+    report = run_fuzz(num_games=100, workers=2, seed=5, chunk_size=25)
+    assert report["games"] == 100
+    assert report["divergences"] == []
@@ -0,0 +1,105 @@
+import random
+
+import numpy as np
+import pytest
+
+from connect_four_engine import ConnectFourEngine
+from game_archive import ArchiveWriter, GameArchive, pack_moves, recover_archive, unpack_moves
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from test_tournament import play_multiple_games
+
+
+def test_pack_moves_round_trip():
+    rnd = random.Random(0)
+    for length in (0, 1, 7, 8, 42):
+        moves = [rnd.randrange(7) for _ in range(length)]
+        data = pack_moves(moves)
+        assert len(data) == (3 * length + 7) // 8
+        assert unpack_moves(data, length) == moves
+
+
+def test_write_read_and_append(tmp_path):
+    path = str(tmp_path / "games.c4a")
+    with ArchiveWriter(path) as writer:
+        writer.add_game("RandomAgent", "SmartAgent", 12, "player_1", [3, 3, 4])
+        writer.add_game("SmartAgent", "RandomAgent", 2**40, None, [0] * 6)
+    with ArchiveWriter(path, append=True) as writer:
+        assert len(writer) == 2
+        writer.add_game("MinimaxAgent", "SmartAgent", 7, "player_0", [6, 5])
+
+    with GameArchive(path) as archive:
+        assert len(archive) == 3
+        assert archive.game(0) == {"agent_0": "RandomAgent", "agent_1": "SmartAgent", "seed": 12,
+                                   "winner": "player_1", "length": 3, "moves": [3, 3, 4]}
+        assert archive.header(1)["seed"] == 2**40 and archive.header(1)["winner"] is None
+        assert archive.game(2)["agent_0"] == "MinimaxAgent"
+        assert archive.agent_names == ["RandomAgent", "SmartAgent", "MinimaxAgent"]
+        with pytest.raises(IndexError):
+            archive.board(0, 4)
+
+
+def test_positions_match_engine(tmp_path):
+    path = str(tmp_path / "games.c4a")
+    rnd = random.Random(3)
+    games = []
+    with ArchiveWriter(path) as writer:
+        for seed in range(20):
+            engine = ConnectFourEngine()
+            engine.reset()
+            moves = []
+            while not engine.terminations[engine.agent_selection]:
+                mask = engine.observe(engine.agent_selection)["action_mask"]
+                moves.append(rnd.choice(np.flatnonzero(mask).tolist()))
+                engine.step(moves[-1])
+            games.append(moves)
+            writer.add_game("RandomAgent", "RandomAgent", seed, None, moves)
+
+    with GameArchive(path) as archive:
+        for i, moves in enumerate(games):
+            engine = ConnectFourEngine()
+            engine.reset()
+            for ply, col in enumerate(moves):
+                engine.step(col)
+                board = archive.board(i, ply + 1)
+                observation = engine.observe("player_0")["observation"]
+                assert np.array_equal(board == 1, observation[..., 0] == 1)
+                assert np.array_equal(board == 2, observation[..., 1] == 1)
+
+
+def test_tournament_writes_archive(tmp_path):
+    path = str(tmp_path / "games.c4a")
+    with ArchiveWriter(path) as writer:
+        results = play_multiple_games(RandomAgent, SmartAgent, num_games=8, render_mode=None, base_seed=1,
+                                      engine="native", archive=writer)
+    with GameArchive(path) as archive:
+        assert len(archive) == 8
+        games = list(archive)
+    assert sum(game["winner"] == "player_1" for game in games) == results["player_1"]
+    assert sum(game["length"] for game in games) / 8 == results["mean_moves"]
+
+
+def test_interrupted_writer_is_recovered(tmp_path):
+    path = tmp_path / "games.c4a"
+    writer = ArchiveWriter(str(path))
+    for seed in range(10):
+        writer.add_game(f"Agent{seed % 3}", "SmartAgent", seed, "player_0", [seed % 7] * 7)
+    # Crash in the middle of the last record: no index, no footer
+    writer._file.flush()
+    data = path.read_bytes()[:-2]
+    writer._file.close()
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        GameArchive(str(path))
+
+    assert recover_archive(str(path)) == 9
+    with GameArchive(str(path)) as archive:
+        assert [game["seed"] for game in archive] == list(range(9))
+        assert archive.game(4) == {"agent_0": "Agent1", "agent_1": "SmartAgent", "seed": 4,
+                                   "winner": "player_0", "length": 7, "moves": [4] * 7}
+    # Closed archives are left as they are
+    assert recover_archive(str(path)) == 9
+    with ArchiveWriter(str(path), append=True) as writer:
+        writer.add_game("Agent0", "Agent1", 9, None, [])
+    with GameArchive(str(path)) as archive:
+        assert len(archive) == 10 and archive.header(9)["agent_1"] == "Agent1"
@@ -0,0 +1,110 @@
+import importlib
+import sys
+
+from agent_minimax import MinimaxAgent
+from game_cache import GameCache, code_hash, game_key, source_files
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from test_tournament import play_multiple_games
+
+AGENT_SOURCE = '''
+from smart_agent import SmartAgent
+
+
+class EditedAgent(SmartAgent):
+    pass
+'''
+
+
+def load_edited_agent(tmp_path):
+    (tmp_path / "edited_agent.py").write_text(AGENT_SOURCE)
+    sys.path.insert(0, str(tmp_path))
+    try:
+        return importlib.import_module("edited_agent").EditedAgent
+    finally:
+        sys.path.remove(str(tmp_path))
+
+
+def test_code_hash_follows_source_and_bases(tmp_path):
+    agent_class = load_edited_agent(tmp_path)
+    before = code_hash(agent_class)
+    assert before != code_hash(SmartAgent)
+    assert code_hash(agent_class) == before
+    (tmp_path / "edited_agent.py").write_text(AGENT_SOURCE + "\n# tuned\n")
+    assert code_hash(agent_class) != before
+    sys.modules.pop("edited_agent")
+
+
+def test_code_hash_follows_project_imports(tmp_path):
+    files = [path.rsplit("/", 1)[-1] for path in source_files(SmartAgent)]
+    assert {"smart_agent.py", "board.py", "action_space.py"} <= set(files)
+    assert not any("numpy" in path for path in source_files(MinimaxAgent))
+
+    # An agent whose logic lives in a helper module of its directory
+    (tmp_path / "helper_rules.py").write_text("def pick(valid):\n    return valid[0]\n")
+    (tmp_path / "helper_agent.py").write_text("from helper_rules import pick\n\n\nclass HelperAgent:\n    pass\n")
+    sys.path.insert(0, str(tmp_path))
+    try:
+        agent_class = importlib.import_module("helper_agent").HelperAgent
+    finally:
+        sys.path.remove(str(tmp_path))
+    key = game_key([(agent_class, {}), (RandomAgent, {})], "native", 1, 1)
+    (tmp_path / "helper_rules.py").write_text("def pick(valid):\n    return valid[-1]\n")
+    assert game_key([(agent_class, {}), (RandomAgent, {})], "native", 1, 1) != key
+    sys.modules.pop("helper_agent")
+    sys.modules.pop("helper_rules")
+
+
+def test_seeded_games_are_replayed():
+    cache = GameCache(":memory:")
+    first = play_multiple_games(MinimaxAgent, SmartAgent, num_games=3, render_mode=None, base_seed=5,
+                                engine="native", game_cache=cache)
+    second = play_multiple_games(MinimaxAgent, SmartAgent, num_games=3, render_mode=None, base_seed=5,
+                                 engine="native", game_cache=cache)
+    assert first.pop("game_cache") == {"replayed": 0, "played": 3}
+    assert second.pop("game_cache") == {"replayed": 3, "played": 0}
+    assert first == second
+    # Another depth is another configuration
+    third = play_multiple_games(MinimaxAgent, SmartAgent, num_games=1, render_mode=None, base_seed=5,
+                                engine="native", depth_minimax=2, game_cache=cache)
+    assert third["game_cache"]["played"] == 1
+
+
+def test_deterministic_unseeded_games_are_replayed():
+    cache = GameCache(":memory:")
+    cached = play_multiple_games(MinimaxAgent, SmartAgent, num_games=4, render_mode=None, engine="native",
+                                 game_cache=cache)
+    plain = play_multiple_games(MinimaxAgent, SmartAgent, num_games=4, render_mode=None, engine="native")
+    assert cached.pop("game_cache") == {"replayed": 3, "played": 1}
+    assert cached == plain
+
+
+def test_random_unseeded_games_are_not_cached():
+    cache = GameCache(":memory:")
+    results = play_multiple_games(RandomAgent, SmartAgent, num_games=3, render_mode=None, engine="native",
+                                  game_cache=cache)
+    assert results["game_cache"]["replayed"] == 0
+    assert len(cache) == 0
+
+
+def test_cache_persists_and_is_invalidated_by_code_changes(tmp_path):
+    agent_class = load_edited_agent(tmp_path)
+    path = str(tmp_path / "cache.sqlite")
+    key = game_key([(agent_class, {}), (RandomAgent, {})], "native", 1, 1)
+
+    cache = GameCache(path)
+    play_multiple_games(agent_class, RandomAgent, num_games=2, render_mode=None, base_seed=1, engine="native",
+                        game_cache=cache)
+    cache.close()
+
+    cache = GameCache(path)
+    results = play_multiple_games(agent_class, RandomAgent, num_games=2, render_mode=None, base_seed=1,
+                                  engine="native", game_cache=cache)
+    assert results["game_cache"]["replayed"] == 2
+
+    (tmp_path / "edited_agent.py").write_text(AGENT_SOURCE + "\n# tuned\n")
+    assert game_key([(agent_class, {}), (RandomAgent, {})], "native", 1, 1) != key
+    results = play_multiple_games(agent_class, RandomAgent, num_games=2, render_mode=None, base_seed=1,
+                                  engine="native", game_cache=cache)
+    assert results["game_cache"]["played"] == 2
+    sys.modules.pop("edited_agent")
@@ -0,0 +1,69 @@
+import json
+
+from game_log import GameLog, read_game_log
+from agent_minimax import MinimaxAgent
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from test_tournament import play_logged_games, play_multiple_games
+
+
+def test_records_are_batched(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    log = GameLog(path, flush_every=3, flush_interval=3600)
+    log.write({"game_id": 0})
+    log.write({"game_id": 1})
+    assert list(read_game_log(path)) == []
+    log.write({"game_id": 2})
+    assert [record["game_id"] for record in read_game_log(path)] == [0, 1, 2]
+    log.write({"game_id": 3})
+    log.close()
+    assert len(list(read_game_log(path))) == 4
+
+
+def test_partial_line_is_repaired(tmp_path):
+    path = tmp_path / "games.jsonl"
+    path.write_text('{"game_id":0}\n{"game_id":1}\n{"game_i')
+    assert [record["game_id"] for record in read_game_log(str(path))] == [0, 1]
+    with GameLog(str(path)) as log:
+        log.write({"game_id": 2})
+    assert [record["game_id"] for record in read_game_log(str(path))] == [0, 1, 2]
+
+
+def test_logged_games_record_moves_and_timings(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    results = play_logged_games(RandomAgent, SmartAgent, 5, path)
+    records = list(read_game_log(path))
+    assert results["played"] == 5 and results["resumed"] == 0
+    assert [record["game_id"] for record in records] == list(range(5))
+    for record in records:
+        assert record["pairing"] == "RandomAgent-SmartAgent"
+        assert len(record["moves"]) == len(record["times_ns"]) == record["num_moves"]
+        assert all(elapsed > 0 for elapsed in record["times_ns"])
+
+
+def test_interrupted_tournament_resumes(tmp_path):
+    path = tmp_path / "games.jsonl"
+    play_logged_games(RandomAgent, SmartAgent, 12, str(path))
+    expected = play_multiple_games(RandomAgent, SmartAgent, num_games=12, render_mode=None, base_seed=42,
+                                   engine="native")
+
+    # Crash after seven games, in the middle of writing the eighth
+    lines = path.read_text().splitlines(keepends=True)
+    path.write_text("".join(lines[:7]) + lines[7][:20])
+
+    results = play_logged_games(RandomAgent, SmartAgent, 12, str(path))
+    assert results["resumed"] == 7 and results["played"] == 5
+    del results["played"], results["resumed"]
+    assert results == expected
+    assert [json.loads(line)["game_id"] for line in path.read_text().splitlines()] == list(range(12))
+
+
+def test_other_settings_are_not_resumed(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    play_logged_games(MinimaxAgent, RandomAgent, 3, path, depth_minimax=1)
+    results = play_logged_games(MinimaxAgent, RandomAgent, 3, path, depth_minimax=2)
+    assert results["resumed"] == 0 and results["played"] == 3
+    results = play_logged_games(MinimaxAgent, RandomAgent, 3, path, depth_minimax=2, engine="pettingzoo")
+    assert results["resumed"] == 0
+    assert results["player_0"] + results["player_1"] + results["draw"] == 3
+    assert play_logged_games(MinimaxAgent, RandomAgent, 3, path, depth_minimax=1)["resumed"] == 3
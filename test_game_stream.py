@@ -0,0 +1,88 @@
+import time
+from itertools import islice
+
+import numpy as np
+import pytest
+
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from test_tournament import GameStream, make_agents, make_env, play_multiple_games, stream_games, stream_plies, \
+    summarize_games
+from time_limit import TimeLimit
+
+
+class LateAgent(RandomAgent):
+    """Random agent recording its games, late from its second move on"""
+
+    def __init__(self, env=None, player_name=None):
+        super().__init__(env, player_name)
+        self.games = []
+        self.moves = 0
+
+    def start_game(self, game_id):
+        self.games.append(game_id)
+
+    def choose_action(self, **kwargs):
+        self.moves += 1
+        if self.moves > 1:
+            time.sleep(0.05)
+        return super().choose_action(**kwargs)
+
+
+def test_streamed_games_match_tournament():
+    games = []
+    for game in stream_games(RandomAgent, SmartAgent, num_games=12, base_seed=4):
+        plies = [record.ply for record in game]
+        assert plies == list(range(game.move_count))
+        games.append((game.winner, game.move_count))
+    expected = play_multiple_games(RandomAgent, SmartAgent, num_games=12, render_mode=None, base_seed=4,
+                                   engine="native")
+    assert summarize_games(games) == expected
+
+
+def test_records_are_readonly_reused_views():
+    game = next(stream_games(RandomAgent, SmartAgent, num_games=1, base_seed=1))
+    records = list(game)
+    first, third = records[0], records[2]
+    assert first.player == third.player == "player_0"
+    assert first.board is third.board
+    assert np.shares_memory(first.board, game.env.observe("player_0")["observation"])
+    with pytest.raises(ValueError):
+        first.board[0, 0, 0] = 1
+    assert all(record.think_ns > 0 for record in records)
+
+
+def test_pettingzoo_records_match_native():
+    native = [(record.board.copy(), record.mask.copy(), record.action)
+              for record in stream_plies(RandomAgent, SmartAgent, num_games=3, base_seed=2)]
+    reference = [(record.board.copy(), record.mask.copy(), record.action)
+                 for record in stream_plies(RandomAgent, SmartAgent, num_games=3, base_seed=2, engine="pettingzoo")]
+    assert len(native) == len(reference)
+    for (board, mask, action), (board_ref, mask_ref, action_ref) in zip(native, reference):
+        assert np.array_equal(board, board_ref) and np.array_equal(mask, mask_ref) and action == action_ref
+
+
+def test_abandoned_games_are_finished_and_stream_is_lazy():
+    results = []
+    for game in islice(stream_games(RandomAgent, SmartAgent, num_games=None, base_seed=4), 12):
+        next(iter(game))
+        results.append(game)
+    # Only the games that were looked at were played, each of them to the end
+    assert results[-1].move_count is None
+    assert all(game.move_count for game in results[:-1])
+    expected = [game.finish() for game in stream_games(RandomAgent, SmartAgent, num_games=11, base_seed=4)]
+    assert [(game.winner, game.move_count) for game in results[:-1]] == expected
+
+
+def test_stream_behaves_like_play_game():
+    env = make_env("native")
+    env.reset()
+    agents = make_agents(env, LateAgent, SmartAgent)
+    limit = TimeLimit(20, policy="forfeit")
+    history = []
+    game = GameStream(env, agents, game_id=7, seed=1, agent_seed=1, time_limit=limit, history=history)
+    records = list(game)
+    assert agents["player_0"].games == [7]
+    # The late move forfeits the game: no record, and the opponent wins
+    assert game.winner == "player_1" and game.move_count == 2 == len(records) == len(history)
+    assert limit.violations[0]["player"] == "player_0" and limit.violations[0]["ply"] == 2
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from latency import LatencyHistogram, LatencyRecorder, bucket_value, game_phase, latency_bucket
+
+
+def test_buckets_are_within_five_percent():
+    for time_ns in (1, 7, 1000, 123456, 10**9):
+        assert bucket_value(latency_bucket(time_ns)) == pytest.approx(time_ns, rel=0.05)
+
+
+def test_percentiles_match_exact_values():
+    rnd = random.Random(0)
+    times = [int(rnd.lognormvariate(11, 1)) for _ in range(10000)]
+    histogram = LatencyHistogram()
+    for time_ns in times:
+        histogram.add(time_ns)
+    times.sort()
+    for percentile in (50, 95, 99):
+        exact = times[int(percentile / 100 * len(times)) - 1]
+        assert histogram.percentile(percentile) == pytest.approx(exact, rel=0.06)
+    assert histogram.summary()["max"] == times[-1]
+    assert histogram.percentile(100) <= times[-1]
+
+
+def test_merge_equals_single_histogram():
+    first, second, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i, time_ns in enumerate(range(1000, 50000, 97)):
+        (first if i % 2 else second).add(time_ns)
+        both.add(time_ns)
+    first.merge(second)
+    merged, single = first.summary(), both.summary()
+    assert merged.pop("mean") == pytest.approx(single.pop("mean"))
+    assert merged.pop("std") == pytest.approx(single.pop("std"))
+    assert merged == single
+
+
+def test_recorder_per_agent_and_phase():
+    recorder = LatencyRecorder()
+    for ply in range(30):
+        recorder.add("SmartAgent" if ply % 2 else "RandomAgent", ply, 1000 * (ply + 1))
+    summary = recorder.summary()
+    assert set(summary["SmartAgent"]) == {"all", "opening", "middlegame", "endgame"}
+    assert summary["RandomAgent"]["all"]["count"] == 15
+    assert summary["RandomAgent"]["opening"]["count"] == 5
+    assert game_phase(9) == "opening" and game_phase(10) == "middlegame" and game_phase(41) == "endgame"
+    assert "middlegame" in recorder.report()
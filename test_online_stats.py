@@ -0,0 +1,70 @@
+import random
+import statistics
+from itertools import permutations
+
+import pytest
+
+from online_stats import CountHistogram, MatchStats, RunningStats
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from test_tournament import play_multiple_games
+
+
+def test_running_stats_match_statistics_module():
+    rnd = random.Random(0)
+    values = [rnd.gauss(1e6, 300) for _ in range(5000)]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.mean == pytest.approx(statistics.fmean(values))
+    assert stats.variance == pytest.approx(statistics.variance(values))
+    assert (stats.min, stats.max) == (min(values), max(values))
+
+
+def test_running_stats_merge():
+    rnd = random.Random(1)
+    values = [rnd.expovariate(1e-4) for _ in range(3000)]
+    shards = [RunningStats() for _ in range(4)]
+    for i, value in enumerate(values):
+        shards[i % 4].add(value)
+    merged = RunningStats()
+    for shard in shards:
+        merged.merge(shard)
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(statistics.fmean(values))
+    assert merged.std == pytest.approx(statistics.stdev(values))
+    assert merged.max == max(values)
+
+
+def test_count_histogram_quantiles_are_exact():
+    lengths = [7, 8, 8, 12, 20, 20, 20, 33, 42]
+    histogram = CountHistogram()
+    for length in lengths:
+        histogram.add(length)
+    assert histogram.quantile(0.5) == statistics.median_low(lengths)
+    assert histogram.quantile(1.0) == 42 and histogram.quantile(0.0) == 7
+    assert histogram.mean == pytest.approx(statistics.fmean(lengths))
+    assert histogram.std == pytest.approx(statistics.stdev(lengths))
+
+
+def test_match_stats_merge_is_order_independent():
+    rnd = random.Random(2)
+    games = [(rnd.choice(["player_0", "player_1", None]), rnd.randrange(7, 43)) for _ in range(500)]
+    whole = MatchStats()
+    shards = [MatchStats() for _ in range(3)]
+    for i, (winner, moves) in enumerate(games):
+        whole.add(winner, moves)
+        shards[i % 3].add(winner, moves)
+    for order in permutations(shards):
+        merged = MatchStats()
+        for shard in order:
+            merged.merge(shard)
+        assert merged.results() == whole.results()
+    assert "500 games" in merged.progress()
+
+
+def test_progress_is_reported_live(capsys):
+    play_multiple_games(RandomAgent, SmartAgent, num_games=6, render_mode=None, base_seed=1, engine="native",
+                        progress_every=2)
+    lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith("[RandomAgent vs")]
+    assert [line.split("] ")[1].split(" games")[0] for line in lines] == ["2", "4", "6"]
@@ -0,0 +1,55 @@
+import pytest
+
+from openings import generate_openings, legal_opening, load_openings, mirror, rollout_score, save_openings
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from test_tournament import make_agents, make_env, play_game, play_paired_openings
+
+
+def test_legal_opening():
+    assert legal_opening((3, 3, 4))
+    assert not legal_opening((0,) * 7)
+    assert not legal_opening((7,))
+    assert mirror((0, 3, 5)) == (6, 3, 1)
+
+
+def test_suite_merges_mirror_images():
+    suite = generate_openings(plies=2, balance=None)
+    # 49 openings, only (3, 3) is its own mirror: (49 - 1) / 2 + 1
+    assert len(suite) == 25
+    assert all(mirror(moves) not in suite or mirror(moves) == moves for moves in suite)
+
+
+def test_balance_filter():
+    assert rollout_score((3, 0, 3, 0, 3), rollouts=50) > 0.8
+    suite = generate_openings(plies=3, balance=0.1, rollouts=50)
+    print("\nTEST balanced 3-ply openings", len(suite))
+    assert 0 < len(suite) < 4 * 7 * 7
+
+
+def test_save_and_load(tmp_path):
+    path = tmp_path / "openings.txt"
+    suite = [(3, 3), (2, 4, 4)]
+    save_openings(path, suite)
+    assert load_openings(path) == suite
+    path.write_text("# suite\n3 3\n0 0 0 0 0 0 0\n")
+    with pytest.raises(ValueError):
+        load_openings(path)
+
+
+def test_opening_is_played_before_agents():
+    env = make_env("native")
+    env.reset()
+    agents = make_agents(env, RandomAgent, RandomAgent)
+    winner, moves = play_game(env, agents, seed=1, agent_seed=1, verbose=False, opening=(3, 3, 3))
+    assert moves >= 7
+
+
+def test_paired_openings_report():
+    suite = [(3, 3), (0, 6), (2, 4)]
+    results = play_paired_openings(SmartAgent, RandomAgent, openings=suite, num_pairs=6)
+    assert results["games"] == 12
+    assert [pair["opening"] for pair in results["pairs"]] == suite * 2
+    assert results["score"] == sum(sum(pair["scores"]) for pair in results["pairs"])
+    assert results["wins"] + results["draws"] + results["losses"] == 12
+    assert results["elo_low"] <= results["elo"] <= results["elo_high"]
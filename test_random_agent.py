@@ -148,5 +148,58 @@ def simulate_multiple_games(num_games=10):
     return results
 
 
+class DummyEnv:
+    """Minimal stand-in for the PettingZoo env in batch tests."""
+    def __init__(self):
+        self.agents = ["player_0"]
+
+    def action_space(self, agent):
+        return None
+
+
+def test_choose_actions_respects_masks():
+    """Batch draws must only return valid columns."""
+    from WeightedRandomAgent import WeightedRandomAgent
+
+    rng = np.random.default_rng(0)
+    masks = rng.integers(0, 2, size=(5000, 7), dtype=np.int8)
+    masks[masks.sum(axis=1) == 0, 3] = 1
+
+    for agent in (RandomAgent(DummyEnv(), seed=1), WeightedRandomAgent(DummyEnv(), seed=1)):
+        actions = agent.choose_actions(masks)
+        assert actions.shape == (5000,)
+        assert np.all(masks[np.arange(5000), actions] == 1)
+
+
+def test_weighted_batch_distribution():
+    """Weighted draws follow [1,2,3,5,3,2,1] renormalized over the mask."""
+    from WeightedRandomAgent import WeightedRandomAgent
+
+    agent = WeightedRandomAgent(DummyEnv(), seed=7)
+    masks = np.tile(np.array([1, 1, 1, 0, 1, 1, 1], dtype=np.int8), (120000, 1))
+    counts = np.bincount(agent.choose_actions(masks), minlength=7)
+
+    expected = np.array([1, 2, 3, 0, 3, 2, 1]) / 12
+    print("\nTEST weighted batch frequencies", counts / counts.sum())
+    assert counts[3] == 0
+    assert np.allclose(counts / counts.sum(), expected, atol=0.01)
+
+
+def test_game_streams_are_reproducible():
+    """The same (seed, game id) always yields the same stream."""
+    masks = np.ones((64, 7), dtype=np.int8)
+    agent = RandomAgent(DummyEnv())
+
+    agent.reseed(42, game_id=3)
+    first = agent.choose_actions(masks)
+    agent.reseed(42, game_id=4)
+    other = agent.choose_actions(masks)
+    agent.reseed(42, game_id=3)
+    again = agent.choose_actions(masks)
+
+    assert np.array_equal(first, again)
+    assert not np.array_equal(first, other)
+
+
 if __name__ == "__main__":
     simulate_multiple_games(100)
\ No newline at end of file
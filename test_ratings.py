@@ -0,0 +1,67 @@
+import math
+
+import pytest
+
+from random_agent import RandomAgent
+from ratings import SPRT, EloRatings, elo_from_score, elo_interval, expected_score
+from smart_agent import SmartAgent
+from smart_agent_ameliore import SmartAgentAmeliore
+from test_tournament import play_rated_matchup, play_round_robin
+
+
+def test_expected_score_and_inverse():
+    assert expected_score(0) == 0.5
+    assert expected_score(400) == pytest.approx(10 / 11)
+    for elo in (-300, -50, 0, 120, 500):
+        assert elo_from_score(expected_score(elo)) == pytest.approx(elo)
+    assert elo_from_score(1.0) == math.inf
+
+
+def test_elo_interval_contains_estimate():
+    elo, low, high = elo_interval(60, 20, 20)
+    print("\nTEST elo interval", elo, low, high)
+    assert low < elo < high
+    assert elo == pytest.approx(elo_from_score(0.7))
+    # More games, narrower interval
+    _, low_more, high_more = elo_interval(600, 200, 200)
+    assert high_more - low_more < high - low
+
+
+def test_sprt_accepts_and_rejects():
+    stronger = SPRT(0, 50)
+    while stronger.status() is None:
+        stronger.add(1)
+    assert stronger.status() == "H1"
+    assert stronger.games < 20
+
+    equal = SPRT(0, 50)
+    while equal.status() is None:
+        equal.add(equal.games % 2)
+    assert equal.status() == "H0"
+
+    with pytest.raises(ValueError):
+        SPRT(50, 0)
+
+
+def test_elo_ratings_are_zero_sum():
+    ratings = EloRatings(k=20)
+    ratings.update("a", "b", 1)
+    assert ratings.rating("a") == pytest.approx(1510)
+    ratings.update("a", "c", 0.5)
+    ratings.update("b", "c", 0)
+    assert sum(ratings.ratings.values()) == pytest.approx(3 * 1500)
+    assert [name for name, _, _ in ratings.ranking()][-1] == "b"
+
+
+def test_sprt_stops_lopsided_matchup_early():
+    results = play_rated_matchup(SmartAgent, RandomAgent, max_games=200, sprt=SPRT(0, 50))
+    assert results["decision"] == "H1"
+    assert results["games"] < 40
+    assert results["elo_low"] > 0
+
+
+def test_round_robin_ranking():
+    results = play_round_robin([RandomAgent, SmartAgentAmeliore, SmartAgent], max_games=100, elo0=0, elo1=50)
+    names = [name for name, _, _ in results["ratings"]]
+    assert names[-1] == "RandomAgent"
+    assert all(result["decision"] for result in results["matchups"].values())
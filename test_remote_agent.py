@@ -0,0 +1,124 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from agent_server import AgentBatcher, AgentServer
+from random_agent import RandomAgent
+from remote_agent import RemoteAgent, RemoteAgentError, RemoteEndpoint, remote_agent_class
+from test_agent_server import FussyAgent
+from test_tournament import play_multiple_games, play_multiple_games_async, play_multiple_games_parallel
+from time_limit import MoveTimeout
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Drops the first request without answering, sleeps on "slow" agents"""
+
+    protocol_version = "HTTP/1.1"
+    requests = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        FlakyHandler.requests += 1
+        if FlakyHandler.requests == 1:
+            self.close_connection = True
+            return
+        if "slow" in self.path:
+            time.sleep(0.5)
+        body = json.dumps({"actions": [3] * len(request["observations"])}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = AgentServer(("127.0.0.1", 0), agents=["RandomAgent", "SmartAgentAmeliore"])
+    server.start()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def flaky_server():
+    FlakyHandler.requests = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_remote_agents_play_tournaments(server):
+    remote = remote_agent_class("SmartAgentAmeliore", *server.server_address[:2])
+    results = play_multiple_games(remote, RandomAgent, num_games=6, render_mode=None, base_seed=1, engine="native")
+    assert results["player_0"] + results["player_1"] + results["draw"] == 6
+    results = play_multiple_games_parallel(remote, RandomAgent, num_games=6, processes=2, engine="native")
+    assert results["player_0"] + results["player_1"] + results["draw"] == 6
+    assert server.batchers["SmartAgentAmeliore"].moves > 0
+
+
+def test_async_runner_shares_round_trips(server):
+    remote = remote_agent_class("RandomAgent", *server.server_address[:2])
+    results = play_multiple_games_async(remote, RandomAgent, num_games=40, concurrency=40)
+    assert results["player_0"] + results["player_1"] + results["draw"] == 40
+    assert server.batchers["RandomAgent"].stats()["mean_batch"] > 1
+
+
+def test_concurrent_games_are_pipelined(server):
+    host, port = server.server_address[:2]
+    endpoint = RemoteEndpoint(host, port, connections=2)
+    futures = [endpoint.submit("RandomAgent", np.zeros((6, 7, 2)), np.ones(7)) for _ in range(100)]
+    assert all(0 <= future.result(5) < 7 for future in futures)
+    assert endpoint.requests < 100
+    endpoint.close()
+
+
+def test_failed_board_only_fails_its_game(server):
+    # A board without a legal column makes the agent raise
+    server.batchers["FussyAgent"] = AgentBatcher(FussyAgent())
+    host, port = server.server_address[:2]
+    endpoint = RemoteEndpoint(host, port, connections=1)
+    masks = [np.ones(7)] * 5
+    masks[3] = np.zeros(7)
+    futures = [endpoint.submit("FussyAgent", np.zeros((6, 7, 2)), mask) for mask in masks]
+    with pytest.raises(RemoteAgentError, match="no legal column"):
+        futures[3].result(5)
+    assert all(0 <= futures[i].result(5) < 7 for i in (0, 1, 2, 4))
+    endpoint.close()
+
+
+def test_async_moves_overlap(server):
+    agent = RemoteAgent(agent="SmartAgentAmeliore", host=server.server_address[0], port=server.server_address[1])
+    mask = np.zeros(7, dtype=np.int8)
+    mask[2] = 1
+
+    async def play():
+        return await asyncio.gather(*[agent.choose_action_async(np.zeros((6, 7, 2)), mask) for _ in range(20)])
+
+    assert asyncio.run(play()) == [2] * 20
+
+
+def test_lost_requests_are_retried(flaky_server):
+    endpoint = RemoteEndpoint(*flaky_server.server_address[:2], connections=1)
+    assert endpoint.submit("fast", np.zeros((6, 7, 2)), np.ones(7)).result(5) == 3
+    assert endpoint.retried == 1
+    endpoint.close()
+
+
+def test_timeouts(flaky_server):
+    host, port = flaky_server.server_address[:2]
+    agent = RemoteAgent(agent="slow", host=host, port=port, timeout=0.1)
+    with pytest.raises(MoveTimeout):
+        agent.choose_action(np.zeros((6, 7, 2)), action_mask=np.ones(7))
+    with pytest.raises(RemoteAgentError):
+        RemoteEndpoint(host, port, timeout=0.1, retries=0).submit("slow", np.zeros((6, 7, 2)), np.ones(7)).result(5)
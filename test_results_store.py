@@ -0,0 +1,73 @@
+import pytest
+
+from random_agent import RandomAgent
+from results_store import ResultsStore
+from smart_agent import SmartAgent
+from test_tournament import play_multiple_games
+
+
+def make_store():
+    store = ResultsStore(":memory:", batch_size=2)
+    store.add_game("A", "B", 1, "player_0", [3, 3, 3, 2, 3, 2, 3], [10, 20, 30, 40, 50, 60, 70])
+    store.add_game("A", "B", 2, None, [0] * 6, [1, 2, 3, 4, 5, 6])
+    store.add_game("B", "A", 3, "player_1", [1, 2, 1, 2, 1, 2, 1, 2], [100] * 8)
+    return store
+
+
+def test_win_rates_per_pairing_and_color():
+    store = make_store()
+    assert len(store) == 3
+    rates = store.win_rates()
+    assert [(row["agent_0"], row["agent_1"], row["games"]) for row in rates] == [("A", "B", 2), ("B", "A", 1)]
+    assert rates[0]["player_0"] == 1 and rates[0]["draw"] == 1 and rates[0]["rate_draw"] == 0.5
+    colors = store.color_win_rates()
+    assert colors["A"] == {"first": 0.5, "second": 1.0}
+    assert colors["B"] == {"first": 0.0, "second": 0.0}
+
+
+def test_move_count_distribution():
+    store = make_store()
+    assert store.move_count_distribution() == {6: 1, 7: 1, 8: 1}
+    assert store.move_count_distribution("B", "A") == {8: 1}
+
+
+def test_latency_percentiles():
+    store = make_store()
+    latencies = store.latency_percentiles((50, 100))
+    # A played plies 0, 2, 4, 6 of the first two games and the odd plies of the third
+    assert latencies["A"]["count"] == 4 + 3 + 4
+    assert latencies["A"][100] == pytest.approx(100, rel=0.05)
+    assert latencies["B"][50] == pytest.approx(40, rel=0.05)
+
+
+def test_reopen_continues_ids(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    with ResultsStore(path) as store:
+        store.add_game("A", "B", 1, "player_0", [3, 3])
+    with ResultsStore(path) as store:
+        assert store.add_game("A", "C", 2, None, [4]) == 2
+        assert len(store) == 2
+
+
+def test_win_rates_summary_survives_reopen(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    with ResultsStore(path) as store:
+        store.add_game("A", "B", 1, "player_0", [3, 3])
+        store.add_game("A", "B", 2, None, [4])
+        expected = store.win_rates()
+        # As a store written before the summary table existed
+        store._db.execute("DROP TABLE pairings")
+    with ResultsStore(path) as store:
+        assert store.win_rates() == expected
+        store.add_game("A", "B", 3, "player_1", [2])
+        assert [store.win_rates()[0][key] for key in ("games", "player_0", "player_1", "draw")] == [3, 1, 1, 1]
+
+
+def test_tournament_writes_store():
+    store = ResultsStore(":memory:")
+    results = play_multiple_games(RandomAgent, SmartAgent, num_games=6, render_mode=None, base_seed=3,
+                                  engine="native", store=store)
+    row = store.win_rates()[0]
+    assert (row["player_0"], row["player_1"], row["draw"]) == (results["player_0"], results["player_1"],
+                                                                 results["draw"])
+    assert store.latency_percentiles()["SmartAgent"][50] > 0
@@ -89,6 +89,27 @@ def test_find_winning_move():
 
     print("\nTEST find_winning_move ", col)
 
+
+def test_check_win_keeps_historical_semantics():
+    # SmartAgent is a reference opponent: its win check must not change,
+    # even where it differs from the exact check of board.Position
+    from board import Position
+    agent = SmartAgent(DummyEnv())
+
+    # Three on the bottom row: the historical scan stops before the last row
+    board = np.zeros((6,7,2))
+    board[5,0:3,0] = 1
+    assert agent._check_win_from_position(board, 5, 3, channel=0) == False
+    assert Position.from_observation(board).completes_four(5, 3, 0)
+
+    # The (1,-1) diagonal leaving column 0 wraps around to column 6
+    board = np.zeros((6,7,2))
+    board[3,6,0] = 1
+    board[1,1,0] = 1
+    board[0,2,0] = 1
+    assert agent._check_win_from_position(board, 2, 0, channel=0) == True
+    assert not Position.from_observation(board).completes_four(2, 0, 0)
+
 # INTEGRATION TESTS (RANDOM VS SMART)
 
 def OneGame():  
@@ -186,5 +207,6 @@ if __name__ == "__main__":
    test_get_next_row()
    test_check_win_from_position_vertical()
    test_find_winning_move()
+   test_check_win_keeps_historical_semantics()
    #OneGame_SmartVsRandom(render = True)
    AllGame_SmartVsRandom(1)
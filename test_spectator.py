@@ -0,0 +1,76 @@
+import io
+import queue
+import time
+
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from spectator import SpectatorPublisher, format_board, render_events, replay_game, start_spectator
+from test_tournament import make_agents, make_env, play_game, play_multiple_games
+
+
+def test_format_board():
+    board = [[0] * 7 for _ in range(6)]
+    board[5][3] = 1
+    board[4][3] = 2
+    lines = format_board(board).splitlines()
+    assert lines[5] == ". . . X . . ."
+    assert lines[4] == ". . . O . . ."
+    assert lines[6] == "0 1 2 3 4 5 6"
+
+
+def test_game_events_are_published():
+    events = queue.Queue()
+    env = make_env("native")
+    env.reset()
+    winner, moves = play_game(env, make_agents(env, RandomAgent, SmartAgent), seed=3, agent_seed=3, game_id=7,
+                              verbose=False, spectator=SpectatorPublisher(events))
+    published = list(events.queue)
+    assert published[0] == ("start", 7, {"agents": ["RandomAgent", "SmartAgent"]})
+    assert [event[2] for event in published[1:-1]] == list(range(moves))
+    assert published[-1] == ("end", 7, winner, moves)
+
+
+def test_selection_and_full_queue_never_block():
+    events = queue.Queue(maxsize=5)
+    publisher = SpectatorPublisher(events, every=2)
+    start = time.perf_counter()
+    play_multiple_games(RandomAgent, SmartAgent, num_games=4, render_mode=None, base_seed=1, engine="native",
+                        spectator=publisher)
+    assert time.perf_counter() - start < 5
+    assert events.full()
+    # Game 0 fills the queue and is cut, game 2 finds it full
+    assert publisher.dropped == 2
+    assert {event[1] for event in events.queue} == {0}
+
+
+def test_renderer_draws_events(tmp_path):
+    events = queue.Queue()
+    publisher = SpectatorPublisher(events)
+    publisher.start(0, ["A", "B"])
+    for ply, column in enumerate([3, 3, 4]):
+        publisher.move(0, ply, f"player_{ply % 2}", column)
+    publisher.end(0, None, 3)
+    publisher.close()
+    path = tmp_path / "spectator.txt"
+    render_events(events, delay=0, output=str(path))
+
+    replayed = io.StringIO()
+    replay_game([3, 3, 4], ("A", "B"), delay=0, output=replayed)
+    text = path.read_text()
+    assert text == replayed.getvalue()
+    assert "=== game 0: A vs B ===" in text
+    assert ". . . X X . ." in text and "draw after 3 moves" in text
+
+
+def test_renderer_process_follows_tournament(tmp_path):
+    path = tmp_path / "spectator.txt"
+    publisher, process = start_spectator(delay=0.01, games=[1], output=str(path))
+    results = play_multiple_games(RandomAgent, SmartAgent, num_games=3, render_mode=None, base_seed=2,
+                                  engine="native", spectator=publisher)
+    publisher.close()
+    process.join(30)
+    text = path.read_text()
+    assert "=== game 1: RandomAgent vs SmartAgent ===" in text
+    assert "game 0" not in text and "game 2" not in text
+    assert "wins after" in text or "draw after" in text
+    assert results["player_0"] + results["player_1"] + results["draw"] == 3
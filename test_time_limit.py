@@ -0,0 +1,61 @@
+import time
+
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from test_tournament import make_agents, make_env, play_game, play_multiple_games, play_one_game
+from time_limit import ProcessAgent, TimeLimit
+
+
+class SlowAgent(RandomAgent):
+    """Random agent that thinks for one second on every move"""
+
+    def choose_action(self, **kwargs):
+        time.sleep(1.0)
+        return super().choose_action(**kwargs)
+
+
+def test_slow_agent_gets_fallback_moves():
+    limit = TimeLimit(20, policy="fallback")
+    start = time.perf_counter()
+    results = play_multiple_games(SlowAgent, SmartAgent, num_games=2, render_mode=None, base_seed=1,
+                                  engine="native", time_limit=limit, latency=True)
+    assert time.perf_counter() - start < 5
+    assert results["violations"] == len(limit.violations) > 0
+    assert all(violation["agent"] == "SlowAgent" for violation in limit.violations)
+    assert all(violation["elapsed_ns"] < 0.5e9 for violation in limit.violations)
+    assert results["latency"]["SmartAgent"]["all"]["count"] > 0
+
+
+def test_slow_agent_forfeits():
+    limit = TimeLimit(20, policy="forfeit")
+    env = make_env("native")
+    env.reset()
+    agents = make_agents(env, SmartAgent, SlowAgent)
+    winner, moves = play_game(env, agents, seed=1, verbose=False, time_limit=limit)
+    assert winner == "player_0"
+    assert moves == 1
+    assert limit.violations[0]["player"] == "player_1" and limit.violations[0]["ply"] == 1
+
+
+def test_process_agent_is_killed_and_restarted():
+    limit = TimeLimit(50, policy="forfeit")
+    agent = ProcessAgent(SlowAgent, "player_0")
+    env = make_env("native")
+    env.reset()
+    try:
+        winner, _ = play_game(env, {"player_0": agent, "player_1": RandomAgent(env, "player_1")}, verbose=False,
+                              time_limit=limit)
+        assert winner == "player_1"
+        assert agent.restarts == 1
+        assert limit.violations[0]["agent"] == "SlowAgent"
+    finally:
+        agent.close()
+
+
+def test_isolated_agents_play_the_same_game():
+    for seed in (1, 2, 3):
+        in_process = play_one_game(RandomAgent, SmartAgent, render_mode=None, seed=seed, agent_seed=seed,
+                                   engine="native")
+        isolated = play_one_game(RandomAgent, SmartAgent, render_mode=None, seed=seed, agent_seed=seed,
+                                 engine="native", isolate=True)
+        assert isolated == in_process
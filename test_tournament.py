@@ -5,71 +5,509 @@ This script runs multiple games between different agents:
 RandomAgent, SmartAgent, SmartAgentAmeliore, and MinimaxAgent.
 """
 
+import asyncio
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import combinations
+from multiprocessing import Pool
+
 import numpy as np
 from random_agent import RandomAgent
 from smart_agent import SmartAgent
 from smart_agent_ameliore import SmartAgentAmeliore
 from agent_minimax import MinimaxAgent
+from decision_cache import CachedAgent, DecisionCache
+from agent_profiler import RuleProfiler
+from connect_four_engine import ConnectFourEngine
+from vector_env import VectorConnectFour
+from ratings import SPRT, EloRatings, elo_interval, paired_elo_interval
+from openings import generate_openings
+from game_log import GameLog, read_game_log
+from latency import LatencyRecorder
+from online_stats import CountHistogram, MatchStats
+from time_limit import ProcessAgent
+from agent_sandbox import SandboxedAgent
+from game_cache import game_key
 from pettingzoo.classic import connect_four_v3
 
+# Game engines a tournament can run on
+ENGINES = ("pettingzoo", "native")
+
+# One move of a streamed game, see GameStream
+PlyRecord = namedtuple("PlyRecord", ["game_id", "ply", "player", "board", "mask", "action", "think_ns"])
+
 
-def play_one_game(agent1_class, agent2_class, render_mode="human", depth_minimax=3):
+def game_seed(base_seed, game_index):
     """
-    Play a single game of Connect Four between two agents.
+    Derive the seed of one game from the base seed of a run.
 
     Parameters:
-        agent1_class: class of player 0
-        agent2_class: class of player 1
+        base_seed: int, seed of the whole run
+        game_index: int, index of the game in the run
+
+    Returns:
+        int: 32-bit seed that only depends on (base_seed, game_index)
+    """
+    return int(np.random.SeedSequence([base_seed, game_index]).generate_state(1)[0])
+
+
+def make_env(engine="pettingzoo", render_mode=None):
+    """
+    Create the Connect Four environment of a game.
+
+    Parameters:
+        engine: "pettingzoo" for connect_four_v3, "native" for the headless
+            ConnectFourEngine (same API and results, never renders)
         render_mode: str, mode for environment rendering
-        depth_minimax: int, depth for MinimaxAgent if used
 
     Returns:
-        tuple: winner (str or None), total number of moves played
+        environment with the PettingZoo AEC interface
     """
-    env = connect_four_v3.env(render_mode=render_mode)
-    env.reset(seed=42)
+    if engine == "pettingzoo":
+        return connect_four_v3.env(render_mode=render_mode)
+    if engine == "native":
+        return ConnectFourEngine(render_mode=render_mode)
+    raise ValueError(f"unknown engine {engine!r}, expected one of {ENGINES}")
 
-    assert env.agents == ["player_0", "player_1"]
 
-    # Initialize agents
+def _agent_config(cls, depth_minimax):
+    # Constructor settings that change how an agent plays
+    return {"depth": int(depth_minimax)} if cls == MinimaxAgent else {}
+
+
+def _build_agent(env, cls, name, depth_minimax):
+    if cls == MinimaxAgent:
+        return cls(env, depth=int(depth_minimax), player_name=name)
+    return cls(env, name)
+
+
+def make_agents(env, agent1_class, agent2_class, depth_minimax=3, decision_caches=None, profilers=None,
+                isolate=False):
+    """
+    Create the two agents of a game.
+
+    Parameters:
+        env: environment the agents read their action space from
+        agent1_class: class of player 0
+        agent2_class: class of player 1
+        depth_minimax: int, depth for MinimaxAgent if used
+        decision_caches: optional dict {player name: DecisionCache}
+        profilers: optional dict {player name: RuleProfiler}
+        isolate: bool or "sandbox", run each agent in its own worker process
+            (time_limit.ProcessAgent), so that time limits can stop it
+            even inside native code; "sandbox" does the same with boards
+            exchanged through shared memory (agent_sandbox.SandboxedAgent),
+            much faster per move; caches and profilers do not apply
+
+    Returns:
+        dict: {player name: agent}
+    """
     agent_dict = {}
     for name, cls in zip(["player_0", "player_1"], [agent1_class, agent2_class]):
-        if cls == MinimaxAgent:
-            agent_dict[name] = cls(env, depth=int(depth_minimax), player_name=name)
-        else:
-            agent_dict[name] = cls(env, name)
-
-    winner = None
-    move_count = 0
-
-    for agent in env.agent_iter():
-        observation, reward, terminated, truncated, info = env.last()
-        if terminated or truncated:
-            action = None
-            if reward == 1:
-                print(f"{agent} wins!")
-                winner = agent
-            elif reward == 0:
-                print("It's a draw!")
-        else:
-            mask = observation["action_mask"]
-            action = agent_dict[agent].choose_action(
+        if isolate:
+            host = SandboxedAgent if isolate == "sandbox" else ProcessAgent
+            agent_dict[name] = host(_build_agent, cls, name, depth_minimax, label=cls.__name__)
+            continue
+        agent_dict[name] = _build_agent(env, cls, name, depth_minimax)
+        if profilers and name in profilers and hasattr(agent_dict[name], "profiler"):
+            profilers[name].attach(agent_dict[name])
+        if decision_caches and name in decision_caches:
+            agent_dict[name] = CachedAgent(agent_dict[name], decision_caches[name])
+    return agent_dict
+
+
+def seed_agents(agent_dict, seed):
+    """
+    Seed every source of randomness the agents use, so that a game only
+    depends on its seed.
+
+    Parameters:
+        agent_dict: dict {player name: agent}
+        seed: int, seed of the game
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    for agent in agent_dict.values():
+        action_space = getattr(agent, "action_space", None)
+        if action_space is not None:
+            action_space.seed(seed)
+        if hasattr(agent, "reseed"):
+            agent.reseed(seed)
+
+
+class _GameRun:
+    """
+    Ply-by-ply driver of one game, shared by play_game, GameStream and
+    play_game_async: resets and seeds, plays the opening, hands out the
+    turns of the agents and applies their moves with the same
+    bookkeeping (history, latency, random moves, spectator, forfeits).
+    See play_game for the parameters.
+    """
+
+    def __init__(self, env, agent_dict, seed=42, agent_seed=None, game_id=None, verbose=False, opening=(),
+                 history=None, time_limit=None, latency=None, random_moves=None, spectator=None):
+        self.env = env
+        self.agent_dict = agent_dict
+        self.seed = seed
+        self.agent_seed = agent_seed
+        self.game_id = game_id
+        self.verbose = verbose
+        self.opening = opening
+        self.history = history
+        self.time_limit = time_limit
+        self.latency = latency
+        self.random_moves = random_moves
+        self.spectator = spectator
+        self.winner = None
+        self.move_count = len(opening)
+        self.over = False
+        self._turns = None
+
+    def start(self):
+        env = self.env
+        env.reset(seed=self.seed)
+
+        assert env.agents == ["player_0", "player_1"]
+
+        if self.agent_seed is not None:
+            seed_agents(self.agent_dict, self.agent_seed)
+        if self.game_id is not None:
+            for player in self.agent_dict.values():
+                if hasattr(player, "start_game"):
+                    player.start_game(self.game_id)
+
+        if self.spectator is not None:
+            self.spectator.start(self.game_id, [getattr(self.agent_dict[name], "label",
+                                                        type(self.agent_dict[name]).__name__)
+                                                for name in ("player_0", "player_1")])
+        for ply, action in enumerate(self.opening):
+            if self.spectator is not None:
+                self.spectator.move(self.game_id, ply, env.agent_selection, action)
+            env.step(action)
+        self._turns = env.agent_iter()
+
+    def next_turn(self):
+        """
+        Step through the end of the game, or return the next agent to move
+
+        Returns:
+            (player name, agent, choose_action keyword arguments), or None
+            once the game is over
+        """
+        if self.over:
+            return None
+        for agent in self._turns:
+            observation, reward, terminated, truncated, info = self.env.last()
+            if terminated or truncated:
+                if reward == 1:
+                    if self.verbose:
+                        print(f"{agent} wins!")
+                    self.winner = agent
+                elif reward == 0:
+                    if self.verbose:
+                        print("It's a draw!")
+                self.env.step(None)
+                continue
+            return agent, self.agent_dict[agent], dict(
                 observation=observation["observation"],
                 reward=reward,
                 terminated=terminated,
                 truncated=truncated,
                 info=info,
-                action_mask=mask,
+                action_mask=observation["action_mask"],
             )
-            move_count += 1
+        self.over = True
+        return None
+
+    def choose(self, turn):
+        """
+        Returns:
+            tuple: (action or None if the agent forfeits, decision time in ns)
+        """
+        agent, player, kwargs = turn
+        if self.time_limit is not None:
+            return self.time_limit.choose(agent, player, kwargs, self.game_id, self.move_count)
+        start = time.perf_counter_ns()
+        action = player.choose_action(**kwargs)
+        return action, time.perf_counter_ns() - start
+
+    def apply(self, turn, action, elapsed):
+        """
+        Record a move and play it (action None: the agent forfeits)
+        """
+        agent, player, _ = turn
+        if action is None:
+            self.winner = "player_1" if agent == "player_0" else "player_0"
+            if self.verbose:
+                print(f"{agent} forfeits on time, {self.winner} wins!")
+            self.over = True
+            return
+        if self.latency is not None:
+            self.latency.add(getattr(player, "label", type(player).__name__), self.move_count, elapsed)
+        if self.history is not None:
+            self.history.append((int(action), elapsed))
+        if self.random_moves is not None and getattr(player, "last_action_random", True):
+            self.random_moves.append(self.move_count)
+        if self.spectator is not None:
+            self.spectator.move(self.game_id, self.move_count, agent, action)
+        self.move_count += 1
+        self.env.step(action)
+
+    def end(self):
+        """
+        Returns:
+            tuple: winner (str or None), total number of moves played
+        """
+        if self.spectator is not None:
+            self.spectator.end(self.game_id, self.winner, self.move_count)
+        return self.winner, self.move_count
+
+
+def play_game(env, agent_dict, seed=42, agent_seed=None, game_id=None, verbose=True, opening=(), history=None,
+              time_limit=None, latency=None, random_moves=None, spectator=None):
+    """
+    Play one game on an existing environment with existing agents.
+
+    Parameters:
+        env: Connect Four environment (reset here)
+        agent_dict: dict {player name: agent}
+        seed: int, seed passed to env.reset
+        agent_seed: int or None, if set the agents are seeded with it
+        game_id: optional index of the game, passed to agents exposing
+            start_game (e.g. per-game log sampling)
+        verbose: bool, print the result of the game
+        opening: sequence of columns played before the agents take over
+            (counted in the number of moves)
+        history: optional list, receives an (action, time_ns) tuple for
+            every move chosen by an agent
+        time_limit: optional time_limit.TimeLimit, applied to every move; an
+            agent forfeiting loses the game on the spot
+        latency: optional latency.LatencyRecorder, receives the decision
+            time of every move per agent and game phase
+        random_moves: optional list, receives the index of every move for
+            which the agent drew a random number (agents without a
+            last_action_random flag count as random on every move)
+        spectator: optional spectator.SpectatorPublisher, receives the
+            moves of the game without ever blocking it
+
+    Returns:
+        tuple: winner (str or None), total number of moves played
+    """
+    game = _GameRun(env, agent_dict, seed, agent_seed, game_id, verbose, opening, history, time_limit, latency,
+                    random_moves, spectator)
+    game.start()
+    while (turn := game.next_turn()) is not None:
+        game.apply(turn, *game.choose(turn))
+    return game.end()
+
+
+def play_one_game(agent1_class, agent2_class, render_mode="human", depth_minimax=3, decision_caches=None,
+                  profilers=None, game_id=None, seed=42, agent_seed=None, engine="pettingzoo", history=None,
+                  time_limit=None, latency=None, isolate=False, random_moves=None, spectator=None):
+    """
+    Play a single game of Connect Four between two agents.
 
-        env.step(action)
+    Parameters:
+        agent1_class: class of player 0
+        agent2_class: class of player 1
+        render_mode: str, mode for environment rendering
+        depth_minimax: int, depth for MinimaxAgent if used
+        decision_caches: optional dict {player name: DecisionCache}; the
+            matching agents are wrapped in a CachedAgent
+        profilers: optional dict {player name: RuleProfiler}, attached to
+            the matching agents when they support rule profiling
+        game_id: optional index of the game, passed to agents exposing
+            start_game (e.g. per-game log sampling)
+        seed: int, seed passed to env.reset
+        agent_seed: int or None, if set the agents' randomness is seeded
+        engine: str, "pettingzoo" or "native" (see make_env)
+        history: optional list, receives (action, time_ns) for every move
+        time_limit: optional time_limit.TimeLimit applied to every move
+        latency: optional latency.LatencyRecorder of the decision times
+        isolate: bool or "sandbox", run the agents in worker processes (see make_agents)
+        random_moves: optional list, receives the index of every move that
+            used randomness (see play_game)
+        spectator: optional spectator.SpectatorPublisher the moves are
+            published to
+
+    Returns:
+        tuple: winner (str or None), total number of moves played
+    """
+    env = make_env(engine, render_mode)
+    env.reset(seed=seed)
+
+    # Initialize agents
+    agent_dict = make_agents(env, agent1_class, agent2_class, depth_minimax, decision_caches, profilers, isolate)
+
+    try:
+        winner, move_count = play_game(env, agent_dict, seed=seed, agent_seed=agent_seed, game_id=game_id,
+                                       history=history, time_limit=time_limit, latency=latency,
+                                       random_moves=random_moves, spectator=spectator)
+    finally:
+        if isolate:
+            for agent in agent_dict.values():
+                agent.close()
 
     env.close()
     return winner, move_count
 
 
-def play_multiple_games(agent1_class, agent2_class, num_games=10, render_mode="human", depth_minimax=3):
+def _readonly(array, views):
+    # Read-only view of an observation array, created once per reused buffer
+    entry = views.get(id(array))
+    if entry is not None and entry[0] is array:
+        return entry[1]
+    view = array.view()
+    view.flags.writeable = False
+    if len(views) < 16:
+        views[id(array)] = (array, view)
+    return view
+
+
+class GameStream:
+    """
+    One game played lazily, one PlyRecord per agent move.
+
+    Iterating plays the game: every record is yielded before its move is
+    applied, with board (6x7x2, channel 0 = player to move) and mask as
+    read-only views of the environment's observation. On the native engine
+    these views are zero-copy and reused, so they are only valid until the
+    next ply; copy them to keep them. winner and move_count are set once
+    the game is over. The game is driven like play_game (seeding,
+    start_game, time limits and forfeits).
+    """
+
+    def __init__(self, env, agent_dict, game_id=None, seed=42, agent_seed=None, opening=(), history=None,
+                 time_limit=None, latency=None, random_moves=None, spectator=None):
+        """
+        Prepare the game (nothing is played before iteration)
+
+        Parameters:
+            env: Connect Four environment (reset when iteration starts)
+            agent_dict: dict {player name: agent}
+            game_id: optional index of the game, copied into the records
+                and passed to agents exposing start_game
+            seed: int, seed passed to env.reset
+            agent_seed: int or None, if set the agents are seeded with it
+            opening: sequence of columns played before the agents take over
+            history, time_limit, latency, random_moves, spectator: see
+                play_game; a forfeit ends the game without a record
+        """
+        self.env = env
+        self.agent_dict = agent_dict
+        self.game_id = game_id
+        self.seed = seed
+        self.agent_seed = agent_seed
+        self.opening = opening
+        self.winner = None
+        self.move_count = None
+        self._run = _GameRun(env, agent_dict, seed, agent_seed, game_id, False, opening, history, time_limit,
+                             latency, random_moves, spectator)
+        self._plies = None
+
+    def __iter__(self):
+        if self._plies is None:
+            self._plies = self._play()
+        return self._plies
+
+    def _play(self):
+        game = self._run
+        game.start()
+        views = {}
+        while (turn := game.next_turn()) is not None:
+            action, think_ns = game.choose(turn)
+            if action is not None:
+                kwargs = turn[2]
+                yield PlyRecord(self.game_id, game.move_count, turn[0], _readonly(kwargs["observation"], views),
+                                _readonly(kwargs["action_mask"], views), int(action), think_ns)
+            game.apply(turn, action, think_ns)
+        self.winner, self.move_count = game.end()
+
+    def finish(self):
+        """
+        Play the rest of the game without looking at it
+
+        Returns:
+            tuple: winner (str or None), total number of moves played
+        """
+        for _ in self:
+            pass
+        return self.winner, self.move_count
+
+
+def stream_games(agent1_class, agent2_class, num_games=10, base_seed=42, depth_minimax=3, engine="native",
+                 openings=None):
+    """
+    Lazily play a matchup, one GameStream per game.
+
+    The environment and agents are built once. A game the consumer stops
+    iterating is finished before the next one starts. Game i is seeded
+    with game_seed(base_seed, i), so the games are those of
+    play_multiple_games(..., base_seed=base_seed).
+
+    Parameters:
+        agent1_class: class of player 0
+        agent2_class: class of player 1
+        num_games: int or None, number of games (None: endless)
+        base_seed: int, base seed of the games
+        depth_minimax: int, depth for MinimaxAgent if used
+        engine: str, "pettingzoo" or "native" (see make_env)
+        openings: optional list of openings, game i starts with
+            openings[i % len(openings)]
+
+    Yields:
+        GameStream
+    """
+    env = make_env(engine)
+    env.reset()
+    agent_dict = make_agents(env, agent1_class, agent2_class, depth_minimax)
+    game_id = 0
+    try:
+        while num_games is None or game_id < num_games:
+            seed = game_seed(base_seed, game_id)
+            opening = tuple(openings[game_id % len(openings)]) if openings else ()
+            game = GameStream(env, agent_dict, game_id, seed, seed, opening)
+            yield game
+            game.finish()
+            game_id += 1
+    finally:
+        env.close()
+
+
+def stream_plies(agent1_class, agent2_class, num_games=10, base_seed=42, depth_minimax=3, engine="native",
+                 openings=None):
+    """
+    Lazily play a matchup as one flat stream of PlyRecord (see stream_games)
+    """
+    for game in stream_games(agent1_class, agent2_class, num_games, base_seed, depth_minimax, engine, openings):
+        yield from game
+
+
+def summarize_games(games):
+    """
+    Build the statistics dict of a matchup from its game outcomes.
+
+    Parameters:
+        games: iterable of (winner, moves) tuples (consumed once, so a
+            generator streaming a game log works)
+
+    Returns:
+        dict: statistics including wins, draws, rates, min/max/mean/std/median moves
+    """
+    stats = MatchStats()
+    for winner, moves in games:
+        stats.add(winner, moves)
+    return stats.results()
+
+
+def play_multiple_games(agent1_class, agent2_class, num_games=10, render_mode="human", depth_minimax=3,
+                        cache_size=None, profile=False, base_seed=None, engine="pettingzoo", archive=None,
+                        store=None, time_limit=None, latency=False, isolate=False, progress_every=None,
+                        game_cache=None, spectator=None):
     """
     Play multiple games between two agents and collect statistics.
 
@@ -79,42 +517,633 @@ def play_multiple_games(agent1_class, agent2_class, num_games=10, render_mode="h
         num_games: int, number of games to play
         render_mode: str, environment render mode
         depth_minimax: int, depth for MinimaxAgent if used
+        cache_size: int or None, if set each player gets a DecisionCache
+            of this size kept across all games of the matchup
+        profile: bool, if True attach a RuleProfiler to each player that
+            supports it and print the aggregate rule report
+        base_seed: int or None, if set game i is fully seeded with
+            game_seed(base_seed, i) (env and agents); otherwise every game
+            uses env seed 42 and unseeded agents
+        engine: str, "pettingzoo" or "native" (see make_env)
+        archive: optional game_archive.ArchiveWriter, every game is
+            appended to it (agents, seed, winner, packed moves)
+        store: optional results_store.ResultsStore, every game is added to
+            it with its moves and decision times
+        time_limit: optional time_limit.TimeLimit applied to every move
+        latency: bool, if True record per-agent / per-phase latency
+            histograms and print their report
+        isolate: bool or "sandbox", run the agents in worker processes (see make_agents)
+        progress_every: int or None, print the running statistics every
+            progress_every games
+        game_cache: optional game_cache.GameCache; reproducible games
+            (seeded agents, or no random move at all) are stored and
+            replayed from it instead of being recomputed. Replayed games
+            are not rendered, profiled or timed, and nothing is cached
+            under a time limit (forfeits depend on timing)
+        spectator: optional spectator.SpectatorPublisher (see
+            spectator.start_spectator); use with render_mode=None to watch
+            games in a separate renderer process at full speed
 
     Returns:
-        dict: statistics including wins, draws, rates, min/max/mean moves
+        dict: statistics including wins, draws, rates, min/max/mean/std/median moves
+              (and "cache" / "profile" / "latency" / "violations" /
+              "game_cache" entries when those options are enabled)
     """
-    results = {
-        "player_0": 0,
-        "player_1": 0,
-        "draw": 0,
-        "rate_0": 0.0,
-        "rate_1": 0.0,
-        "rate_draw": 0.0,
-        "min_moves": 0,
-        "max_moves": 0,
-        "mean_moves": 0.0,
-    }
-    moves_list = []
-
-    for _ in range(num_games):
-        winner, moves = play_one_game(agent1_class, agent2_class, render_mode, depth_minimax)
-        moves_list.append(moves)
-        if winner is None:
-            results["draw"] += 1
-        elif winner == "player_0":
-            results["player_0"] += 1
+    decision_caches = None
+    if cache_size:
+        decision_caches = {name: DecisionCache(cache_size) for name in ["player_0", "player_1"]}
+    profilers = None
+    if profile:
+        profilers = {name: RuleProfiler() for name in ["player_0", "player_1"]}
+
+    recorder = LatencyRecorder() if latency else None
+
+    if time_limit is not None:
+        game_cache = None
+    cache_agents = [(cls, _agent_config(cls, depth_minimax)) for cls in (agent1_class, agent2_class)]
+    hits = 0
+
+    stats = MatchStats()
+    for game_id in range(num_games):
+        seed, agent_seed = 42, None
+        if base_seed is not None:
+            seed = agent_seed = game_seed(base_seed, game_id)
+
+        cached = None
+        if game_cache is not None:
+            key = game_key(cache_agents, engine, seed, agent_seed)
+            cached = game_cache.get(key)
+        if cached is not None:
+            winner, move_count, moves = cached
+            history = [(action, None) for action in moves]
+            hits += 1
         else:
-            results["player_1"] += 1
+            history = [] if archive is not None or store is not None or game_cache is not None else None
+            # Unseeded agents: only games without any random move are reproducible
+            random_moves = [] if game_cache is not None and agent_seed is None else None
+            winner, move_count = play_one_game(agent1_class, agent2_class, render_mode, depth_minimax,
+                                               decision_caches, profilers, game_id, seed, agent_seed, engine,
+                                               history, time_limit, recorder, isolate, random_moves,
+                                               spectator)
+            if game_cache is not None and not random_moves:
+                game_cache.put(key, winner, move_count, [action for action, _ in history])
+        stats.add(winner, move_count)
+        if history is not None:
+            moves = [action for action, _ in history]
+            if archive is not None:
+                archive.add_game(agent1_class.__name__, agent2_class.__name__, seed, winner, moves)
+            if store is not None:
+                store.add_game(agent1_class.__name__, agent2_class.__name__, seed, winner, moves,
+                               None if cached is not None else [elapsed for _, elapsed in history])
+        if progress_every and (game_id + 1) % progress_every == 0:
+            print(f"[{agent1_class.__name__} vs {agent2_class.__name__}] {stats.progress()}")
 
-    results["rate_0"] = results["player_0"] / num_games
-    results["rate_1"] = results["player_1"] / num_games
-    results["rate_draw"] = results["draw"] / num_games
-    results["min_moves"] = int(np.min(moves_list))
-    results["max_moves"] = int(np.max(moves_list))
-    results["mean_moves"] = float(np.mean(moves_list))
+    results = stats.results()
+    if decision_caches:
+        results["cache"] = {name: cache.stats() for name, cache in decision_caches.items()}
+    if profilers:
+        profilers = {name: profiler for name, profiler in profilers.items() if profiler.calls}
+        results["profile"] = {name: profiler.summary() for name, profiler in profilers.items()}
+    if recorder is not None:
+        results["latency"] = recorder.summary()
+    if time_limit is not None:
+        results["violations"] = len(time_limit.violations)
+    if game_cache is not None:
+        results["game_cache"] = {"replayed": hits, "played": num_games - hits}
 
     print(f"\n{agent1_class.__name__} vs {agent2_class.__name__}\n")
     print(results)
+    if decision_caches:
+        for name, cache in decision_caches.items():
+            stats = cache.stats()
+            print(f"decision cache {name}: {stats['hits']} hits / {stats['misses']} misses "
+                  f"({stats['hit_rate']:.1%}), {stats['bypasses']} random bypasses, {stats['size']} entries")
+    if profilers:
+        for name, profiler in profilers.items():
+            print(f"\nrule profile {name}:")
+            print(profiler.report())
+    if recorder is not None:
+        print("\nmove latency (us):")
+        print(recorder.report())
+    if game_cache is not None:
+        print(f"game cache: {hits} games replayed, {num_games - hits} played")
+    if time_limit is not None:
+        print(f"{len(time_limit.violations)} time limit violations ({time_limit.limit_ms} ms per move, "
+              f"{time_limit.policy})")
+    return results
+
+
+# Per-process state of the parallel runner: env and agents built once
+_worker = {}
+
+
+def _init_worker(agent1_class, agent2_class, depth_minimax, engine):
+    env = make_env(engine)
+    env.reset(seed=42)
+    _worker["env"] = env
+    _worker["agents"] = make_agents(env, agent1_class, agent2_class, depth_minimax)
+
+
+def _play_chunk(task):
+    base_seed, game_ids = task
+    stats = MatchStats()
+    for game_id in game_ids:
+        seed = game_seed(base_seed, game_id)
+        winner, moves = play_game(_worker["env"], _worker["agents"], seed=seed, agent_seed=seed,
+                                  game_id=game_id, verbose=False)
+        stats.add(winner, moves)
+    return stats
+
+
+def play_multiple_games_parallel(agent1_class, agent2_class, num_games=10, depth_minimax=3, base_seed=42,
+                                 processes=None, chunk_size=None, engine="pettingzoo", progress_every=None):
+    """
+    Play multiple games between two agents on a pool of worker processes.
+
+    Each worker builds its environment and agents once, then plays chunks
+    of game indices. Game i is seeded with game_seed(base_seed, i), so the
+    statistics are identical to
+    play_multiple_games(..., render_mode=None, base_seed=base_seed).
+
+    Parameters:
+        agent1_class: class of player 0
+        agent2_class: class of player 1
+        num_games: int, number of games to play
+        depth_minimax: int, depth for MinimaxAgent if used
+        base_seed: int, seed the per-game seeds are derived from
+        processes: int or None, number of workers (default: all CPUs)
+        chunk_size: int or None, games per task sent to a worker (default:
+            about 4 tasks per worker)
+        engine: str, "pettingzoo" or "native" (see make_env)
+        progress_every: int or None, print the running statistics each
+            time at least this many more games are merged
+
+    Returns:
+        dict: same statistics as play_multiple_games
+    """
+    processes = processes or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, num_games // (processes * 4))
+    tasks = [(base_seed, range(start, min(start + chunk_size, num_games)))
+             for start in range(0, num_games, chunk_size)]
+
+    # Chunk statistics are merged as they arrive, the order does not matter
+    stats = MatchStats()
+    reported = 0
+    with Pool(processes, initializer=_init_worker, initargs=(agent1_class, agent2_class, depth_minimax, engine)) as pool:
+        for chunk in pool.imap_unordered(_play_chunk, tasks):
+            stats.merge(chunk)
+            if progress_every and stats.games - reported >= progress_every:
+                reported = stats.games
+                print(f"[{agent1_class.__name__} vs {agent2_class.__name__}] {stats.progress()}")
+
+    results = stats.results()
+    print(f"\n{agent1_class.__name__} vs {agent2_class.__name__} ({processes} processes)\n")
+    print(results)
+    return results
+
+
+async def _choose_action_async(player, kwargs, executor):
+    # Native coroutine when the agent has one, else the thread pool (or inline)
+    if hasattr(player, "choose_action_async"):
+        return await player.choose_action_async(**kwargs)
+    if executor is None:
+        return player.choose_action(**kwargs)
+    return await asyncio.get_running_loop().run_in_executor(executor, partial(player.choose_action, **kwargs))
+
+
+async def play_game_async(env, agent_dict, seed=42, agent_seed=None, game_id=None, executor=None, verbose=False,
+                          opening=(), history=None, time_limit=None, latency=None, random_moves=None, spectator=None):
+    """
+    Play one game like play_game, awaiting the agents' moves.
+
+    Parameters:
+        env: Connect Four environment (reset here), owned by this game
+            until it returns
+        agent_dict: dict {player name: agent}
+        executor: optional concurrent.futures executor running the
+            synchronous agents; None calls them inline
+        other parameters: see play_game (time_limit uses
+            TimeLimit.choose_async)
+
+    Returns:
+        tuple: winner (str or None), total number of moves played
+    """
+    game = _GameRun(env, agent_dict, seed, agent_seed, game_id, verbose, opening, history, time_limit, latency,
+                    random_moves, spectator)
+    game.start()
+    while (turn := game.next_turn()) is not None:
+        agent, player, kwargs = turn
+        if time_limit is not None:
+            action, elapsed = await time_limit.choose_async(agent, player, kwargs, executor, game_id,
+                                                            game.move_count)
+        else:
+            start = time.perf_counter_ns()
+            action = await _choose_action_async(player, kwargs, executor)
+            elapsed = time.perf_counter_ns() - start
+        game.apply(turn, action, elapsed)
+    return game.end()
+
+
+async def _play_async(agent1_class, agent2_class, num_games, depth_minimax, base_seed, engine, concurrency, threads,
+                      progress_every):
+    game_ids = iter(range(num_games))
+    stats = MatchStats()
+    reported = 0
+    executor = ThreadPoolExecutor(threads) if threads else None
+
+    async def lane():
+        # One environment and agent pair per concurrent game slot
+        env = make_env(engine)
+        env.reset(seed=42)
+        agent_dict = make_agents(env, agent1_class, agent2_class, depth_minimax)
+        nonlocal reported
+        for game_id in game_ids:
+            seed = game_seed(base_seed, game_id)
+            winner, moves = await play_game_async(env, agent_dict, seed=seed, agent_seed=seed, game_id=game_id,
+                                                  executor=executor)
+            stats.add(winner, moves)
+            if progress_every and stats.games - reported >= progress_every:
+                reported = stats.games
+                print(f"[{agent1_class.__name__} vs {agent2_class.__name__}] {stats.progress()}")
+
+    try:
+        await asyncio.gather(*[lane() for _ in range(min(concurrency, num_games))])
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return stats
+
+
+def play_multiple_games_async(agent1_class, agent2_class, num_games=10, depth_minimax=3, base_seed=42,
+                              engine="native", concurrency=256, threads=0, progress_every=None):
+    """
+    Play multiple games between two agents concurrently in one event loop.
+
+    Meant for I/O-bound agents (remote_agent.RemoteAgent, agent servers):
+    up to concurrency games are in progress at once, agents with a
+    choose_action_async coroutine are awaited and synchronous agents run
+    inline, or on a pool of threads.
+
+    Game i is seeded with game_seed(base_seed, i), but the agents share
+    the global random generators: the results are only reproducible while
+    games do not interleave their random draws. With synchronous agents
+    and threads=0 (the default) they are identical to
+    play_multiple_games(..., base_seed=base_seed). With threads, or when a
+    game awaits an agent while another draws, they depend on scheduling.
+
+    Parameters:
+        agent1_class: class of player 0
+        agent2_class: class of player 1
+        num_games: int, number of games
+        depth_minimax: int, depth for MinimaxAgent if used
+        base_seed: int, base seed of the games
+        engine: str, "pettingzoo" or "native" (see make_env)
+        concurrency: int, largest number of games in progress
+        threads: int or None, threads running the synchronous agents
+            (None: the executor default); 0 runs them inline (see above)
+        progress_every: int or None, print the running statistics each
+            time at least this many more games are finished
+
+    Returns:
+        dict: same statistics as play_multiple_games
+    """
+    if threads is None:
+        threads = min(32, (os.cpu_count() or 1) + 4)
+    stats = asyncio.run(_play_async(agent1_class, agent2_class, num_games, depth_minimax, base_seed, engine,
+                                    concurrency, threads, progress_every))
+    results = stats.results()
+    print(f"\n{agent1_class.__name__} vs {agent2_class.__name__} (asyncio, {concurrency} concurrent games)\n")
+    print(results)
+    return results
+
+
+def play_vectorized_games(agent1_class, agent2_class, num_games=1000, num_envs=256, depth_minimax=3, base_seed=42):
+    """
+    Play multiple games between two agents on a VectorConnectFour batch.
+
+    At every step, the games where a given player is to move are handed to
+    that agent in one call to choose_actions(masks, observations=boards)
+    when the agent provides it, or board by board to choose_action
+    otherwise. Finished games are replaced until num_games are played.
+
+    Parameters:
+        agent1_class: class of player 0
+        agent2_class: class of player 1
+        num_games: int, number of games to play
+        num_envs: int, number of games stepped in lockstep
+        depth_minimax: int, depth for MinimaxAgent if used
+        base_seed: int, seed of the agents' randomness
+
+    Returns:
+        dict: same statistics as play_multiple_games
+    """
+    num_envs = min(num_envs, num_games)
+    env = ConnectFourEngine()
+    env.reset()
+    agent_dict = make_agents(env, agent1_class, agent2_class, depth_minimax)
+    seed_agents(agent_dict, base_seed)
+    players = [agent_dict["player_0"], agent_dict["player_1"]]
+
+    venv = VectorConnectFour(num_envs)
+    active = np.ones(num_envs, dtype=bool)
+    actions = np.zeros(num_envs, dtype=np.int64)
+    started = num_envs
+    stats = MatchStats()
+
+    while active.any():
+        observations = venv.observations()
+        for seat, agent in enumerate(players):
+            idx = np.flatnonzero(active & (venv.current == seat))
+            if len(idx) == 0:
+                continue
+            if hasattr(agent, "choose_actions"):
+                actions[idx] = agent.choose_actions(venv.masks[idx], observations=observations[idx])
+            else:
+                for i in idx:
+                    actions[i] = agent.choose_action(observation=observations[i], action_mask=venv.masks[i])
+
+        _, dones, info = venv.step(actions, active)
+        for i in np.flatnonzero(dones):
+            winner = info["winner"][i]
+            stats.add(None if winner < 0 else f"player_{winner}", int(info["moves"][i]))
+            if started < num_games:
+                started += 1
+            else:
+                active[i] = False
+
+    results = stats.results()
+    print(f"\n{agent1_class.__name__} vs {agent2_class.__name__} ({num_envs} vectorized games)\n")
+    print(results)
+    return results
+
+
+def _score(winner, swapped):
+    # Score of the first agent of a matchup, seated as player_1 when swapped
+    if winner is None:
+        return 0.5
+    return 1.0 if winner == ("player_1" if swapped else "player_0") else 0.0
+
+
+def play_rated_matchup(agent1_class, agent2_class, max_games=1000, ratings=None, sprt=None, depth_minimax=3,
+                       base_seed=42, engine="native"):
+    """
+    Play a matchup with alternating colours until max_games or an SPRT decision.
+
+    agent1_class plays first in even games and second in odd games, every
+    game is seeded with game_seed(base_seed, i).
+
+    Parameters:
+        agent1_class: class of the first agent (A)
+        agent2_class: class of the second agent (B)
+        max_games: int, maximum number of games
+        ratings: optional EloRatings, updated after every game
+        sprt: optional SPRT on "A is stronger than B", the matchup stops as
+            soon as it accepts a hypothesis
+        depth_minimax: int, depth for MinimaxAgent if used
+        base_seed: int, base seed of the games
+        engine: str, "pettingzoo" or "native" (see make_env)
+
+    Returns:
+        dict: games, wins / draws / losses of A, Elo difference of A over B
+              with its 95% confidence interval, and the SPRT llr / decision
+    """
+    env = make_env(engine)
+    env.reset()
+    # One set of agents per colour assignment, reused for all games
+    orders = [make_agents(env, agent1_class, agent2_class, depth_minimax),
+              make_agents(env, agent2_class, agent1_class, depth_minimax)]
+    names = (agent1_class.__name__, agent2_class.__name__)
+
+    wins = draws = losses = 0
+    lengths = CountHistogram()
+    for game_id in range(max_games):
+        swapped = game_id % 2
+        seed = game_seed(base_seed, game_id)
+        winner, moves = play_game(env, orders[swapped], seed=seed, agent_seed=seed, verbose=False)
+        lengths.add(moves)
+
+        score = _score(winner, swapped)
+        if score == 1:
+            wins += 1
+        elif score == 0:
+            losses += 1
+        else:
+            draws += 1
+
+        if ratings is not None:
+            ratings.update(names[0], names[1], score)
+        if sprt is not None:
+            sprt.add(score)
+            if sprt.status():
+                break
+    env.close()
+
+    elo, low, high = elo_interval(wins, draws, losses)
+    results = {
+        "games": wins + draws + losses,
+        "wins": wins,
+        "draws": draws,
+        "losses": losses,
+        "elo": elo,
+        "elo_low": low,
+        "elo_high": high,
+        "mean_moves": lengths.mean,
+        "llr": sprt.llr() if sprt is not None else None,
+        "decision": sprt.status() if sprt is not None else None,
+    }
+
+    print(f"\n{names[0]} vs {names[1]}: +{wins} ={draws} -{losses} in {results['games']} games, "
+          f"Elo {elo:+.0f} [{low:+.0f}, {high:+.0f}]")
+    if sprt is not None:
+        print(f"SPRT [{sprt.elo0:+g}, {sprt.elo1:+g}] llr {results['llr']:.2f} "
+              f"({sprt.lower:.2f}, {sprt.upper:.2f}): {results['decision'] or 'undecided'}")
+    return results
+
+
+def play_round_robin(agent_classes, max_games=200, elo0=None, elo1=None, alpha=0.05, beta=0.05, depth_minimax=3,
+                     base_seed=42, engine="native", k=16):
+    """
+    Rate agents with a round robin of rated matchups.
+
+    Parameters:
+        agent_classes: list of agent classes
+        max_games: int, maximum number of games per matchup
+        elo0, elo1: optional Elo bounds; if elo1 is set every matchup runs an
+            SPRT of "first agent is stronger by elo1" against elo0 and stops
+            early once it is decided
+        alpha, beta: float, error rates of the SPRT
+        depth_minimax: int, depth for MinimaxAgent if used
+        base_seed: int, base seed (matchup i uses game_seed(base_seed, i))
+        engine: str, "pettingzoo" or "native" (see make_env)
+        k: float, Elo update factor
+
+    Returns:
+        dict: "ratings" ranking list (name, rating, games) and "matchups"
+              {(name A, name B): results of play_rated_matchup}
+    """
+    ratings = EloRatings(k)
+    matchups = {}
+    for index, (agent_a, agent_b) in enumerate(combinations(agent_classes, 2)):
+        sprt = SPRT(elo0 or 0.0, elo1, alpha, beta) if elo1 is not None else None
+        matchups[(agent_a.__name__, agent_b.__name__)] = play_rated_matchup(
+            agent_a, agent_b, max_games, ratings, sprt, depth_minimax, game_seed(base_seed, index), engine)
+
+    ranking = ratings.ranking()
+    print("\nRatings")
+    for name, rating, games in ranking:
+        print(f"  {name:<20} {rating:7.1f} ({games} games)")
+    print(f"{sum(result['games'] for result in matchups.values())} games played")
+    return {"ratings": ranking, "matchups": matchups}
+
+
+def play_paired_openings(agent1_class, agent2_class, openings=None, plies=2, num_pairs=None, depth_minimax=3,
+                         base_seed=42, engine="native"):
+    """
+    Play every opening of a suite twice, once with each colour assignment.
+
+    Both games of a pair start from the same opening and share the seed
+    game_seed(base_seed, pair index), so the first-player advantage and
+    the luck of the opening cancel out within the pair.
+
+    Parameters:
+        agent1_class: class of the first agent (A)
+        agent2_class: class of the second agent (B)
+        openings: list of openings (sequences of columns), default
+            generate_openings(plies)
+        plies: int, length of the generated openings
+        num_pairs: int or None, number of pairs, cycling through the suite
+            (default: one pair per opening)
+        depth_minimax: int, depth for MinimaxAgent if used
+        base_seed: int, base seed of the games
+        engine: str, "pettingzoo" or "native" (see make_env)
+
+    Returns:
+        dict: "pairs" list of {"opening", "scores" (A first, A second),
+              "score"}, total "score" of A, its Elo difference over B with
+              the paired 95% confidence interval, and the interval the
+              same games would give if treated as unpaired
+    """
+    if openings is None:
+        openings = generate_openings(plies)
+    if num_pairs is None:
+        num_pairs = len(openings)
+
+    env = make_env(engine)
+    env.reset()
+    orders = [make_agents(env, agent1_class, agent2_class, depth_minimax),
+              make_agents(env, agent2_class, agent1_class, depth_minimax)]
+
+    pairs = []
+    counts = [0, 0, 0]
+    for index in range(num_pairs):
+        opening = tuple(openings[index % len(openings)])
+        seed = game_seed(base_seed, index)
+        scores = []
+        for swapped in (0, 1):
+            winner, _ = play_game(env, orders[swapped], seed=seed, agent_seed=seed, verbose=False,
+                                  opening=opening)
+            scores.append(_score(winner, swapped))
+            counts[int(scores[-1] * 2)] += 1
+        pairs.append({"opening": opening, "scores": tuple(scores), "score": sum(scores)})
+    env.close()
+
+    losses, draws, wins = counts
+    elo, low, high = paired_elo_interval([pair["score"] for pair in pairs])
+    _, unpaired_low, unpaired_high = elo_interval(wins, draws, losses)
+    results = {
+        "pairs": pairs,
+        "games": 2 * len(pairs),
+        "score": sum(pair["score"] for pair in pairs),
+        "wins": wins,
+        "draws": draws,
+        "losses": losses,
+        "elo": elo,
+        "elo_low": low,
+        "elo_high": high,
+        "unpaired_elo_low": unpaired_low,
+        "unpaired_elo_high": unpaired_high,
+    }
+
+    print(f"\n{agent1_class.__name__} vs {agent2_class.__name__}: {len(pairs)} opening pairs")
+    for pair in pairs:
+        print(f"  {' '.join(map(str, pair['opening'])) or '-':<12} {pair['scores'][0]:g} + {pair['scores'][1]:g}"
+              f" = {pair['score']:g}")
+    print(f"score {results['score']:g}/{results['games']}, Elo {elo:+.0f} [{low:+.0f}, {high:+.0f}] "
+          f"(unpaired [{unpaired_low:+.0f}, {unpaired_high:+.0f}])")
+    return results
+
+
+def play_logged_games(agent1_class, agent2_class, num_games, log_path, depth_minimax=3, base_seed=42,
+                      engine="native", flush_every=64):
+    """
+    Play a matchup that appends every finished game to a JSONL log and resumes from it.
+
+    Games already present in the log for this pairing, agent configuration
+    (Minimax depth), engine and base seed are skipped, the others are played with game_seed(base_seed, i), so an
+    interrupted run finishes with the same results as an uninterrupted
+    one. The statistics are rebuilt by streaming the log.
+
+    Parameters:
+        agent1_class: class of player 0
+        agent2_class: class of player 1
+        num_games: int, total number of games of the matchup
+        log_path: str, path of the JSONL log (shared by several matchups)
+        depth_minimax: int, depth for MinimaxAgent if used
+        base_seed: int, base seed of the games
+        engine: str, "pettingzoo" or "native" (see make_env)
+        flush_every: int, records buffered between two writes
+
+    Returns:
+        dict: statistics of summarize_games plus "played" (games played by
+              this call) and "resumed" (games found in the log)
+    """
+    pairing = f"{agent1_class.__name__}-{agent2_class.__name__}"
+    # Games played with other settings are neither resumed nor counted
+    key = {
+        "pairing": pairing,
+        "config": [_agent_config(cls, depth_minimax) for cls in (agent1_class, agent2_class)],
+        "engine": engine,
+        "base_seed": base_seed,
+    }
+    done = {record["game_id"] for record in read_game_log(log_path, **key)}
+    todo = [game_id for game_id in range(num_games) if game_id not in done]
+
+    if todo:
+        env = make_env(engine)
+        env.reset()
+        agent_dict = make_agents(env, agent1_class, agent2_class, depth_minimax)
+        with GameLog(log_path, flush_every=flush_every) as log:
+            for game_id in todo:
+                seed = game_seed(base_seed, game_id)
+                history = []
+                winner, moves = play_game(env, agent_dict, seed=seed, agent_seed=seed, game_id=game_id,
+                                          verbose=False, history=history)
+                log.write({
+                    **key,
+                    "game_id": game_id,
+                    "seed": seed,
+                    "winner": winner,
+                    "num_moves": moves,
+                    "moves": [action for action, _ in history],
+                    "times_ns": [elapsed for _, elapsed in history],
+                })
+        env.close()
+
+    # Stream the log back, keeping only the requested games
+    stats = MatchStats()
+    seen = set()
+    for record in read_game_log(log_path, **key):
+        if record["game_id"] < num_games and record["game_id"] not in seen:
+            seen.add(record["game_id"])
+            stats.add(record["winner"], record["num_moves"])
+    results = stats.results()
+    results["played"] = len(todo)
+    results["resumed"] = num_games - len(todo)
+
+    print(f"\n{agent1_class.__name__} vs {agent2_class.__name__} ({results['resumed']} games resumed "
+          f"from {log_path})\n")
+    print(results)
     return results
 
 
@@ -124,3 +1153,9 @@ if __name__ == "__main__":
     play_multiple_games(RandomAgent, SmartAgentAmeliore, num_games=1)
     play_multiple_games(SmartAgent, SmartAgentAmeliore, num_games=1)
     play_multiple_games(MinimaxAgent, SmartAgentAmeliore, num_games=1, depth_minimax=3)
+
+    # Rated round robin, each matchup stopped by an SPRT
+    play_round_robin([RandomAgent, SmartAgent, SmartAgentAmeliore], max_games=200, elo0=0, elo1=50)
+
+    # Paired openings: every 2-ply opening played with both colour assignments
+    play_paired_openings(SmartAgent, SmartAgentAmeliore, plies=2)
@@ -0,0 +1,79 @@
+import asyncio
+
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from test_tournament import (game_seed, make_agents, make_env, play_game_async, play_multiple_games,
+                             play_multiple_games_async, play_multiple_games_parallel)
+from time_limit import TimeLimit
+
+
+class SlowAsyncAgent(RandomAgent):
+    """Random agent waiting 20 ms for every move, like a remote agent"""
+
+    # Moves being awaited at the same time, across all instances
+    in_flight = 0
+    max_in_flight = 0
+
+    async def choose_action_async(self, **kwargs):
+        SlowAsyncAgent.in_flight += 1
+        SlowAsyncAgent.max_in_flight = max(SlowAsyncAgent.max_in_flight, SlowAsyncAgent.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            SlowAsyncAgent.in_flight -= 1
+        return self.choose_action(**kwargs)
+
+
+class StalledAsyncAgent(RandomAgent):
+    """Async agent that never answers"""
+
+    async def choose_action_async(self, **kwargs):
+        await asyncio.sleep(3600)
+
+
+def test_game_seed_is_stable():
+    assert game_seed(42, 0) == game_seed(42, 0)
+    assert game_seed(42, 0) != game_seed(42, 1)
+    assert game_seed(42, 0) != game_seed(43, 0)
+    assert 0 <= game_seed(42, 5) < 2**32
+
+
+def test_seeded_serial_runs_are_reproducible():
+    first = play_multiple_games(RandomAgent, SmartAgent, num_games=20, render_mode=None, base_seed=3)
+    second = play_multiple_games(RandomAgent, SmartAgent, num_games=20, render_mode=None, base_seed=3)
+    assert first == second
+
+
+def test_parallel_matches_serial():
+    serial = play_multiple_games(RandomAgent, SmartAgent, num_games=30, render_mode=None, base_seed=11)
+    parallel = play_multiple_games_parallel(RandomAgent, SmartAgent, num_games=30, base_seed=11,
+                                            processes=2, chunk_size=4)
+
+    print("\nTEST parallel vs serial", parallel, serial)
+    assert parallel == serial
+
+
+def test_async_inline_matches_serial():
+    serial = play_multiple_games(RandomAgent, SmartAgent, num_games=30, render_mode=None, base_seed=11,
+                                 engine="native")
+    concurrent = play_multiple_games_async(RandomAgent, SmartAgent, num_games=30, base_seed=11)
+    assert concurrent == serial
+
+
+def test_async_games_overlap():
+    SlowAsyncAgent.max_in_flight = 0
+    results = play_multiple_games_async(SlowAsyncAgent, SmartAgent, num_games=20, concurrency=20)
+    # Every game was waiting on its agent at the same time
+    assert SlowAsyncAgent.max_in_flight == 20
+    assert results["player_0"] + results["player_1"] + results["draw"] == 20
+
+
+def test_async_time_limit_forfeits():
+    env = make_env("native")
+    env.reset()
+    agents = make_agents(env, StalledAsyncAgent, SmartAgent)
+    limit = TimeLimit(20, policy="forfeit")
+    history = []
+    winner, moves = asyncio.run(play_game_async(env, agents, seed=1, time_limit=limit, history=history))
+    assert (winner, moves, history) == ("player_1", 0, [])
+    assert limit.violations[0]["reason"] == "timeout"
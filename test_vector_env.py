@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from connect_four_engine import ConnectFourEngine
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from test_tournament import play_vectorized_games
+from vector_env import VectorConnectFour
+
+
+def test_vector_env_matches_engine():
+    num_envs = 64
+    rng = np.random.default_rng(0)
+    venv = VectorConnectFour(num_envs, auto_reset=False)
+    engines = [ConnectFourEngine() for _ in range(num_envs)]
+    for engine in engines:
+        engine.reset()
+    active = np.ones(num_envs, dtype=bool)
+
+    while active.any():
+        observations = venv.observations()
+        actions = np.zeros(num_envs, dtype=np.int64)
+        for i in np.flatnonzero(active):
+            observation = engines[i].last()[0]
+            assert np.array_equal(observations[i], observation["observation"])
+            assert np.array_equal(venv.masks[i], observation["action_mask"])
+            actions[i] = rng.choice(np.flatnonzero(venv.masks[i]))
+
+        rewards, dones, info = venv.step(actions, active)
+        for i in np.flatnonzero(active):
+            mover = engines[i].agent_selection
+            engines[i].step(int(actions[i]))
+            assert dones[i] == engines[i].terminations[mover]
+            assert rewards[i] == max(engines[i].rewards[mover], 0)
+            if dones[i]:
+                assert info["moves"][i] == engines[i].num_moves
+                expected = f"player_{info['winner'][i]}" if info["winner"][i] >= 0 else None
+                assert (engines[i].rewards[mover] == 1) == (expected == mover)
+                active[i] = False
+
+
+def test_finished_games_are_reset():
+    venv = VectorConnectFour(2)
+    for action in [0, 1, 0, 1, 0, 1]:
+        venv.step(np.array([action, action]))
+    rewards, dones, info = venv.step(np.array([0, 0]))
+
+    print("\nTEST auto reset", rewards, dones, info)
+    assert dones.all()
+    assert info["winner"].tolist() == [0, 0]
+    assert info["moves"].tolist() == [7, 7]
+    assert venv.boards.sum() == 0
+    assert venv.current.tolist() == [0, 0]
+
+
+def test_illegal_vector_move_raises():
+    venv = VectorConnectFour(1)
+    for _ in range(6):
+        venv.step(np.array([2]))
+    with pytest.raises(ValueError):
+        venv.step(np.array([2]))
+
+
+def test_vectorized_tournament_batch_and_fallback():
+    results = play_vectorized_games(RandomAgent, SmartAgent, num_games=40, num_envs=16)
+    assert results["player_0"] + results["player_1"] + results["draw"] == 40
+    assert results["player_1"] > results["player_0"]
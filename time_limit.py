@@ -0,0 +1,264 @@
+"""
+Move time limits
+
+Per-move time limit for tournament games. An agent that exceeds it
+either forfeits the game or has its move replaced by a fallback move,
+and every violation is recorded.
+
+In-process agents are interrupted with SIGALRM when possible (Unix, main
+thread; time spent inside a C call is only interrupted when it returns)
+and otherwise checked after the move. Agents wrapped in a ProcessAgent
+run in a worker process that is killed and restarted when it is late,
+which also stops agents stuck in native code. A worker that crashes is
+restarted too, and its move counts as a violation.
+"""
+
+import asyncio
+import multiprocessing
+import random
+import signal
+import threading
+import time
+
+import numpy as np
+
+
+class MoveTimeout(Exception):
+    """
+    Raised when an agent exceeds its time to move
+    """
+
+
+class AgentCrashed(Exception):
+    """
+    Raised when the worker process of an agent dies during a move
+    """
+
+
+def _raise_timeout(signum, frame):
+    raise MoveTimeout()
+
+
+def _reseed_agent(agent, seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    action_space = getattr(agent, "action_space", None)
+    if action_space is not None:
+        action_space.seed(seed)
+    if hasattr(agent, "reseed"):
+        agent.reseed(seed)
+
+
+def _agent_worker(conn, factory, args):
+    # Child process: build the agent (without an environment) and serve moves
+    agent = factory(None, *args)
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        command, payload = message
+        if command == "reseed":
+            _reseed_agent(agent, payload)
+        elif command == "choose":
+            conn.send(agent.choose_action(**payload))
+    conn.close()
+
+
+class ProcessAgent:
+    """
+    Agent running in a worker process, with enforceable move time limits
+    """
+
+    def __init__(self, factory, *args, label=None):
+        """
+        Start the worker
+
+        Parameters:
+            factory: picklable callable factory(None, *args) returning the agent
+            args: extra arguments of the factory
+            label: str, name of the agent in reports (default: factory name)
+        """
+        self.factory = factory
+        self.args = args
+        self.label = label or getattr(factory, "__name__", "ProcessAgent")
+        self.restarts = 0
+        self._start()
+
+    def _start(self):
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_agent_worker, args=(child, self.factory, self.args),
+                                                daemon=True)
+        self._process.start()
+        child.close()
+
+    def restart(self):
+        """
+        Kill the worker (e.g. stuck in a move) and start a fresh one
+        """
+        self._process.kill()
+        self._process.join()
+        self._conn.close()
+        self.restarts += 1
+        self._start()
+
+    def reseed(self, seed, game_id=None):
+        self._conn.send(("reseed", seed))
+
+    def _receive(self, limit_s=None):
+        try:
+            if limit_s is not None and not self._conn.poll(limit_s):
+                self.restart()
+                raise MoveTimeout()
+            return self._conn.recv()
+        except (EOFError, ConnectionResetError):
+            self.restart()
+            raise AgentCrashed(self.label)
+
+    def choose_action(self, **kwargs):
+        """
+        Raises:
+            AgentCrashed: the worker died (it is restarted)
+        """
+        self._conn.send(("choose", kwargs))
+        return self._receive()
+
+    def choose_action_timed(self, limit_s, **kwargs):
+        """
+        Ask the worker for a move, killing it after limit_s seconds
+
+        Raises:
+            MoveTimeout: the worker did not answer in time (it is restarted)
+            AgentCrashed: the worker died (it is restarted)
+        """
+        self._conn.send(("choose", kwargs))
+        return self._receive(limit_s)
+
+    def close(self):
+        if self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(1.0)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+        self._conn.close()
+
+
+class TimeLimit:
+    """
+    Per-move time limit applied by play_game
+    """
+
+    POLICIES = ("fallback", "forfeit")
+
+    def __init__(self, limit_ms, policy="fallback", fallback=None, seed=0):
+        """
+        Initialize the limit
+
+        Parameters:
+            limit_ms: float, time allowed per move in milliseconds
+            policy: "fallback" (play a substitute move) or "forfeit" (the
+                    late agent loses the game)
+            fallback: optional agent choosing the substitute move, default
+                      a random legal column
+            seed: int, seed of the default fallback
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"policy must be one of {self.POLICIES}")
+        self.limit_ms = limit_ms
+        self.policy = policy
+        self.fallback = fallback
+        self.rng = random.Random(seed)
+        self.violations = []
+
+    def _call_in_process(self, agent, kwargs):
+        limit_s = self.limit_ms / 1000
+        use_alarm = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+        if not use_alarm:
+            return agent.choose_action(**kwargs)
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, limit_s)
+        try:
+            return agent.choose_action(**kwargs)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    def choose(self, name, agent, kwargs, game_id=None, ply=None):
+        """
+        Get a move from an agent under the time limit
+
+        Parameters:
+            name: str, player name ("player_0" / "player_1")
+            agent: the agent
+            kwargs: keyword arguments of choose_action
+            game_id: optional index of the game, for the violation record
+            ply: optional index of the move, for the violation record
+
+        Returns:
+            tuple: (action or None if the agent forfeits, elapsed time in ns)
+        """
+        start = time.perf_counter_ns()
+        try:
+            if hasattr(agent, "choose_action_timed"):
+                action = agent.choose_action_timed(self.limit_ms / 1000, **kwargs)
+            else:
+                action = self._call_in_process(agent, kwargs)
+            late = time.perf_counter_ns() - start > self.limit_ms * 1e6
+            reason = "timeout"
+        except MoveTimeout:
+            action, late, reason = None, True, "timeout"
+        except AgentCrashed:
+            action, late, reason = None, True, "crash"
+        return self._settle(name, agent, kwargs, game_id, ply, start, action, late, reason)
+
+    async def choose_async(self, name, agent, kwargs, executor=None, game_id=None, ply=None):
+        """
+        choose for asyncio runners
+
+        Agents with a choose_action_async coroutine are cancelled after the
+        limit; the others are run by choose, in executor when one is given
+        (without SIGALRM there: a late move is replaced once it returns).
+
+        Returns:
+            tuple: (action or None if the agent forfeits, elapsed time in ns)
+        """
+        if not hasattr(agent, "choose_action_async"):
+            if executor is None:
+                return self.choose(name, agent, kwargs, game_id, ply)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, self.choose, name, agent, kwargs, game_id, ply)
+        start = time.perf_counter_ns()
+        try:
+            action = await asyncio.wait_for(agent.choose_action_async(**kwargs), self.limit_ms / 1000)
+            late = time.perf_counter_ns() - start > self.limit_ms * 1e6
+            reason = "timeout"
+        except (asyncio.TimeoutError, MoveTimeout):
+            action, late, reason = None, True, "timeout"
+        except AgentCrashed:
+            action, late, reason = None, True, "crash"
+        return self._settle(name, agent, kwargs, game_id, ply, start, action, late, reason)
+
+    def _settle(self, name, agent, kwargs, game_id, ply, start, action, late, reason):
+        # The agent's move, or the policy's answer to a violation
+        elapsed = time.perf_counter_ns() - start
+        if not late:
+            return action, elapsed
+
+        self.violations.append({
+            "player": name,
+            "agent": getattr(agent, "label", type(agent).__name__),
+            "game_id": game_id,
+            "ply": ply,
+            "elapsed_ns": elapsed,
+            "reason": reason,
+            "policy": self.policy,
+        })
+        if self.policy == "forfeit":
+            return None, elapsed
+        if self.fallback is not None:
+            return self.fallback.choose_action(**kwargs), elapsed
+        mask = kwargs["action_mask"]
+        return self.rng.choice([col for col in range(len(mask)) if mask[col]]), elapsed
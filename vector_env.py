@@ -0,0 +1,142 @@
+"""
+Vectorized Connect Four environment
+
+Steps N games in lockstep with batched NumPy kernels: landing rows, win
+detection and draws are computed for all games at once, and finished
+games are reset automatically so the batch stays full.
+"""
+
+import numpy as np
+
+ROWS = 6
+COLUMNS = 7
+
+
+def _four_in_a_row(planes):
+    """
+    Check a batch of single-player planes for four in a row
+
+    Parameters:
+        planes: bool array (N, 6, 7), True where the player has a piece
+
+    Returns:
+        bool array (N,): True for the planes that contain a winning line
+    """
+    horizontal = planes[:, :, :-3] & planes[:, :, 1:-2] & planes[:, :, 2:-1] & planes[:, :, 3:]
+    vertical = planes[:, :-3, :] & planes[:, 1:-2, :] & planes[:, 2:-1, :] & planes[:, 3:, :]
+    diagonal = planes[:, :-3, :-3] & planes[:, 1:-2, 1:-2] & planes[:, 2:-1, 2:-1] & planes[:, 3:, 3:]
+    anti_diagonal = planes[:, 3:, :-3] & planes[:, 2:-1, 1:-2] & planes[:, 1:-2, 2:-1] & planes[:, :-3, 3:]
+    return (horizontal.any(axis=(1, 2)) | vertical.any(axis=(1, 2))
+            | diagonal.any(axis=(1, 2)) | anti_diagonal.any(axis=(1, 2)))
+
+
+class VectorConnectFour:
+    """
+    N independent Connect Four games stepped together
+    """
+
+    def __init__(self, num_envs, auto_reset=True):
+        """
+        Initialize the batch
+
+        Parameters:
+            num_envs: int, number of games N
+            auto_reset: bool, reset finished games inside step
+        """
+        self.num_envs = num_envs
+        self.auto_reset = auto_reset
+        # Channel 0 = player_0 pieces, channel 1 = player_1 pieces
+        self.boards = np.zeros((num_envs, ROWS, COLUMNS, 2), dtype=np.int8)
+        self.heights = np.zeros((num_envs, COLUMNS), dtype=np.int8)
+        self.masks = np.ones((num_envs, COLUMNS), dtype=np.int8)
+        # Index (0 or 1) of the player to move in each game
+        self.current = np.zeros(num_envs, dtype=np.int8)
+        self.num_moves = np.zeros(num_envs, dtype=np.int16)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self._observations = np.zeros_like(self.boards)
+        self._all = np.arange(num_envs)
+
+    def reset(self, indices=None):
+        """
+        Reset some games (all of them by default)
+
+        Parameters:
+            indices: optional int array of the games to reset
+        """
+        if indices is None:
+            indices = self._all
+        self.boards[indices] = 0
+        self.heights[indices] = 0
+        self.masks[indices] = 1
+        self.current[indices] = 0
+        self.num_moves[indices] = 0
+        self.dones[indices] = False
+
+    def observations(self):
+        """
+        Boards from the point of view of the player to move
+
+        Returns:
+            int8 array (N, 6, 7, 2): channel 0 = pieces of the player to
+            move, channel 1 = opponent pieces (same as connect_four_v3).
+            The buffer is reused by the next call.
+        """
+        np.copyto(self._observations, self.boards)
+        second = self.current == 1
+        self._observations[second] = self.boards[second][..., ::-1]
+        return self._observations
+
+    def step(self, actions, active=None):
+        """
+        Play one move in every active game
+
+        Parameters:
+            actions: int array (N,) - column played in each game
+            active: optional bool array (N,), games to step (others are
+                    left untouched)
+
+        Returns:
+            tuple:
+                - rewards: float32 (N,), 1 if the move won the game
+                - dones: bool (N,), game finished by this move
+                - info: dict with "winner" (int8 (N,): 0 or 1 for the
+                  winning player, -1 for a draw or an unfinished game)
+                  and "moves" (int16 (N,): length of finished games)
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        idx = self._all if active is None else np.flatnonzero(active)
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        winner = np.full(self.num_envs, -1, dtype=np.int8)
+        moves = np.zeros(self.num_envs, dtype=np.int16)
+        if len(idx) == 0:
+            return rewards, dones, {"winner": winner, "moves": moves}
+
+        cols = actions[idx]
+        if np.any((cols < 0) | (cols >= COLUMNS)) or np.any(self.heights[idx, cols] >= ROWS):
+            raise ValueError("illegal move in a vectorized step")
+
+        # Drop the pieces
+        players = self.current[idx]
+        rows = ROWS - 1 - self.heights[idx, cols]
+        self.boards[idx, rows, cols, players] = 1
+        self.heights[idx, cols] += 1
+        self.masks[idx, cols] = self.heights[idx, cols] < ROWS
+        self.num_moves[idx] += 1
+
+        # Batched win / draw detection for the players that just moved
+        planes = self.boards[idx, :, :, :]
+        planes = np.where(players[:, None, None] == 0, planes[..., 0], planes[..., 1]).astype(bool)
+        won = _four_in_a_row(planes)
+        finished = won | (self.num_moves[idx] == ROWS * COLUMNS)
+
+        rewards[idx] = won
+        dones[idx] = finished
+        winner[idx[won]] = players[won]
+        moves[idx] = np.where(finished, self.num_moves[idx], 0)
+
+        self.current[idx] = 1 - players
+        self.dones[idx] = finished
+        if self.auto_reset and finished.any():
+            self.reset(idx[finished])
+        return rewards, dones, {"winner": winner, "moves": moves}